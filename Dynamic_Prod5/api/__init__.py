@@ -6,5 +6,6 @@ and functions to make them easily accessible.
 """
 
 from .document_validation_api import DocumentValidationAPI
+from .batch_validation_api import BatchValidationJob
 
 # You can add any package-level initialization here if needed
\ No newline at end of file
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterator, Optional, Tuple, TextIO
+
+from api.document_validation_api import DocumentValidationAPI
+from services.validation_service import DocumentValidationService
+from services.extraction_service import ExtractionService
+from services.compliance_rules_repository import compliance_rules_repository
+from utils.elasticsearch_utils import es_client
+from utils.json_stream import StreamingJSONReader
+from config.settings import Config
+
+
+class BatchValidationJob:
+    """
+    Validate many applications from JSON lines files or a directory
+
+    Applications are read one at a time and validated by a pool of
+    workers; at most two applications per worker are held in memory, and
+    their large base64 documents are decoded into memory-mapped scratch
+    files as they are read (see StreamingJSONReader). All workers share
+    one validation service, as concurrent API requests do, and with it
+    the extraction service, Elasticsearch client, rules repository,
+    download cache, linkage scheduler and in-flight extraction table;
+    each validation keeps its request-scoped state in its own
+    ValidationContext.
+
+    Each result is written to the output as one JSON line, then its
+    source position is appended to the checkpoint. A rerun with the same
+    checkpoint skips every application already written, so an interrupted
+    backlog resumes where it stopped; an application interrupted between
+    the two writes is validated, and written, again.
+    """
+
+    def __init__(self, workers: Optional[int] = None, checkpoint_path: Optional[str] = None):
+        """
+        Initialize the job
+
+        Args:
+            workers (int, optional): Applications validated in parallel
+                (defaults to Config.BATCH_WORKERS)
+            checkpoint_path (str, optional): File recording completed
+                applications; no checkpointing if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers or Config.BATCH_WORKERS)
+        self.checkpoint_path = checkpoint_path
+
+        self.extraction_service = ExtractionService(Config.OPENAI_API_KEY)
+        self.api = DocumentValidationAPI(DocumentValidationService(
+            es_client=es_client,
+            extraction_service=self.extraction_service,
+            rules_repository=compliance_rules_repository
+        ))
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def iter_applications(input_path: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Read application payloads in a stable order
+
+        A JSON lines file yields one payload per non-empty line. A
+        directory yields the payloads of its .jsonl files and the single
+        payload of each .json file, in file name order.
+
+        Args:
+            input_path (str): JSON lines file or directory
+
+        Yields:
+            tuple: (source position, payload or the reason it could not be read)
+        """
+        if os.path.isdir(input_path):
+            paths = [
+                os.path.join(input_path, name) for name in sorted(os.listdir(input_path))
+                if name.endswith(('.json', '.jsonl'))
+            ]
+        else:
+            paths = [input_path]
+
+        for path in paths:
+            name = os.path.basename(path)
+            with open(path, 'r') as file:
+                reader = StreamingJSONReader(file)
+                if path.endswith('.json') and os.path.isdir(input_path):
+                    for _, payload, error in reader:
+                        yield name, error or payload
+                        break
+                    else:
+                        yield name, "Empty file: no application payload"
+                    continue
+
+                for line_number, payload, error in reader:
+                    yield f"{name}:{line_number}", error or payload
+
+    def _load_checkpoint(self) -> set:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, 'r') as file:
+            return {line.rstrip('\n') for line in file if line.strip()}
+
+    def validate_application(self, source: str, payload: Any) -> Dict[str, Any]:
+        """
+        Validate one application payload
+
+        Args:
+            source (str): Source position of the payload
+            payload (dict or str): Application payload, or why it could not be read
+
+        Returns:
+            dict: Output record with the API response and verdict
+        """
+        api = self.api
+        if not isinstance(payload, dict):
+            error = payload if isinstance(payload, str) else "Application payload must be a JSON object"
+            return {"source": source, "status": "failed", "error_message": error,
+                    "response": api._create_error_response(error)}
+
+        start_time = time.time()
+        api_response, detailed_result = api.validate_document(payload)
+        metadata = detailed_result.get('metadata', {})
+        record = {
+            "source": source,
+            "application_id": payload.get('application_id') or payload.get('request_id'),
+            "service_id": payload.get('service_id', '1'),
+            "is_compliant": metadata.get('is_compliant'),
+            "processing_time": round(time.time() - start_time, 3),
+            "response": api_response
+        }
+        if 'error' in metadata:
+            record["status"] = "failed"
+            record["error_message"] = metadata['error']
+        else:
+            record["status"] = "completed"
+        return record
+
+    def run(self, input_path: str, output: TextIO) -> Dict[str, int]:
+        """
+        Validate every application of the input and write the results
+
+        Args:
+            input_path (str): JSON lines file or directory of payloads
+            output (file): Text stream receiving one JSON object per application
+
+        Returns:
+            dict: Counts of 'completed', 'failed' and 'skipped' (already
+                checkpointed) applications
+        """
+        completed = self._load_checkpoint()
+        summary = {'completed': 0, 'failed': 0, 'skipped': 0}
+        checkpoint = open(self.checkpoint_path, 'a') if self.checkpoint_path else None
+
+        def write(record):
+            with self._write_lock:
+                output.write(json.dumps(record, default=str) + "\n")
+                output.flush()
+                if checkpoint:
+                    checkpoint.write(record['source'] + "\n")
+                    checkpoint.flush()
+                summary[record['status']] += 1
+
+        start_time = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch-validation') as executor:
+                pending = {}
+                for source, payload in self.iter_applications(input_path):
+                    if source in completed:
+                        summary['skipped'] += 1
+                        continue
+
+                    # Keep reading only as fast as workers free up
+                    while len(pending) >= self.workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(future, pending.pop(future), write)
+
+                    pending[executor.submit(self.validate_application, source, payload)] = source
+
+                for future in list(pending):
+                    self._finish(future, pending.pop(future), write)
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        elapsed = time.time() - start_time
+        processed = summary['completed'] + summary['failed']
+        self.logger.info(
+            f"Batch validation finished: {summary} in {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed else 0:.2f} applications/s)"
+        )
+        return summary
+
+    def _finish(self, future, source: str, write):
+        """
+        Write the result of a finished application
+
+        Args:
+            future (Future): Finished validation
+            source (str): Source position of the application
+            write (callable): Writes an output record
+        """
+        try:
+            record = future.result()
+        except Exception as e:
+            self.logger.error(f"Batch validation failed for {source}: {str(e)}", exc_info=True)
+            record = {"source": source, "status": "failed", "error_message": str(e)}
+        write(record)
@@ -1,13 +1,18 @@
 from datetime import datetime
 import json
 import traceback
-from typing import Dict, Any, Tuple
-import base64
+from typing import Dict, Any, Tuple, Optional, Callable
 from services.validation_service import DocumentValidationService
 from models.document_models import (
     ValidationResult, 
-    DocumentValidationError
+    DocumentValidationError,
+    InMemoryDocument
 )
+from utils.base64_stream import validate_base64_stream
+from utils.json_stream import read_json_file, JSONStreamError
+from utils.linkage_results import linkage_results
+from utils.job_queue import validation_job_queue
+from utils.cancellation import CancellationToken
 from utils.logging_utils import logger
 from config.settings import Config
 
@@ -40,29 +45,48 @@ class DocumentValidationAPI:
         self.logger = logging.getLogger(__name__)
         self.validation_service = validation_service or DocumentValidationService()
     
-    def validate_document(self, input_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    def validate_document(
+        self,
+        input_data: Dict[str, Any],
+        linkage_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Main document validation endpoint
         
         Args:
             input_data (dict): Input document data
+            linkage_callback (callable, optional): Receives the final linkage
+                rule result when 'defer_linkage' is set
+            cancel_token (CancellationToken, optional): Cancels the validation's
+                outstanding downloads and AI calls from outside
         
         Returns:
             tuple: (standard_result, detailed_result)
         """
         try:
-            # Validate input structure
-            self._validate_input_structure(input_data)
-            
             # Extract parameters
             service_id = input_data.get('service_id', '1')
             request_id = input_data.get('request_id', '')
             
+            # Reject requests certain to fail before anything is decoded or downloaded
+            if input_data.get('preflight', Config.PREFLIGHT_ENABLED):
+                preflight = self.validation_service.preflight(service_id, input_data)
+                if preflight['input_errors']:
+                    raise DocumentValidationError("; ".join(preflight['input_errors']))
+                if not preflight['passed']:
+                    return self._preflight_rejection(service_id, request_id, preflight)
+            
+            # Validate input structure
+            self._validate_input_structure(input_data)
+            
             # Perform validation
             result, detailed_result = self.validation_service.validate_documents(
                 service_id, 
                 request_id, 
-                input_data
+                input_data,
+                linkage_callback=linkage_callback,
+                cancel_token=cancel_token
             )
             
             # Format the result for API response
@@ -109,6 +133,50 @@ class DocumentValidationAPI:
             
             return error_response, detailed_error
     
+    def _preflight_rejection(
+        self,
+        service_id: str,
+        request_id: str,
+        preflight: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Build the response for a request rejected by the preflight stage
+        
+        Args:
+            service_id (str): Service identifier
+            request_id (str): Request identifier
+            preflight (dict): Preflight result
+        
+        Returns:
+            tuple: (standard_result, detailed_result)
+        """
+        self.logger.info(
+            f"Request {request_id} rejected by preflight in {preflight['elapsed_us']}us: "
+            f"{list(preflight['rule_failures'])}"
+        )
+        
+        result = {
+            "rules_version": preflight['rules_version'],
+            "validation_rules": preflight['rule_failures'],
+            "document_validation": {
+                "directors": {},
+                "companyDocuments": {}
+            }
+        }
+        detailed_result = {
+            **result,
+            "metadata": {
+                "service_id": service_id,
+                "request_id": request_id,
+                "timestamp": datetime.now().isoformat(),
+                "is_compliant": False,
+                "rules_version": preflight['rules_version'],
+                "preflight": preflight
+            }
+        }
+        
+        return self._format_api_response(result, detailed_result), detailed_result
+    
     def _validate_input_structure(self, input_data: Dict[str, Any]):
         """
         Validate the structure of input data
@@ -180,14 +248,11 @@ class DocumentValidationAPI:
             
             # Optional: Add more specific document validation if needed
             for doc_key, doc_content in documents.items():
-                if doc_content is not None and not isinstance(doc_content, str):
+                if doc_content is not None and not isinstance(doc_content, (str, InMemoryDocument)):
                     raise DocumentValidationError(
                         f"Document URL for {doc_key} in director {director_key} must be a base64-encoded string"
                     )
-                try:
-                    if doc_content:
-                        base64.b64decode(doc_content)
-                except Exception:
+                if not self._is_valid_document_content(doc_content):
                     raise DocumentValidationError(
                         f"Invalid base64 content for document {doc_key} in director {director_key}"
                     )
@@ -200,15 +265,38 @@ class DocumentValidationAPI:
             for key, content in company_docs.items():
                 if key == "address_proof_type":  # this is not a document
                     continue
-                if content is not None and not isinstance(content, str):
+                if content is not None and not isinstance(content, (str, InMemoryDocument)):
                     raise DocumentValidationError(
                         f"Company document {key} must be a base64-encoded string"
                     )
-                try:
-                    if content:
-                        base64.b64decode(content)
-                except Exception:
+                if not self._is_valid_document_content(content):
                     raise DocumentValidationError(f"Invalid base64 content in {key}")
+
+    def _is_valid_document_content(self, content) -> bool:
+        """
+        Check that document content can be handed to the validation service
+        
+        base64 content is checked chunk by chunk without keeping the
+        decoded document in memory.
+        
+        Args:
+            content (str or InMemoryDocument): URL, base64 content or
+                in-memory document
+        
+        Returns:
+            bool: Whether the content is usable
+        """
+        if not content or isinstance(content, InMemoryDocument):
+            return True
+        
+        if content.startswith("http://") or content.startswith("https://"):
+            return True
+        
+        try:
+            validate_base64_stream(content)
+            return True
+        except Exception:
+            return False
             
     
     def _format_api_response(self, result: Dict[str, Any], detailed_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -244,6 +332,20 @@ class DocumentValidationAPI:
         # Add validation rules to API response
         api_response["validation_rules"] = validation_rules
         
+        # Rules version the result was evaluated with
+        if result.get('rules_version'):
+            api_response["rules_version"] = result['rules_version']
+        
+        # Checks abandoned after a fail-fast verdict
+        if result.get('skipped_checks'):
+            api_response["skipped_checks"] = result['skipped_checks']
+        
+        # Checks still running; their result is looked up by deferred_linkage_id
+        if result.get('is_provisional'):
+            api_response["is_provisional"] = True
+            api_response["pending_checks"] = result.get('pending_checks', [])
+            api_response["deferred_linkage_id"] = result.get('deferred_linkage_id')
+        
         # Process directors with robust error handling
         directors_data = result.get('document_validation', {}).get('directors', {})
         if not isinstance(directors_data, dict):
@@ -282,6 +384,15 @@ class DocumentValidationAPI:
                     self.logger.warning(f"Document data for {doc_id} in director {director_id} is not a dictionary, got {type(doc_data)}. Skipping.")
                     continue
                     
+                # Documents no rule reads, or abandoned after a
+                # fail-fast verdict, are not extracted
+                if doc_data.get('extraction_status') in ('skipped', 'cancelled'):
+                    api_response["document_validation"]["directors"][director_id]["documents"][doc_id] = {
+                        "status": "Skipped",
+                        "error_messages": []
+                    }
+                    continue
+                
                 # Determine document status
                 is_valid = doc_data.get('is_valid', False)
                 status = "Valid" if is_valid else "Not Valid"
@@ -320,6 +431,8 @@ class DocumentValidationAPI:
                 address_proof = {}
                     
             status = "Valid" if address_proof.get('is_valid', False) else "Not Valid"
+            if address_proof.get('extraction_status') in ('skipped', 'cancelled'):
+                status = "Skipped"
             
             error_messages = []
             if 'error' in address_proof:
@@ -344,6 +457,8 @@ class DocumentValidationAPI:
                 noc = {}
                     
             status = "Valid" if noc.get('is_valid', False) else "Not Valid"
+            if noc.get('extraction_status') in ('skipped', 'cancelled'):
+                status = "Skipped"
             
             error_messages = []
             if 'error' in noc:
@@ -366,10 +481,85 @@ class DocumentValidationAPI:
         
         return api_response
     
+    def get_linkage_result(self, linkage_id: str) -> Dict[str, Any]:
+        """
+        Look up the result of a deferred Aadhar-PAN linkage check
+        
+        Args:
+            linkage_id (str): 'deferred_linkage_id' of the provisional response
+        
+        Returns:
+            dict: 'state' (pending/completed/unknown) and the linkage rule result
+        """
+        stored = linkage_results.get(linkage_id)
+        if stored is None:
+            return {"state": "unknown", "result": None}
+        return stored
+    
+    def submit_validation_job(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a validation to run in the background
+        
+        The input structure is checked before queuing, so malformed
+        requests are rejected at once; the validation itself runs on a
+        ValidationWorkerPool serving the job queue.
+        
+        Args:
+            input_data (dict): Input document data
+        
+        Returns:
+            dict: 'job_id' and 'state' (queued), or 'state' rejected with
+                an 'error_message'
+        """
+        try:
+            self._validate_input_structure(input_data)
+        except DocumentValidationError as e:
+            return {"job_id": None, "state": "rejected", "error_message": str(e)}
+        
+        job_id = validation_job_queue.submit(input_data)
+        if job_id is None:
+            return {"job_id": None, "state": "rejected", "error_message": "Job could not be queued"}
+        return {"job_id": job_id, "state": "queued"}
+    
+    def get_validation_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Look up the status of a queued validation
+        
+        Args:
+            job_id (str): Job identifier returned by submit_validation_job
+        
+        Returns:
+            dict: 'state' (queued/running/completed/failed/unknown), attempts,
+                checkpointed documents and timestamps
+        """
+        job = validation_job_queue.get(job_id)
+        if job is None:
+            return {"job_id": job_id, "state": "unknown"}
+        return job
+    
+    def get_validation_job_result(self, job_id: str) -> Dict[str, Any]:
+        """
+        Look up the result of a queued validation
+        
+        Args:
+            job_id (str): Job identifier returned by submit_validation_job
+        
+        Returns:
+            dict: Job status with 'result' (API response, compliance and
+                processing time) once the job has completed
+        """
+        job = validation_job_queue.get(job_id, include_result=True)
+        if job is None:
+            return {"job_id": job_id, "state": "unknown", "result": None}
+        return job
+    
     def process_input_file(self, file_path: str) -> Dict[str, Any]:
         """
         Process input from a JSON file
         
+        The file is read in chunks; large base64 documents are decoded
+        into memory-mapped scratch files rather than held as strings.
+        
         Args:
             file_path (str): Path to input JSON file
         
@@ -377,14 +567,13 @@ class DocumentValidationAPI:
             dict: Validation results
         """
         try:
-            with open(file_path, 'r') as file:
-                input_data = json.load(file)
+            input_data = read_json_file(file_path)
             
             api_response, _ = self.validate_document(input_data)
             return api_response
         
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in file: {file_path}")
+        except JSONStreamError as e:
+            logger.error(f"Invalid JSON in file: {file_path}: {e}")
             return self._create_error_response("Invalid JSON file")
         
         except FileNotFoundError:
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Dict, Any
+
+from fastapi import FastAPI, Body, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from api.document_validation_api import DocumentValidationAPI
+from api.validation_jobs_api import ValidationWorkerPool
+from config.settings import Config
+
+app = FastAPI(title="Document Validation API")
+
+# Requests are only queued here; validations run on the job workers
+validation_api = DocumentValidationAPI()
+worker_pool = ValidationWorkerPool() if Config.JOB_WORKERS > 0 else None
+
+
+@app.on_event("startup")
+def start_workers():
+    if worker_pool is not None:
+        worker_pool.start()
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    if worker_pool is not None:
+        worker_pool.stop(timeout=5)
+
+
+@app.post("/validate-documents")
+async def validate_documents(payload: Dict[str, Any] = Body(...)):
+    """
+    Validate documents and wait for the result
+
+    The request runs as a queued job, so concurrent requests share the
+    worker pool and a restart resumes it. If it takes longer than
+    JOB_WAIT_TIMEOUT the job id is returned with 202 for polling.
+    """
+    submitted = await run_in_threadpool(validation_api.submit_validation_job, payload)
+    if submitted['state'] == 'rejected':
+        return validation_api._create_error_response(submitted['error_message'])
+
+    job_id = submitted['job_id']
+    deadline = time.monotonic() + Config.JOB_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        job = await run_in_threadpool(validation_api.get_validation_job_result, job_id)
+        if job['state'] == 'completed':
+            return job['result']['response']
+        if job['state'] == 'failed':
+            return validation_api._create_error_response(job['error'])
+        await asyncio.sleep(Config.JOB_POLL_INTERVAL)
+
+    return JSONResponse(status_code=202, content=await run_in_threadpool(validation_api.get_validation_job, job_id))
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(payload: Dict[str, Any] = Body(...)):
+    submitted = await run_in_threadpool(validation_api.submit_validation_job, payload)
+    if submitted['state'] == 'rejected':
+        raise HTTPException(status_code=400, detail=submitted['error_message'])
+    return submitted
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = await run_in_threadpool(validation_api.get_validation_job, job_id)
+    if job['state'] == 'unknown':
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = await run_in_threadpool(validation_api.get_validation_job_result, job_id)
+    if job['state'] == 'unknown':
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+@app.get("/linkage/{linkage_id}")
+async def linkage_result(linkage_id: str):
+    """
+    Look up a deferred linkage check by the 'deferred_linkage_id' of its
+    provisional response; client request ids are never used as keys
+    """
+    linkage = await run_in_threadpool(validation_api.get_linkage_result, linkage_id)
+    if linkage['state'] == 'unknown':
+        raise HTTPException(status_code=404, detail="Unknown linkage check")
+    return linkage
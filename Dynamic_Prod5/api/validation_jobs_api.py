@@ -0,0 +1,219 @@
+import os
+import time
+import socket
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from api.document_validation_api import DocumentValidationAPI
+from services.validation_service import DocumentValidationService
+from services.extraction_service import ExtractionService
+from services.compliance_rules_repository import compliance_rules_repository
+from utils.elasticsearch_utils import es_client
+from utils.job_queue import ValidationJobQueue, validation_job_queue
+from utils.cancellation import CancellationToken
+from config.settings import Config
+
+
+class CheckpointingExtractionService:
+    """
+    Extraction service that checkpoints every finished document of a job
+
+    Wraps the shared extraction service. Each successful extraction is
+    written to the job queue under the job's id as soon as it returns,
+    and the checkpointed extractions of earlier attempts are offered to
+    the wrapped service as previous results, so a resumed job only
+    extracts the documents the interrupted attempt had not finished.
+    """
+
+    def __init__(self, extraction_service: ExtractionService, queue: ValidationJobQueue):
+        """
+        Initialize the wrapper
+
+        Args:
+            extraction_service (ExtractionService): Wrapped extraction service
+            queue (ValidationJobQueue): Queue holding the checkpoints
+        """
+        self.extraction_service = extraction_service
+        self.queue = queue
+        self.job_id = None
+        self.checkpointed = {}
+
+    def __getattr__(self, name):
+        return getattr(self.extraction_service, name)
+
+    def use(self, job_id: str):
+        """
+        Checkpoint the extractions of one job
+
+        Args:
+            job_id (str): Job identifier
+        """
+        self.job_id = job_id
+        self.checkpointed = self.queue.documents(job_id) if job_id else {}
+
+    def extract_document_data(self, source, document_type: str, cancel_token=None,
+                              previous_results=None) -> dict:
+        """
+        Extract a document, reusing or checkpointing its result
+
+        Args:
+            source (str or InMemoryDocument): URL, local file path or in-memory document
+            document_type (str): Type of document
+            cancel_token (CancellationToken, optional): Stops the extraction once cancelled
+            previous_results (dict, optional): Earlier results keyed by content fingerprint
+
+        Returns:
+            dict: Extracted document data
+        """
+        result = self.extraction_service.extract_document_data(
+            source,
+            document_type,
+            cancel_token=cancel_token,
+            previous_results={**self.checkpointed, **(previous_results or {})}
+        )
+
+        fingerprint = result.get('content_fingerprint') if isinstance(result, dict) else None
+        if self.job_id and fingerprint and fingerprint not in self.checkpointed:
+            self.checkpointed[fingerprint] = result
+            self.queue.checkpoint_document(self.job_id, fingerprint, result)
+        return result
+
+
+class ValidationWorkerPool:
+    """
+    Pool of threads that run queued validation jobs
+
+    Each worker claims one job at a time and validates it through its own
+    DocumentValidationAPI; all workers share one extraction service,
+    Elasticsearch client and rules repository. While a job runs its lease
+    is renewed, so jobs are only reclaimed from workers that stopped.
+    Several pools, in several processes, can serve the same queue.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue: Optional[ValidationJobQueue] = None):
+        """
+        Initialize the pool
+
+        Args:
+            workers (int, optional): Jobs run in parallel (defaults to Config.JOB_WORKERS)
+            queue (ValidationJobQueue, optional): Job queue; the shared queue if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers or Config.JOB_WORKERS)
+        self.queue = queue or validation_job_queue
+
+        self.extraction_service = ExtractionService(Config.OPENAI_API_KEY)
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        Start the worker threads
+        """
+        if self._threads:
+            return
+        self._stop.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work,
+                args=(f"{prefix}:{index}",),
+                name=f"validation-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self.logger.info(f"Started {self.workers} validation workers")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the workers once their current jobs finish
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self, worker_id: str):
+        """
+        Claim and run jobs until the pool is stopped
+
+        Args:
+            worker_id (str): Identifier of this worker
+        """
+        extractions = CheckpointingExtractionService(self.extraction_service, self.queue)
+        api = DocumentValidationAPI(DocumentValidationService(
+            es_client=es_client,
+            extraction_service=extractions,
+            rules_repository=compliance_rules_repository
+        ))
+
+        while not self._stop.is_set():
+            claimed = self.queue.claim(worker_id)
+            if claimed is None:
+                self._stop.wait(Config.JOB_POLL_INTERVAL)
+                continue
+
+            job_id, payload, attempt = claimed
+            extractions.use(job_id)
+            if extractions.checkpointed:
+                self.logger.info(
+                    f"Resuming job {job_id} (attempt {attempt}) with "
+                    f"{len(extractions.checkpointed)} checkpointed documents"
+                )
+            self._run_job(api, worker_id, job_id, payload)
+            extractions.use(None)
+
+    def _run_job(self, api: DocumentValidationAPI, worker_id: str, job_id: str, payload: Dict[str, Any]):
+        """
+        Validate one job, renewing its lease until the result is stored
+
+        If the lease is lost, the job now belongs to another worker, so
+        this worker's validation is cancelled and its result dropped.
+
+        Args:
+            api (DocumentValidationAPI): Worker's validation API
+            worker_id (str): Identifier of this worker
+            job_id (str): Job identifier
+            payload (dict): Validation input
+        """
+        done = threading.Event()
+        lost = threading.Event()
+        cancel_token = CancellationToken()
+
+        def renew():
+            while not done.wait(self.queue.lease / 3):
+                if not self.queue.renew(job_id, worker_id):
+                    self.logger.warning(f"Lost the lease of job {job_id}, cancelling it")
+                    lost.set()
+                    cancel_token.cancel(f"Lost the lease of job {job_id}")
+                    return
+
+        renewer = threading.Thread(target=renew, name=f"lease-{job_id}", daemon=True)
+        renewer.start()
+        start_time = time.time()
+        try:
+            api_response, detailed_result = api.validate_document(payload, cancel_token=cancel_token)
+            metadata = detailed_result.get('metadata', {})
+            if lost.is_set():
+                self.logger.info(f"Dropped the result of job {job_id}: its lease was lost")
+            elif 'error' in metadata:
+                self.queue.fail(job_id, worker_id, metadata['error'])
+            else:
+                self.queue.complete(job_id, worker_id, {
+                    "is_compliant": metadata.get('is_compliant'),
+                    "processing_time": round(time.time() - start_time, 3),
+                    "response": api_response
+                })
+
+        except Exception as e:
+            self.logger.error(f"Validation job {job_id} failed: {str(e)}", exc_info=True)
+            self.queue.fail(job_id, worker_id, str(e))
+
+        finally:
+            done.set()
+            renewer.join()
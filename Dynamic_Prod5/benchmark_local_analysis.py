@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import argparse
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from services.extraction_service import ExtractionService
+
+# Fields compared between the local analyzers and the AI model
+COMPARED_FIELDS = {
+    'signature': ['is_handwritten', 'is_complete'],
+    'passport_photo': ['is_passport_style', 'face_visible']
+}
+
+def classify_sample(file_name):
+    """
+    Map a Sample Docs file name to its document type
+
+    Args:
+        file_name (str): Sample file name
+
+    Returns:
+        str or None: 'signature', 'passport_photo' or None
+    """
+    name = file_name.lower()
+    if 'signature' in name:
+        return 'signature'
+    if 'passport_pic' in name or 'passport_photo' in name:
+        return 'passport_photo'
+    return None
+
+def as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ['yes', 'true']
+    return bool(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare local signature/photo analysis with the AI model")
+    parser.add_argument('--sample-dir', default=os.path.join(project_root, 'Sample Docs'))
+    parser.add_argument('--local-only', action='store_true', help="Skip the AI model even if a key is set")
+    args = parser.parse_args()
+
+    local_service = ExtractionService(local_document_types=list(COMPARED_FIELDS))
+    ai_service = ExtractionService(local_document_types=[])
+    use_ai = bool(ai_service.openai_api_key) and not args.local_only
+    if not use_ai:
+        print("OPENAI_API_KEY not set (or --local-only): reporting local results only\n")
+
+    agreements = {field: [0, 0] for fields in COMPARED_FIELDS.values() for field in fields}
+    local_times, ai_times = [], []
+
+    for root, _, files in sorted(os.walk(args.sample_dir)):
+        for file_name in sorted(files):
+            document_type = classify_sample(file_name)
+            if not document_type:
+                continue
+
+            with open(os.path.join(root, file_name), 'rb') as f:
+                image_data = local_service._convert_to_supported_image(f.read())
+            if not image_data:
+                print(f"Skipping {file_name}: conversion failed")
+                continue
+
+            start_time = time.perf_counter()
+            local_result = local_service._extract_locally(image_data, document_type) or {}
+            local_times.append(time.perf_counter() - start_time)
+
+            print(f"{os.path.basename(root)}/{file_name} ({document_type})")
+            print(f"  local  {local_times[-1] * 1000:8.1f} ms  clarity={local_result.get('clarity_score')} "
+                  + " ".join(f"{field}={local_result.get(field)}" for field in COMPARED_FIELDS[document_type]))
+
+            if not use_ai:
+                continue
+
+            start_time = time.perf_counter()
+            ai_result = ai_service._extract_with_ai(
+                image_data, document_type, ai_service._select_extraction_prompt(document_type)
+            ) or {}
+            ai_times.append(time.perf_counter() - start_time)
+
+            print(f"  ai     {ai_times[-1] * 1000:8.1f} ms  clarity={ai_result.get('clarity_score')} "
+                  + " ".join(f"{field}={ai_result.get(field)}" for field in COMPARED_FIELDS[document_type]))
+
+            for field in COMPARED_FIELDS[document_type]:
+                if field in ai_result:
+                    agreements[field][0] += as_bool(local_result.get(field)) == as_bool(ai_result[field])
+                    agreements[field][1] += 1
+
+    if local_times:
+        print(f"\nLocal: {len(local_times)} documents, mean {sum(local_times) / len(local_times) * 1000:.1f} ms")
+    if ai_times:
+        print(f"AI:    {len(ai_times)} documents, mean {sum(ai_times) / len(ai_times) * 1000:.1f} ms")
+        for field, (agreed, total) in agreements.items():
+            if total:
+                print(f"  {field}: local agrees with AI on {agreed}/{total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from services.image_preprocessing import ImagePreprocessor
+
+def load_sample_documents(sample_dir):
+    """
+    Load the sample images that can be converted in this environment
+
+    Args:
+        sample_dir (str): Directory holding sample documents
+
+    Returns:
+        list: (file name, task, document bytes) tuples
+    """
+    documents = []
+    for root, _, files in os.walk(sample_dir):
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            task = 'pdf' if data.startswith(b'%PDF-') else 'image'
+            try:
+                ImagePreprocessor(max_workers=0)._run(task, data)
+            except Exception as e:
+                print(f"Skipping {file_name}: {e}")
+                continue
+            documents.append((file_name, task, data))
+    return documents
+
+def run_batch(preprocessor, documents, threads):
+    """
+    Convert a batch the way the validation service does: one request thread per document
+
+    Args:
+        preprocessor (ImagePreprocessor): Preprocessor under test
+        documents (list): (file name, task, document bytes) tuples
+        threads (int): Request threads
+
+    Returns:
+        float: Documents converted per second
+    """
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda doc: preprocessor._run(doc[1], doc[2]), documents))
+    return len(documents) / (time.perf_counter() - start_time)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image preprocessing throughput")
+    parser.add_argument('--sample-dir', default=os.path.join(project_root, 'Sample Docs'))
+    parser.add_argument('--documents', type=int, default=40, help="Documents per batch")
+    parser.add_argument('--threads', type=int, default=20, help="Concurrent request threads")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    samples = load_sample_documents(args.sample_dir)
+    if not samples:
+        print("No convertible sample documents found")
+        return
+
+    documents = [samples[i % len(samples)] for i in range(args.documents)]
+    print(f"{len(samples)} sample documents, {args.documents} per batch, {args.threads} request threads\n")
+
+    worker_counts = [0] + sorted({
+        count for count in (1, 2, 4, 8, 16, 32, args.max_workers)
+        if count <= args.max_workers
+    })
+
+    baseline = None
+    print(f"{'workers':>8} {'docs/s':>10} {'speedup':>8}")
+    for workers in worker_counts:
+        preprocessor = ImagePreprocessor(max_workers=workers)
+        try:
+            # Warm up the pool so process start-up is not measured
+            preprocessor._run(samples[0][1], samples[0][2])
+            throughput = run_batch(preprocessor, documents, args.threads)
+        finally:
+            preprocessor.shutdown()
+
+        baseline = baseline or throughput
+        label = 'inline' if workers == 0 else str(workers)
+        print(f"{label:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
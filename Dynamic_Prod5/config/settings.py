@@ -1,4 +1,5 @@
 import os
+import tempfile
 # from dotenv import load_dotenv
 
 # # Load environment variables
@@ -37,6 +38,174 @@ class Config:
     # Document Validation Rules
     VALIDATION_RULES_INDEX = os.getenv('VALIDATION_RULES_INDEX', 'compliance_rules')
 
+    # Elasticsearch connection (opened lazily on first use)
+    ES_REQUEST_TIMEOUT = float(os.getenv('ES_REQUEST_TIMEOUT', 5.0))
+    ES_RECONNECT_INTERVAL = float(os.getenv('ES_RECONNECT_INTERVAL', 30.0))
+
+    # In-memory compliance rules snapshots
+    RULES_CACHE_TTL = int(os.getenv('RULES_CACHE_TTL', 300))
+    RULES_RETRY_INTERVAL = int(os.getenv('RULES_RETRY_INTERVAL', 30))
+    RULES_LOAD_TIMEOUT = float(os.getenv('RULES_LOAD_TIMEOUT', 2.0))
+
+    # Compliance rules hot reload (0 disables the watcher)
+    RULES_WATCH_INTERVAL = float(os.getenv('RULES_WATCH_INTERVAL', 10.0))
+    COMPLIANCE_RULES_FILE = os.getenv('COMPLIANCE_RULES_FILE', '')
+
+    # Document Download Limits
+    DOWNLOAD_CHUNK_SIZE = int(os.getenv('DOWNLOAD_CHUNK_SIZE', 64 * 1024))
+    MAX_PDF_DOWNLOAD_BYTES = int(os.getenv('MAX_PDF_DOWNLOAD_BYTES', 20 * 1024 * 1024))
+    MAX_IMAGE_DOWNLOAD_BYTES = int(os.getenv('MAX_IMAGE_DOWNLOAD_BYTES', 10 * 1024 * 1024))
+
+    # Document Download Cache
+    DOWNLOAD_CACHE_ENABLED = os.getenv('DOWNLOAD_CACHE_ENABLED', 'true').lower() == 'true'
+    DOWNLOAD_CACHE_DIR = os.getenv(
+        'DOWNLOAD_CACHE_DIR',
+        os.path.join(tempfile.gettempdir(), 'document_download_cache')
+    )
+    DOWNLOAD_CACHE_MAX_BYTES = int(os.getenv('DOWNLOAD_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    DOWNLOAD_CACHE_TTL = int(os.getenv('DOWNLOAD_CACHE_TTL', 300))
+    DOWNLOAD_CACHE_PRESIGNED_TTL = int(os.getenv('DOWNLOAD_CACHE_PRESIGNED_TTL', 3600))
+    DOWNLOAD_CACHE_ACCESS_FLUSH_INTERVAL = float(os.getenv('DOWNLOAD_CACHE_ACCESS_FLUSH_INTERVAL', 30))
+
+    # Image Preprocessing Pool (0 workers converts on the request thread).
+    # Workers are never forked from the threaded server process directly:
+    # a lock held by another thread at fork time would deadlock the child
+    IMAGE_PREPROCESS_WORKERS = int(os.getenv('IMAGE_PREPROCESS_WORKERS', os.cpu_count() or 1))
+    IMAGE_PREPROCESS_START_METHOD = os.getenv(
+        'IMAGE_PREPROCESS_START_METHOD',
+        'forkserver' if os.name == 'posix' else 'spawn'
+    )
+
+    # Local Image-Quality Prefilter (runs before any AI extraction)
+    IMAGE_QUALITY_PREFILTER_ENABLED = os.getenv('IMAGE_QUALITY_PREFILTER_ENABLED', 'true').lower() == 'true'
+    IMAGE_QUALITY_MAX_SIDE = int(os.getenv('IMAGE_QUALITY_MAX_SIDE', 1024))
+    IMAGE_QUALITY_MIN_SIDE = int(os.getenv('IMAGE_QUALITY_MIN_SIDE', 48))
+    IMAGE_QUALITY_MAX_ASPECT_RATIO = float(os.getenv('IMAGE_QUALITY_MAX_ASPECT_RATIO', 10.0))
+    IMAGE_QUALITY_MIN_CONTRAST = float(os.getenv('IMAGE_QUALITY_MIN_CONTRAST', 4.0))
+    IMAGE_QUALITY_MIN_BRIGHTNESS = float(os.getenv('IMAGE_QUALITY_MIN_BRIGHTNESS', 20.0))
+    IMAGE_QUALITY_MAX_BRIGHTNESS = float(os.getenv('IMAGE_QUALITY_MAX_BRIGHTNESS', 252.0))
+    IMAGE_QUALITY_MIN_SHARPNESS = float(os.getenv('IMAGE_QUALITY_MIN_SHARPNESS', 5.0))
+    IMAGE_QUALITY_MIN_INK_COVERAGE = float(os.getenv('IMAGE_QUALITY_MIN_INK_COVERAGE', 0.0005))
+
+    # Local Analysis Backend (document types assessed without an AI call)
+    LOCAL_ANALYSIS_DOCUMENT_TYPES = [
+        doc_type.strip() for doc_type in os.getenv('LOCAL_ANALYSIS_DOCUMENT_TYPES', '').split(',')
+        if doc_type.strip()
+    ]
+    LOCAL_MAX_BACKGROUND_STD = float(os.getenv('LOCAL_MAX_BACKGROUND_STD', 25.0))
+    SIGNATURE_MIN_INK_RATIO = float(os.getenv('SIGNATURE_MIN_INK_RATIO', 0.003))
+    SIGNATURE_MAX_INK_RATIO = float(os.getenv('SIGNATURE_MAX_INK_RATIO', 0.3))
+    SIGNATURE_MAX_EDGE_INK = float(os.getenv('SIGNATURE_MAX_EDGE_INK', 0.1))
+    PHOTO_MIN_ASPECT_RATIO = float(os.getenv('PHOTO_MIN_ASPECT_RATIO', 0.95))
+    PHOTO_MAX_ASPECT_RATIO = float(os.getenv('PHOTO_MAX_ASPECT_RATIO', 1.6))
+    PHOTO_SUBJECT_COLOR_DISTANCE = float(os.getenv('PHOTO_SUBJECT_COLOR_DISTANCE', 40.0))
+    PHOTO_MIN_SKIN_RATIO = float(os.getenv('PHOTO_MIN_SKIN_RATIO', 0.05))
+
+    # Aadhar-PAN Linkage Cache (keys are salted hashes, never raw numbers)
+    LINKAGE_CACHE_ENABLED = os.getenv('LINKAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    LINKAGE_CACHE_PATH = os.getenv(
+        'LINKAGE_CACHE_PATH',
+        os.path.join(tempfile.gettempdir(), 'aadhar_pan_linkage_cache.sqlite3')
+    )
+    LINKAGE_CACHE_SALT = os.getenv('LINKAGE_CACHE_SALT', '')
+    LINKAGE_CACHE_TTL_LINKED = int(os.getenv('LINKAGE_CACHE_TTL_LINKED', 30 * 24 * 3600))
+    LINKAGE_CACHE_TTL_NOT_LINKED = int(os.getenv('LINKAGE_CACHE_TTL_NOT_LINKED', 24 * 3600))
+    LINKAGE_CACHE_TTL_INCONCLUSIVE = int(os.getenv('LINKAGE_CACHE_TTL_INCONCLUSIVE', 3600))
+    LINKAGE_CACHE_MAX_ENTRIES = int(os.getenv('LINKAGE_CACHE_MAX_ENTRIES', 100000))
+
+    # Aadhar-PAN Linkage Scheduling (shared portal rate budget)
+    LINKAGE_MAX_CONCURRENCY = int(os.getenv('LINKAGE_MAX_CONCURRENCY', 4))
+    LINKAGE_RATE_PER_SECOND = float(os.getenv('LINKAGE_RATE_PER_SECOND', 1.0))
+    LINKAGE_BURST = int(os.getenv('LINKAGE_BURST', 3))
+    LINKAGE_BACKOFF_INITIAL = float(os.getenv('LINKAGE_BACKOFF_INITIAL', 5.0))
+    LINKAGE_BACKOFF_MAX = float(os.getenv('LINKAGE_BACKOFF_MAX', 60.0))
+    LINKAGE_MAX_RECHECKS = int(os.getenv('LINKAGE_MAX_RECHECKS', 2))
+    LINKAGE_TIMEOUT = float(os.getenv('LINKAGE_TIMEOUT', 120.0))
+
+    # Deferred linkage: respond with the check pending, deliver the result later
+    LINKAGE_DEFERRED = os.getenv('LINKAGE_DEFERRED', 'false').lower() == 'true'
+    LINKAGE_RESULTS_PATH = os.getenv(
+        'LINKAGE_RESULTS_PATH',
+        os.path.join(tempfile.gettempdir(), 'aadhar_pan_linkage_results.sqlite3')
+    )
+    LINKAGE_RESULTS_TTL = int(os.getenv('LINKAGE_RESULTS_TTL', 7 * 24 * 3600))
+    LINKAGE_CALLBACK_TIMEOUT = float(os.getenv('LINKAGE_CALLBACK_TIMEOUT', 10.0))
+    # Linkage results are only POSTed to configured endpoints: a request's
+    # 'linkage_callback_url' is used only if it is in the allow-list
+    LINKAGE_CALLBACK_URL = os.getenv('LINKAGE_CALLBACK_URL', '')
+    LINKAGE_CALLBACK_ALLOWED_URLS = [
+        url.strip() for url in os.getenv('LINKAGE_CALLBACK_ALLOWED_URLS', '').split(',') if url.strip()
+    ]
+    LINKAGE_CALLBACK_WORKERS = int(os.getenv('LINKAGE_CALLBACK_WORKERS', 4))
+
+    # Incremental re-validation: extraction and rule results are kept per
+    # application so a resubmission only re-extracts changed documents
+    INCREMENTAL_VALIDATION = os.getenv('INCREMENTAL_VALIDATION', 'false').lower() == 'true'
+    # Store every validation's extractions, so rule changes can be re-evaluated offline
+    EXTRACTION_STORE_ENABLED = os.getenv('EXTRACTION_STORE_ENABLED', 'false').lower() == 'true'
+    EXTRACTION_STORE_PATH = os.getenv(
+        'EXTRACTION_STORE_PATH',
+        os.path.join(tempfile.gettempdir(), 'document_extractions.sqlite3')
+    )
+    EXTRACTION_STORE_TTL = int(os.getenv('EXTRACTION_STORE_TTL', 30 * 24 * 3600))
+
+    # Preflight: reject requests certain to fail before any download or extraction
+    PREFLIGHT_ENABLED = os.getenv('PREFLIGHT_ENABLED', 'true').lower() == 'true'
+
+    # Fail-fast validation: a failed rule of these severities decides the
+    # verdict and cancels the request's outstanding downloads and AI calls
+    FAIL_FAST = os.getenv('FAIL_FAST', 'false').lower() == 'true'
+    FAIL_FAST_SEVERITIES = [
+        severity.strip().lower() for severity in os.getenv('FAIL_FAST_SEVERITIES', 'high').split(',')
+        if severity.strip()
+    ]
+
+    # Targeted re-reads of Aadhar/PAN numbers that fail offline validation
+    ID_REEXTRACTION_MAX_ATTEMPTS = int(os.getenv('ID_REEXTRACTION_MAX_ATTEMPTS', 1))
+
+    # Encoded characters decoded per step when streaming base64 uploads
+    BASE64_DECODE_CHUNK_SIZE = int(os.getenv('BASE64_DECODE_CHUNK_SIZE', 1024 * 1024))
+
+    # Streaming JSON input: strings longer than the threshold are decoded
+    # as base64 documents into memory-mapped scratch files ('' = temp dir)
+    JSON_READ_CHUNK_SIZE = int(os.getenv('JSON_READ_CHUNK_SIZE', 1024 * 1024))
+    JSON_SPILL_THRESHOLD = int(os.getenv('JSON_SPILL_THRESHOLD', 1024 * 1024))
+    JSON_SPILL_DIR = os.getenv('JSON_SPILL_DIR', '')
+
+    # Batch validation: applications validated in parallel
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 4))
+
+    # Durable validation job queue (SQLite, WAL) and its worker pool
+    JOB_QUEUE_PATH = os.getenv(
+        'JOB_QUEUE_PATH',
+        os.path.join(tempfile.gettempdir(), 'validation_jobs.sqlite3')
+    )
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 60.0))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+    JOB_RESULTS_TTL = int(os.getenv('JOB_RESULTS_TTL', 7 * 24 * 3600))
+    # Seconds /validate-documents waits before answering 202 with the job id
+    JOB_WAIT_TIMEOUT = float(os.getenv('JOB_WAIT_TIMEOUT', 300.0))
+
+    # HTTP server
+    API_HOST = os.getenv('API_HOST', '0.0.0.0')
+    API_PORT = int(os.getenv('API_PORT', 8000))
+
+    @classmethod
+    def get_download_size_limits(cls):
+        """
+        Get maximum download size per sniffed document type
+
+        Returns:
+            dict: Maximum size in bytes keyed by file type
+        """
+        return {
+            'PDF': cls.MAX_PDF_DOWNLOAD_BYTES,
+            'PNG': cls.MAX_IMAGE_DOWNLOAD_BYTES,
+            'JPEG': cls.MAX_IMAGE_DOWNLOAD_BYTES
+        }
+
     @classmethod
     def get_elasticsearch_config(cls):
         """
@@ -47,7 +216,8 @@ class Config:
         """
         return {
             'hosts': [cls.ELASTICSEARCH_HOST],
-            'http_auth': (cls.ELASTICSEARCH_USERNAME, cls.ELASTICSEARCH_PASSWORD)
+            'http_auth': (cls.ELASTICSEARCH_USERNAME, cls.ELASTICSEARCH_PASSWORD),
+            'request_timeout': cls.ES_REQUEST_TIMEOUT
         }
 
     @classmethod
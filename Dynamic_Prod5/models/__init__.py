@@ -9,6 +9,7 @@ from .document_models import (
     DocumentType,
     NationalityType,
     DocumentInfo,
+    InMemoryDocument,
     DirectorDocuments,
     CompanyDocuments,
     ValidationResult,
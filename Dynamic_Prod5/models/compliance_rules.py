@@ -1,6 +1,124 @@
+import copy
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+# Rules applied when no rule set is configured for a service
+DEFAULT_COMPLIANCE_RULES = [
+    {
+        "rule_id": "DIRECTOR_COUNT",
+        "rule_name": "Director Count",
+        "description": "Number of directors must be between 2 and 5",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "min_directors": 2,
+            "max_directors": 5
+        }
+    },
+    {
+        "rule_id": "PASSPORT_PHOTO",
+        "rule_name": "Passport Photo",
+        "description": "Passport photo must be clear and properly formatted",
+        "severity": "medium",
+        "is_active": True,
+        "conditions": {
+            "min_clarity_score": 0.7,
+            "is_passport_style": True,
+            "face_visible": True
+        }
+    },
+    {
+        "rule_id": "SIGNATURE",
+        "rule_name": "Signature",
+        "description": "Signature must be clear and handwritten",
+        "severity": "medium",
+        "is_active": True,
+        "conditions": {
+            "min_clarity_score": 0.7,
+            "is_handwritten": True,
+            "is_complete": True
+        }
+    },
+    {
+        "rule_id": "ADDRESS_PROOF",
+        "rule_name": "Address Proof",
+        "description": "Address proof must be valid and recent",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "max_age_days": 45,
+            "name_match_required": True,
+            "complete_address_required": True
+        }
+    },
+    {
+        "rule_id": "INDIAN_DIRECTOR_PAN",
+        "rule_name": "Indian Director PAN Card",
+        "description": "Indian directors must provide a valid PAN card",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "min_age": 18
+        }
+    },
+    {
+        "rule_id": "INDIAN_DIRECTOR_AADHAR",
+        "rule_name": "Indian Director Aadhar Card",
+        "description": "Indian directors must provide valid Aadhar cards",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "masked_not_allowed": True,
+            "different_images_required": True
+        }
+    },
+    {
+        "rule_id": "FOREIGN_DIRECTOR_DOCS",
+        "rule_name": "Foreign Director Documents",
+        "description": "Foreign directors must provide valid identification",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "passport_required": True,
+            "passport_validity_check": True,
+            "driving_license_required": False
+        }
+    },
+    {
+        "rule_id": "COMPANY_ADDRESS_PROOF",
+        "rule_name": "Company Address Proof",
+        "description": "Company must have valid address proof",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "max_age_days": 45,
+            "complete_address_required": True,
+            "name_match_required": False
+        }
+    },
+    {
+        "rule_id": "NOC_VALIDATION",
+        "rule_name": "No Objection Certificate",
+        "description": "NOC from property owner is required",
+        "severity": "medium",
+        "is_active": True,
+        "conditions": {
+            "noc_required": True,
+            "signature_required": True
+        }
+    },
+    {
+        "rule_id": "AADHAR_PAN_LINKAGE",
+        "rule_name": "Aadhar PAN Linkage",
+        "description": "Aadhar and PAN must be linked for Indian directors",
+        "severity": "high",
+        "is_active": True,
+        "conditions": {
+            "linkage_api_check_required": True
+        }
+    }
+]
+
 @dataclass
 class ComplianceRule:
     """
@@ -89,4 +207,13 @@ def load_compliance_rules_from_config(config_path: str) -> Optional[ComplianceRu
     
     except Exception as e:
         print(f"Error loading compliance rules: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def get_default_compliance_rules() -> Dict:
+    """
+    Get a fresh copy of the default compliance rules
+    
+    Returns:
+        dict: Default compliance rules
+    """
+    return {"rules": copy.deepcopy(DEFAULT_COMPLIANCE_RULES)}
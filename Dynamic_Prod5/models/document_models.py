@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from enum import Enum, auto
 
 class DocumentType(Enum):
@@ -33,6 +33,28 @@ class DocumentInfo:
     is_recent: Optional[bool] = None  # Added for recency check
     is_masked: Optional[bool] = None  # Added for masked Aadhar check
 
+@dataclass
+class InMemoryDocument:
+    """
+    Represents document content held in memory rather than at a URL or path
+    """
+    data: Union[bytes, bytearray, memoryview] = field(repr=False)
+    name: str = ""
+    media_type: Optional[str] = None
+
+    @property
+    def source(self) -> str:
+        """
+        Get a printable source label for logs and results
+        
+        Returns:
+            str: Source label of the form "inline:<name>"
+        """
+        return f"inline:{self.name}"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
 @dataclass
 class DirectorDocuments:
     """
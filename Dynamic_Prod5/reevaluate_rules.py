@@ -0,0 +1,38 @@
+import os
+import sys
+import argparse
+from contextlib import redirect_stdout
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from services.reevaluation import RuleReEvaluationJob
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-run the current compliance rules over stored extractions and report changed verdicts"
+    )
+    parser.add_argument('--service-id', help="Only applications of this service")
+    parser.add_argument('--application-id', action='append', dest='application_ids',
+                        help="Application to re-evaluate (repeatable); all stored applications if omitted")
+    parser.add_argument('--output', default='-', help="JSON lines file for changed verdicts (default: stdout)")
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        # Validation progress goes to stderr so stdout carries only JSON lines
+        with redirect_stdout(sys.stderr):
+            summary = RuleReEvaluationJob().run(output, args.service_id, args.application_ids)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(
+        f"Evaluated {summary['evaluated']}, changed {summary['changed']}, "
+        f"not found {summary['not_found']}, errors {summary['errors']}",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
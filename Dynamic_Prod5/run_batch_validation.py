@@ -0,0 +1,50 @@
+import os
+import sys
+import argparse
+from contextlib import redirect_stdout
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from api.batch_validation_api import BatchValidationJob
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate a JSON lines file or directory of application payloads"
+    )
+    parser.add_argument('input', help="JSON lines file, or directory of .json/.jsonl payloads")
+    parser.add_argument('--output', default='-', help="JSON lines file for results (default: stdout)")
+    parser.add_argument('--workers', type=int, help="Applications validated in parallel (default: BATCH_WORKERS)")
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and validate everything")
+    args = parser.parse_args()
+
+    checkpoint = args.checkpoint
+    if checkpoint is None and args.output != '-':
+        checkpoint = args.output + '.checkpoint'
+    if args.restart and checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    # Results are appended so a resumed run keeps the earlier ones
+    output = sys.stdout if args.output == '-' else open(args.output, 'w' if args.restart else 'a')
+    try:
+        # Validation progress goes to stderr so stdout carries only JSON lines
+        with redirect_stdout(sys.stderr):
+            summary = BatchValidationJob(args.workers, checkpoint).run(args.input, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(
+        f"Completed {summary['completed']}, failed {summary['failed']}, "
+        f"skipped {summary['skipped']} already checkpointed",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+import signal
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from api.validation_jobs_api import ValidationWorkerPool
+
+def main():
+    parser = argparse.ArgumentParser(description="Run validation job workers against the job queue")
+    parser.add_argument('--workers', type=int, help="Jobs run in parallel (default: JOB_WORKERS)")
+    args = parser.parse_args()
+
+    pool = ValidationWorkerPool(args.workers)
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+    pool.start()
+    try:
+        while not stopping:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Running jobs finish; jobs left unfinished are resumed by the next worker
+        pool.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+import uvicorn
+
+from config.settings import Config
+
+if __name__ == "__main__":
+    # Serves /validate-documents (as used by test.py) and the /jobs API
+    uvicorn.run("api.server:app", host=Config.API_HOST, port=Config.API_PORT)
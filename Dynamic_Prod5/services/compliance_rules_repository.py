@@ -0,0 +1,466 @@
+import os
+import json
+import time
+import copy
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+from dataclasses import dataclass, field, replace, asdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, Optional, Tuple, Hashable
+
+from config.settings import Config
+from models.compliance_rules import (
+    ComplianceRule,
+    ComplianceRuleSet,
+    get_default_compliance_rules,
+    load_compliance_rules_from_config
+)
+from services.rule_engine import CompiledRuleSet
+from utils.elasticsearch_utils import ElasticsearchClient, es_client as default_es_client
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def rules_version(rules) -> str:
+    """
+    Fingerprint a rule list so content changes can be detected
+
+    Args:
+        rules (list): Compliance rules
+
+    Returns:
+        str: Short hex digest of the canonical JSON
+    """
+    canonical = json.dumps(rules, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class RuleSetSnapshot:
+    """
+    Immutable compliance rule set for one service
+
+    ``compiled`` holds the rules compiled by the repository's compiler
+    when the snapshot was published, so requests never compile rules.
+    """
+    service_id: str
+    service_name: str
+    rules: Tuple[MappingProxyType, ...]
+    version: str
+    source: str
+    loaded_at: float
+    expires_at: float
+    source_token: Optional[Hashable] = None
+    compiled: Optional[CompiledRuleSet] = field(default=None, compare=False, repr=False)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build a mutable copy in the compliance rules shape used by validation
+
+        Returns:
+            dict: 'service_id', 'service_name' and 'rules'
+        """
+        return {
+            "service_id": self.service_id,
+            "service_name": self.service_name,
+            "rules": _thaw(self.rules)
+        }
+
+
+class ComplianceRulesRepository:
+    """
+    In-memory compliance rules, loaded per service from Elasticsearch
+
+    Lookups are served from immutable snapshots. Stale snapshots are
+    refreshed in the background while the old one keeps serving, and a
+    service seen for the first time waits at most RULES_LOAD_TIMEOUT
+    before falling back to the default rules, so a slow cluster never
+    blocks a validation request.
+
+    Rules are read from COMPLIANCE_RULES_FILE instead when it is set.
+
+    Once a compiler is registered with ``use_compiler`` every snapshot is
+    compiled on the loading thread before it is published.
+    """
+
+    def __init__(
+        self,
+        es_client: Optional[ElasticsearchClient] = None,
+        ttl=None,
+        load_timeout=None,
+        rules_file=None
+    ):
+        """
+        Initialize the repository
+
+        Args:
+            es_client (ElasticsearchClient, optional): Elasticsearch client
+            ttl (int, optional): Seconds before a loaded rule set is refreshed
+            load_timeout (float, optional): Seconds a first lookup waits for Elasticsearch
+            rules_file (str, optional): JSON rule set file used instead of Elasticsearch
+        """
+        self.logger = logging.getLogger(__name__)
+        self.es_client = es_client or default_es_client
+        self.ttl = ttl or Config.RULES_CACHE_TTL
+        self.load_timeout = load_timeout if load_timeout is not None else Config.RULES_LOAD_TIMEOUT
+        self.rules_file = rules_file if rules_file is not None else Config.COMPLIANCE_RULES_FILE
+
+        self._lock = threading.Lock()
+        self._snapshots = MappingProxyType({})
+        self._refreshing = {}
+        self._executor = None
+        self._watcher = None
+        self._compiler = None
+
+    def get(self, service_id) -> RuleSetSnapshot:
+        """
+        Get the rule set for a service
+
+        Args:
+            service_id (str): Service identifier
+
+        Returns:
+            RuleSetSnapshot: Current rules, or the defaults if none are loaded yet
+        """
+        service_id = str(service_id)
+        snapshot = self._snapshots.get(service_id)
+
+        if snapshot is not None:
+            if snapshot.is_stale:
+                self.refresh(service_id)
+            return snapshot
+
+        future = self.refresh(service_id)
+        try:
+            return future.result(timeout=self.load_timeout)
+        except FutureTimeoutError:
+            self.logger.warning(
+                f"Compliance rules for service {service_id} not loaded within "
+                f"{self.load_timeout}s, using default rules"
+            )
+            return self._compile(self._default_snapshot(service_id, time.time()))
+
+    def refresh(self, service_id):
+        """
+        Reload a service's rules in the background
+
+        Concurrent refreshes of the same service share one load.
+
+        Args:
+            service_id (str): Service identifier
+
+        Returns:
+            Future: Completed with the new snapshot
+        """
+        service_id = str(service_id)
+        with self._lock:
+            future = self._refreshing.get(service_id)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='rules-refresh')
+                future = self._executor.submit(self._load, service_id)
+                self._refreshing[service_id] = future
+                future.add_done_callback(lambda _: self._refresh_done(service_id))
+            return future
+
+    def _refresh_done(self, service_id):
+        with self._lock:
+            self._refreshing.pop(service_id, None)
+
+    def invalidate(self, service_id=None):
+        """
+        Drop cached rule sets so the next lookup reloads them
+
+        Args:
+            service_id (str, optional): Service to drop, all services if omitted
+        """
+        with self._lock:
+            if service_id is None:
+                self._snapshots = MappingProxyType({})
+            else:
+                snapshots = dict(self._snapshots)
+                snapshots.pop(str(service_id), None)
+                self._snapshots = MappingProxyType(snapshots)
+
+    def start_watching(self, interval=None):
+        """
+        Start polling the rules source for changes (idempotent)
+
+        Args:
+            interval (float, optional): Seconds between polls
+        """
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = RulesWatcher(self, interval)
+                self._watcher.start()
+
+    def use_compiler(self, compiler: Callable[[list, str], CompiledRuleSet]):
+        """
+        Compile every snapshot with the given compiler when it is published
+
+        Snapshots already published are recompiled and republished, so
+        lookups after this call always carry compiled rules.
+
+        Args:
+            compiler (callable): Takes the rule dicts and the rules version,
+                returns a CompiledRuleSet
+        """
+        with self._lock:
+            if self._compiler == compiler:
+                return
+            self._compiler = compiler
+            snapshots = list(self._snapshots.values())
+
+        for snapshot in snapshots:
+            self._publish(replace(snapshot, compiled=None))
+
+    def snapshots(self) -> Dict[str, RuleSetSnapshot]:
+        """
+        Get the currently published snapshots
+
+        Returns:
+            dict: Snapshot keyed by service ID
+        """
+        return dict(self._snapshots)
+
+    def source_token(self, service_id) -> Hashable:
+        """
+        Get a cheap marker that changes whenever a service's rules change
+
+        Args:
+            service_id (str): Service identifier
+
+        Returns:
+            hashable: File mtime and size, or Elasticsearch document seq_no/version
+        """
+        if self.rules_file:
+            try:
+                stat = os.stat(self.rules_file)
+            except FileNotFoundError:
+                return None
+            return (stat.st_mtime_ns, stat.st_size)
+        return self.es_client.get_compliance_rules_version(service_id)
+
+    def _fetch_rule_sets(self, service_id):
+        """
+        Read rule sets from the configured source
+
+        Args:
+            service_id (str): Service identifier
+
+        Returns:
+            list: Rule set dicts
+        """
+        if not self.rules_file:
+            return self.es_client.search_compliance_rules(service_id)
+
+        ruleset = load_compliance_rules_from_config(self.rules_file)
+        if ruleset is None:
+            raise ValueError(f"Invalid compliance rules file: {self.rules_file}")
+        return [{
+            "service_id": ruleset.service_id,
+            "service_name": ruleset.service_name,
+            "rules": [asdict(rule) for rule in ruleset.rules]
+        }]
+
+    @staticmethod
+    def _check_rule_set(service_id, rules):
+        """
+        Reject rule sets that cannot be evaluated consistently
+
+        Args:
+            service_id (str): Service identifier
+            rules (list): Rule dicts
+
+        Raises:
+            ValueError: On duplicate rule IDs
+        """
+        ruleset = ComplianceRuleSet(
+            service_id=service_id,
+            service_name='',
+            rules=[ComplianceRule(rule_id=rule.get('rule_id', ''), rule_name=rule.get('rule_name', ''))
+                   for rule in rules]
+        )
+        if not ruleset.validate_ruleset():
+            raise ValueError(f"Duplicate rule IDs in compliance rules for service {service_id}")
+
+    def _load(self, service_id) -> RuleSetSnapshot:
+        """
+        Load a service's rules and publish the snapshot
+
+        The source marker is read before and after the fetch; a rule set
+        edited mid-read is discarded and picked up on the next attempt.
+        On failure the previous snapshot stays in service; with none to
+        keep, the defaults are published and retried after RULES_RETRY_INTERVAL.
+
+        Args:
+            service_id (str): Service identifier
+
+        Returns:
+            RuleSetSnapshot: Published snapshot
+        """
+        try:
+            token = self.source_token(service_id)
+            rule_sets = self._fetch_rule_sets(service_id)
+            if self.source_token(service_id) != token:
+                raise RuntimeError("rules changed while loading")
+
+            rule_set = next(
+                (rule_set for rule_set in rule_sets if str(rule_set.get('service_id')) == service_id),
+                None
+            )
+            if rule_set is not None:
+                self._check_rule_set(service_id, rule_set.get('rules', []))
+        except Exception as e:
+            now = time.time()
+            previous = self._snapshots.get(service_id)
+            self.logger.error(f"Error loading compliance rules for service {service_id}: {str(e)}")
+            if previous is not None and previous.source != 'default':
+                snapshot = replace(previous, expires_at=now + Config.RULES_RETRY_INTERVAL)
+            else:
+                snapshot = self._default_snapshot(service_id, now)
+            return self._publish(snapshot)
+
+        now = time.time()
+        previous = self._snapshots.get(service_id)
+        if rule_set is None:
+            self.logger.warning(f"No compliance rules found for service ID: {service_id}, using default rules")
+            rules = get_default_compliance_rules()['rules']
+            service_name = f"Default Rules for Service {service_id}"
+            source = 'default'
+        else:
+            rules = rule_set.get('rules', [])
+            service_name = rule_set.get('service_name', f'Service {service_id}')
+            source = 'file' if self.rules_file else 'elasticsearch'
+
+        version = rules_version(rules)
+        if previous is not None and previous.version != version:
+            self.logger.info(f"Compliance rules for service {service_id} changed: {previous.version} -> {version}")
+
+        return self._publish(RuleSetSnapshot(
+            service_id=service_id,
+            service_name=service_name,
+            rules=_freeze(copy.deepcopy(rules)),
+            version=version,
+            source=source,
+            loaded_at=now,
+            expires_at=now + self.ttl,
+            source_token=token
+        ))
+
+    def _default_snapshot(self, service_id, now) -> RuleSetSnapshot:
+        rules = get_default_compliance_rules()['rules']
+        return RuleSetSnapshot(
+            service_id=service_id,
+            service_name=f"Default Rules for Service {service_id}",
+            rules=_freeze(rules),
+            version=rules_version(rules),
+            source='default',
+            loaded_at=now,
+            expires_at=now + Config.RULES_RETRY_INTERVAL
+        )
+
+    def _compile(self, snapshot: RuleSetSnapshot) -> RuleSetSnapshot:
+        """
+        Attach the compiled rules to a snapshot that has none yet
+
+        Args:
+            snapshot (RuleSetSnapshot): Snapshot about to be served
+
+        Returns:
+            RuleSetSnapshot: Snapshot carrying its CompiledRuleSet, unchanged
+                if no compiler is registered
+        """
+        compiler = self._compiler
+        if compiler is None or snapshot.compiled is not None:
+            return snapshot
+        return replace(snapshot, compiled=compiler(_thaw(snapshot.rules), snapshot.version))
+
+    def _publish(self, snapshot: RuleSetSnapshot) -> RuleSetSnapshot:
+        # Compiled before publishing, outside the lock
+        snapshot = self._compile(snapshot)
+        # Readers see either the old or the new mapping, never a partial update
+        with self._lock:
+            self._snapshots = MappingProxyType({**self._snapshots, snapshot.service_id: snapshot})
+        return snapshot
+
+
+class RulesWatcher:
+    """
+    Background poller that hot-reloads changed compliance rules
+
+    Each poll compares the source marker of every loaded service with
+    the one its snapshot was built from. A changed marker must hold for
+    two consecutive polls before the reload, so a rule set that is
+    still being edited is not picked up half way.
+    """
+
+    def __init__(self, repository: ComplianceRulesRepository, interval=None):
+        """
+        Initialize the watcher
+
+        Args:
+            repository (ComplianceRulesRepository): Repository to keep current
+            interval (float, optional): Seconds between polls
+        """
+        self.logger = logging.getLogger(__name__)
+        self.repository = repository
+        self.interval = interval or Config.RULES_WATCH_INTERVAL
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='rules-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """
+        Check every loaded service once and reload those that changed
+        """
+        for service_id, snapshot in self.repository.snapshots().items():
+            try:
+                token = self.repository.source_token(service_id)
+            except Exception as e:
+                self.logger.debug(f"Rules version check failed for service {service_id}: {str(e)}")
+                continue
+
+            if token == snapshot.source_token:
+                self._pending.pop(service_id, None)
+            elif self._pending.get(service_id) == token:
+                self.logger.info(f"Compliance rules for service {service_id} changed, reloading")
+                self._pending.pop(service_id, None)
+                self.repository.refresh(service_id)
+            else:
+                self._pending[service_id] = token
+
+# Global compliance rules repository
+compliance_rules_repository = ComplianceRulesRepository()
@@ -0,0 +1,246 @@
+import re
+import copy
+import hashlib
+import binascii
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List, Callable, Union
+from urllib.parse import urlparse, unquote
+
+from models.document_models import InMemoryDocument
+from utils.base64_stream import sha256_base64_stream
+
+# Company document fields that carry metadata rather than a document
+NON_DOCUMENT_KEYS = {'address_proof_type'}
+
+
+def canonicalize_document_source(doc_content: Union[str, InMemoryDocument]) -> str:
+    """
+    Build a canonical identity for a document source
+
+    Google Drive links collapse to their file ID, S3 URLs to bucket/key
+    (dropping any signature) and base64 payloads or in-memory documents
+    to the SHA-256 of the decoded bytes.
+
+    Args:
+        doc_content (str or InMemoryDocument): Document URL, base64-encoded
+            content or in-memory document
+
+    Returns:
+        str: Canonical source key
+
+    Raises:
+        binascii.Error: If base64 content cannot be decoded
+    """
+    if isinstance(doc_content, InMemoryDocument):
+        return f"sha256:{hashlib.sha256(doc_content.data).hexdigest()}"
+
+    if doc_content.startswith("http://") or doc_content.startswith("https://"):
+        parsed = urlparse(doc_content)
+        host = parsed.netloc.lower()
+
+        if 'drive.google.com' in host or 'docs.google.com' in host:
+            file_id_match = re.search(r'(?:/d/|[?&]id=)([a-zA-Z0-9_-]+)', doc_content)
+            if file_id_match:
+                return f"gdrive:{file_id_match.group(1)}"
+
+        if host.endswith('.amazonaws.com') and 's3' in host.split('.'):
+            path = unquote(parsed.path.lstrip('/'))
+            if host.startswith('s3.') or host.startswith('s3-'):
+                # Path-style URL: s3.<region>.amazonaws.com/<bucket>/<key>
+                return f"s3:{path}"
+            # Virtual-hosted URL: <bucket>.s3.<region>.amazonaws.com/<key>
+            return f"s3:{host.split('.s3')[0]}/{path}"
+
+        return f"url:{parsed.scheme}://{host}{parsed.path}?{parsed.query}"
+
+    return f"sha256:{sha256_base64_stream(doc_content)}"
+
+
+class RequestDocumentRegistry:
+    """
+    Request-scoped registry that deduplicates document extraction
+
+    Every document slot ("director1.aadharCardFront",
+    "companyDocuments.noc", ...) is mapped to a canonical source key
+    before any work is scheduled. Slots that share a source key and an
+    extraction profile are extracted once and the result is fanned out.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry
+        """
+        self._lock = threading.Lock()
+        self._slot_keys: Dict[str, str] = {}
+        self._key_slots: Dict[str, List[str]] = {}
+        self._extractions: Dict[tuple, Future] = {}
+
+    @staticmethod
+    def slot_id(owner: str, doc_key: str) -> str:
+        """
+        Build the slot identifier for a document
+
+        Args:
+            owner (str): Director key or 'companyDocuments'
+            doc_key (str): Document key
+
+        Returns:
+            str: Slot identifier
+        """
+        return f"{owner}.{doc_key}"
+
+    def register(self, slot: str, doc_content: Any) -> Optional[str]:
+        """
+        Register a document slot under its canonical source key
+
+        Args:
+            slot (str): Slot identifier
+            doc_content (str or InMemoryDocument): Document URL, base64
+                content or in-memory document
+
+        Returns:
+            str or None: Canonical source key, None if it cannot be derived
+        """
+        if not isinstance(doc_content, (str, InMemoryDocument)) or not doc_content:
+            return None
+
+        try:
+            source_key = canonicalize_document_source(doc_content)
+        except (binascii.Error, ValueError):
+            # Leave undecodable content to the extraction error path
+            return None
+
+        with self._lock:
+            self._slot_keys[slot] = source_key
+            self._key_slots.setdefault(source_key, []).append(slot)
+
+        return source_key
+
+    def plan(self, directors: Dict[str, Any], company_docs: Dict[str, Any]):
+        """
+        Register every document of a request before scheduling extraction
+
+        Args:
+            directors (dict): Director information keyed by director
+            company_docs (dict): Company documents
+        """
+        if isinstance(directors, dict):
+            for director_key, director_info in directors.items():
+                if not isinstance(director_info, dict):
+                    continue
+                documents = director_info.get('documents', {})
+                if not isinstance(documents, dict):
+                    continue
+                for doc_key, doc_content in documents.items():
+                    self.register(self.slot_id(director_key, doc_key), doc_content)
+
+        if isinstance(company_docs, dict):
+            for doc_key, doc_content in company_docs.items():
+                if doc_key in NON_DOCUMENT_KEYS:
+                    continue
+                self.register(self.slot_id('companyDocuments', doc_key), doc_content)
+
+    def source_key(self, slot: str) -> Optional[str]:
+        """
+        Get the canonical source key of a slot
+
+        Args:
+            slot (str): Slot identifier
+
+        Returns:
+            str or None: Canonical source key
+        """
+        return self._slot_keys.get(slot)
+
+    def shared_slots(self, slot: str) -> List[str]:
+        """
+        Get the other slots that reference the same document
+
+        Args:
+            slot (str): Slot identifier
+
+        Returns:
+            list: Other slot identifiers with the same source key
+        """
+        source_key = self._slot_keys.get(slot)
+        if source_key is None:
+            return []
+        return [other for other in self._key_slots.get(source_key, []) if other != slot]
+
+    def duplicate_groups(self) -> Dict[str, List[str]]:
+        """
+        Get all source keys referenced by more than one slot
+
+        Returns:
+            dict: Slot identifiers keyed by shared source key
+        """
+        return {
+            source_key: list(slots)
+            for source_key, slots in self._key_slots.items()
+            if len(slots) > 1
+        }
+
+    def extract(
+        self,
+        slot: str,
+        extraction_profile: str,
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Run an extraction once per (source, profile) and share the result
+
+        The first slot to arrive runs ``compute`` in its own thread; later
+        slots for the same key wait for that result.
+
+        Args:
+            slot (str): Slot identifier
+            extraction_profile (str): Prompt/verification profile of the slot
+            compute (callable): Performs download and extraction
+
+        Returns:
+            dict: Independent copy of the extraction result
+        """
+        source_key = self._slot_keys.get(slot)
+        if source_key is None:
+            return compute()
+
+        extraction_key = (source_key, extraction_profile)
+        with self._lock:
+            future = self._extractions.get(extraction_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._extractions[extraction_key] = future
+
+        if is_leader:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+
+        return copy.deepcopy(future.result())
+
+    def annotate(self, slot: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Attach source identity and duplicate reuse flags to a slot result
+
+        Args:
+            slot (str): Slot identifier
+            result (dict): Slot result
+
+        Returns:
+            dict: The annotated result
+        """
+        if not isinstance(result, dict):
+            return result
+
+        source_key = self._slot_keys.get(slot)
+        if source_key:
+            result['source_key'] = source_key
+            shared = self.shared_slots(slot)
+            if shared:
+                result['duplicate_slots'] = shared
+
+        return result
@@ -279,6 +279,47 @@ def get_generic_extraction_prompt():
     If a field is not found, use null.
     """
 
+def get_aadhar_number_reextraction_prompt(previous_number, reason):
+    """
+    Generate a targeted prompt to re-read an Aadhar number that failed validation
+    """
+    return f"""
+    Look only at the 12-digit Aadhar number printed on this card.
+    
+    A previous reading returned "{previous_number}", which is not a valid
+    Aadhar number ({reason}). Read the number again digit by digit, taking
+    care with easily confused digits such as 0/8, 1/7, 3/8 and 5/6.
+    
+    Return a JSON with this exact key:
+    {{
+        "aadhar_number": "XXXX XXXX XXXX"
+    }}
+    
+    If the number is masked or not readable, use null.
+    """
+
+def get_pan_number_reextraction_prompt(previous_number, reason):
+    """
+    Generate a targeted prompt to re-read a PAN that failed validation
+    """
+    return f"""
+    Look only at the PAN (Permanent Account Number) and the holder's name on this card.
+    
+    A previous reading returned "{previous_number}", which is not a valid
+    PAN ({reason}). A PAN is 5 letters, 4 digits and 1 letter; the 4th
+    letter is P for individuals and the 5th letter is the initial of the
+    holder's surname. Read it again character by character, taking care
+    with easily confused characters such as O/0, I/1, S/5 and B/8.
+    
+    Return a JSON with these exact keys:
+    {{
+        "pan_number": "XXXXXXXXXX",
+        "name": "Full Name as on card"
+    }}
+    
+    If a field is not readable, use null.
+    """
+
 # def get_aadhar_extraction_prompt():
 #     return """
 #     Analyze this Aadhar card image and extract the following information in JSON format:
@@ -3,15 +3,26 @@ import re
 import json
 import logging
 import base64
-import io
+import copy
+import asyncio
+import hashlib
+import functools
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 
-import requests
 import openai
 from PIL import Image
 import PyPDF2
-from pdf2image import convert_from_bytes
+
+from utils.file_utils import DocumentDownloader
+from utils.single_flight import SingleFlight
+from utils.cancellation import OperationCancelled, raise_if_cancelled
+from utils.id_checksums import validate_aadhar_number, validate_pan_number
+from services.image_preprocessing import image_preprocessor
+from services.image_quality import assess_image_quality
+from services.local_analysis import LOCAL_ANALYZERS
+from config.settings import Config
+from models.document_models import InMemoryDocument
 
 # Import extraction prompts
 from .extraction_prompts import (
@@ -24,20 +35,28 @@ from .extraction_prompts import (
     get_passport_photo_extraction_prompt,
     get_signature_extraction_prompt,
     get_noc_extraction_prompt,
-    get_generic_extraction_prompt
+    get_generic_extraction_prompt,
+    get_aadhar_number_reextraction_prompt,
+    get_pan_number_reextraction_prompt
 )
 
+# Process-wide table of in-flight extractions keyed by (content hash, profile)
+extraction_flights = SingleFlight()
+
 class ExtractionService:
     """
     Advanced document data extraction service using AI Vision
     """
     
-    def __init__(self, openai_api_key=None):
+    def __init__(self, openai_api_key=None, local_document_types=None):
         """
         Initialize the extraction service
         
         Args:
             openai_api_key (str, optional): OpenAI API key
+            local_document_types (list, optional): Extraction profiles assessed
+                by the local analysis backend instead of the AI model
+                (defaults to Config.LOCAL_ANALYSIS_DOCUMENT_TYPES)
         """
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -52,6 +71,14 @@ class ExtractionService:
         file_handler.setFormatter(formatter)
         self.logger.addHandler(file_handler)
         
+        # Extraction backend selection
+        if local_document_types is None:
+            local_document_types = Config.LOCAL_ANALYSIS_DOCUMENT_TYPES
+        self.local_document_types = {
+            doc_type.lower() for doc_type in local_document_types
+            if doc_type.lower() in LOCAL_ANALYZERS
+        }
+        
         # API Key configuration
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
         
@@ -70,22 +97,14 @@ class ExtractionService:
             bytes: Converted image data
         """
         try:
-            # Convert first page of PDF to image
-            images = convert_from_bytes(
-                pdf_data, 
-                first_page=1, 
-                last_page=1,
-                fmt='png'
-            )
+            # Render the first page in the preprocessing pool
+            png_data = image_preprocessor.convert_pdf(pdf_data)
             
-            if not images:
+            if not png_data:
                 self.logger.error("PDF to image conversion produced no images")
                 return None
             
-            # Convert to bytes
-            byte_arr = io.BytesIO()
-            images[0].save(byte_arr, format='PNG')
-            return byte_arr.getvalue()
+            return png_data
         
         except Exception as e:
             self.logger.error(f"PDF conversion error: {str(e)}")
@@ -226,85 +245,239 @@ class ExtractionService:
         
         return data
     
-    def extract_document_data(self, source: str, document_type: str) -> dict:
+    def extract_document_data(
+        self,
+        source: Union[str, InMemoryDocument],
+        document_type: str,
+        cancel_token=None,
+        previous_results: Optional[Dict[str, dict]] = None
+    ) -> dict:
         """
-        Extract data from a document (supports URL or local file path)
+        Extract data from a document (supports URL, local file path or in-memory content)
+        
+        Concurrent extractions of the same document content and type,
+        from any request in this process, share a single AI call.
+        Successful results carry a 'content_fingerprint' of the content
+        and extraction profile.
         
         Args:
-            source (str): URL or local file path
+            source (str or InMemoryDocument): URL, local file path or in-memory document
             document_type (str): Type of document
+            cancel_token (CancellationToken, optional): Stops the download and
+                any further AI calls once cancelled
+            previous_results (dict, optional): Earlier results keyed by content
+                fingerprint; a match is returned without extracting again
         
         Returns:
             dict: Extracted document data
-        """
-        extraction_start_time = datetime.now()
         
+        Raises:
+            OperationCancelled: If the token is cancelled before extraction completes
+        """
         try:
             self.logger.info(f"Starting extraction: {document_type}")
-            self.logger.debug(f"Input source: {source}")
+            self.logger.debug(f"Input source: {getattr(source, 'source', source)}")
 
-            # 1. Load document_data from either file or URL
-            if os.path.isfile(source):
-                with open(source, 'rb') as f:
-                    document_data = f.read()
-            elif source.startswith("http"):
-                document_data = self._download_document(source)
-            else:
-                raise ValueError("Unsupported document source type. Must be URL or file path.")
+            # 1. Load document_data from memory, file or URL
+            raise_if_cancelled(cancel_token)
+            document_data = self._load_document(source, cancel_token)
 
             if not document_data:
                 return self._create_extraction_failure_record(document_type, "Failed to load document")
 
-            # 2. Convert to image for AI model
-            image_data = self._convert_to_supported_image(document_data)
+            extraction_key = self._extraction_key(document_data, document_type)
+            fingerprint = self.content_fingerprint(extraction_key)
+            if previous_results and fingerprint in previous_results:
+                self.logger.info(f"Reusing previous extraction for unchanged {document_type}")
+                return copy.deepcopy(previous_results[fingerprint])
+
+            # 2-5. Convert, extract and verify once per in-flight (content, type)
+            while True:
+                raise_if_cancelled(cancel_token)
+                try:
+                    result = copy.deepcopy(extraction_flights.do(
+                        extraction_key,
+                        lambda: self._extract_from_document_data(document_data, document_type, cancel_token)
+                    ))
+                    if isinstance(result, dict) and result.get('extraction_status') != 'failed':
+                        result['content_fingerprint'] = fingerprint
+                    return result
+                except OperationCancelled:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        raise
+                    # The shared call was led by a request that has since been
+                    # cancelled; run the extraction again for this caller
+
+        except OperationCancelled:
+            self.logger.info(f"Extraction cancelled for {document_type}: {cancel_token.reason}")
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Extraction error for {document_type}: {str(e)}", exc_info=True)
+            return self._create_extraction_failure_record(document_type, str(e))
+
+    async def extract_document_data_async(
+        self,
+        source: Union[str, InMemoryDocument],
+        document_type: str,
+        cancel_token=None,
+        previous_results: Optional[Dict[str, dict]] = None
+    ) -> dict:
+        """
+        Asyncio variant of extract_document_data
+        
+        Runs extract_document_data in the event loop's default executor, so
+        a coroutine shares in-flight AI calls with thread callers and gets
+        the same reuse, fingerprints and cancellation handling.
+        
+        Args:
+            source (str or InMemoryDocument): URL, local file path or in-memory document
+            document_type (str): Type of document
+            cancel_token (CancellationToken, optional): Stops the download and
+                any further AI calls once cancelled
+            previous_results (dict, optional): Earlier results keyed by content
+                fingerprint; a match is returned without extracting again
+        
+        Returns:
+            dict: Extracted document data
+        
+        Raises:
+            OperationCancelled: If the token is cancelled before extraction completes
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                self.extract_document_data,
+                source,
+                document_type,
+                cancel_token=cancel_token,
+                previous_results=previous_results
+            )
+        )
+
+    def _load_document(self, source, cancel_token=None):
+        """
+        Load raw document bytes from memory, a local file or a URL
+        
+        Args:
+            source (str or InMemoryDocument): URL, local file path or in-memory document
+            cancel_token (CancellationToken, optional): Checked while downloading
+        
+        Returns:
+            bytes, memoryview or None: Document content
+        """
+        if isinstance(source, InMemoryDocument):
+            return source.data
+        elif os.path.isfile(source):
+            with open(source, 'rb') as f:
+                return f.read()
+        elif source.startswith("http"):
+            return self._download_document(source, cancel_token)
+        else:
+            raise ValueError("Unsupported document source type. Must be URL or file path.")
+
+    def _extraction_key(self, document_data, document_type):
+        """
+        Build the single-flight key for an extraction
+        
+        Args:
+            document_data (bytes): Raw document content
+            document_type (str): Type of document
+        
+        Returns:
+            tuple: (content SHA-256, extraction profile, backend)
+        """
+        return (
+            hashlib.sha256(document_data).hexdigest(),
+            self.extraction_profile(document_type),
+            self.extraction_backend(document_type)
+        )
+
+    @staticmethod
+    def content_fingerprint(extraction_key) -> str:
+        """
+        Build a stable fingerprint of a document's content and extraction profile
+        
+        Args:
+            extraction_key (tuple): Key built by _extraction_key
+        
+        Returns:
+            str: Fingerprint of the form "<content sha256>:<profile>:<backend>"
+        """
+        return ':'.join(extraction_key)
+
+    def _extract_from_document_data(self, document_data, document_type, cancel_token=None):
+        """
+        Convert, extract and verify already loaded document content
+        
+        Args:
+            document_data (bytes): Raw document content
+            document_type (str): Type of document
+            cancel_token (CancellationToken, optional): Checked before each AI call
+        
+        Returns:
+            dict: Extracted document data
+        """
+        extraction_start_time = datetime.now()
+        
+        # 2. Convert to image for AI model
+        image_data = self._convert_to_supported_image(document_data)
+
+        if not image_data:
+            return self._create_extraction_failure_record(document_type, "Image conversion failed")
 
-            if not image_data:
-                return self._create_extraction_failure_record(document_type, "Image conversion failed")
+        # Reject clearly unusable images locally, before spending tokens
+        local_quality = None
+        if Config.IMAGE_QUALITY_PREFILTER_ENABLED:
+            local_quality = assess_image_quality(image_data, self.extraction_profile(document_type))
+            if local_quality and not local_quality["usable"]:
+                failure = self._create_extraction_failure_record(
+                    document_type,
+                    f"Image quality check failed: {'; '.join(local_quality['issues'])}"
+                )
+                failure['local_quality'] = local_quality
+                return failure
 
+        if self.extraction_backend(document_type) == 'local':
+            # 3-4. Assess locally, skipping the AI call entirely
+            extracted_data = self._extract_locally(image_data, document_type)
+        else:
             # 3. Choose extraction prompt
             extraction_prompt = self._select_extraction_prompt(document_type)
 
             # 4. Run AI-based extraction
-            extracted_data = self._extract_with_ai(image_data, document_type, extraction_prompt)
+            extracted_data = self._extract_with_ai(image_data, document_type, extraction_prompt, cancel_token)
 
-            # 5. Verify extracted data
-            verified_data = self._verify_extracted_data(extracted_data, document_type)
+            # Re-read ID numbers that fail offline checksum/structure validation
+            extracted_data = self._recheck_identity_number(image_data, document_type, extracted_data, cancel_token)
 
-            self.logger.info(
-                f"Completed extraction for {document_type} in {(datetime.now() - extraction_start_time).total_seconds():.2f} seconds"
-            )
-            # Ensure 'is_valid' is set based on heuristics
-            # if isinstance(verified_data, dict):
-            #     if "is_valid" not in verified_data:
-            #         # Use 'valid' or 'is_valid_*' as fallback
-            #         valid_flag = (
-            #             verified_data.get("valid", "").lower() == "yes"
-            #             or verified_data.get(f"is_valid_{document_type.lower()}", False)
-            #             or verified_data.get("valid_document", "").lower() == "yes"
-            #         )
-            #         verified_data["is_valid"] = bool(valid_flag)
-            # Ensure 'is_valid' is set based on any available flag
-            if isinstance(verified_data, dict):
-                if "is_valid" not in verified_data:
-                    raw_flag = (
-                        verified_data.get("valid") or
-                        verified_data.get(f"is_valid_{document_type.lower()}") or
-                        verified_data.get("valid_document")
-                    )
-
-                    # Safely convert string "yes"/"true" or raw boolean into boolean
-                    if isinstance(raw_flag, str):
-                        valid_flag = raw_flag.strip().lower() in ["yes", "true"]
-                    else:
-                        valid_flag = bool(raw_flag)
-
-                    verified_data["is_valid"] = valid_flag
-
-            return verified_data or self._create_extraction_failure_record(document_type, "Verification failed")
+        # 5. Verify extracted data
+        verified_data = self._verify_extracted_data(extracted_data, document_type)
 
-        except Exception as e:
-            self.logger.error(f"Extraction error for {document_type}: {str(e)}", exc_info=True)
-            return self._create_extraction_failure_record(document_type, str(e))
+        self.logger.info(
+            f"Completed extraction for {document_type} in {(datetime.now() - extraction_start_time).total_seconds():.2f} seconds"
+        )
+        # Ensure 'is_valid' is set based on any available flag
+        if isinstance(verified_data, dict):
+            if "is_valid" not in verified_data:
+                raw_flag = (
+                    verified_data.get("valid") or
+                    verified_data.get(f"is_valid_{document_type.lower()}") or
+                    verified_data.get("valid_document")
+                )
+
+                # Safely convert string "yes"/"true" or raw boolean into boolean
+                if isinstance(raw_flag, str):
+                    valid_flag = raw_flag.strip().lower() in ["yes", "true"]
+                else:
+                    valid_flag = bool(raw_flag)
+
+                verified_data["is_valid"] = valid_flag
+
+            if local_quality:
+                verified_data["local_quality"] = local_quality
+
+        return verified_data or self._create_extraction_failure_record(document_type, "Verification failed")
 
         
     def _select_extraction_prompt(self, document_type):
@@ -336,6 +509,126 @@ class ExtractionService:
             get_generic_extraction_prompt()
         )
     
+    def extraction_profile(self, document_type):
+        """
+        Identify the prompt and verification applied to a document type
+        
+        Document types with the same profile produce identical extraction
+        results for the same document, so the result can be shared.
+        
+        Args:
+            document_type (str): Type of document
+        
+        Returns:
+            str: Extraction profile identifier
+        """
+        profile_aliases = {
+            'aadhar_front': 'aadhar_side',
+            'aadhar_back': 'aadhar_side'
+        }
+        
+        document_type = document_type.lower()
+        return profile_aliases.get(document_type, document_type)
+    
+    def _recheck_identity_number(self, image_data, document_type, extracted_data, cancel_token=None):
+        """
+        Validate an extracted Aadhar/PAN number offline and re-read it if invalid
+        
+        A targeted re-extraction is cheaper than letting a misread number
+        reach the Aadhar-PAN linkage check.
+        
+        Args:
+            image_data (bytes): Converted image data
+            document_type (str): Type of document
+            extracted_data (dict): AI extraction result
+            cancel_token (CancellationToken, optional): Checked before each re-read
+        
+        Returns:
+            dict: Extraction result annotated with 'id_validation'
+        """
+        profile = self.extraction_profile(document_type)
+        if not isinstance(extracted_data, dict) or profile not in ('aadhar', 'aadhar_side', 'pan'):
+            return extracted_data
+        
+        if profile == 'pan':
+            field = 'pan_number'
+            validate = lambda number: validate_pan_number(number, extracted_data.get('name'))
+            reextraction_prompt = get_pan_number_reextraction_prompt
+        else:
+            field = 'aadhar_number'
+            validate = validate_aadhar_number
+            reextraction_prompt = get_aadhar_number_reextraction_prompt
+        
+        number = extracted_data.get(field)
+        if not number or not isinstance(number, str):
+            return extracted_data
+        
+        # Masked Aadhar numbers cannot be checksum-validated
+        if field == 'aadhar_number' and (extracted_data.get('is_masked') or re.search(r'[Xx*]', number)):
+            return extracted_data
+        
+        result = validate(number)
+        attempts = 0
+        while not result['valid'] and attempts < Config.ID_REEXTRACTION_MAX_ATTEMPTS:
+            attempts += 1
+            self.logger.warning(f"{field} for {document_type} failed validation ({result['error']}), re-extracting")
+            
+            retry_data = self._extract_with_ai(
+                image_data, document_type, reextraction_prompt(number, result['error']), cancel_token
+            )
+            candidate = retry_data.get(field) if isinstance(retry_data, dict) else None
+            if not candidate or not isinstance(candidate, str):
+                break
+            
+            if field == 'pan_number' and retry_data.get('name') and not extracted_data.get('name'):
+                extracted_data['name'] = retry_data['name']
+            
+            number = candidate
+            result = validate(number)
+            if result['valid']:
+                extracted_data[field] = candidate
+        
+        extracted_data['id_validation'] = {
+            "field": field,
+            "valid": result['valid'],
+            "error": result['error'],
+            "reextraction_attempts": attempts
+        }
+        return extracted_data
+    
+    def extraction_backend(self, document_type):
+        """
+        Identify the backend that extracts a document type
+        
+        Args:
+            document_type (str): Type of document
+        
+        Returns:
+            str: 'local' for the local analyzers, otherwise 'ai'
+        """
+        if self.extraction_profile(document_type) in self.local_document_types:
+            return 'local'
+        return 'ai'
+    
+    def _extract_locally(self, image_data, document_type):
+        """
+        Assess a document with the local analysis backend
+        
+        Args:
+            image_data (bytes): Converted image data
+            document_type (str): Type of document
+        
+        Returns:
+            dict: Assessment in the same shape as the AI response, or None
+        """
+        try:
+            extracted_data = LOCAL_ANALYZERS[self.extraction_profile(document_type)](image_data)
+            extracted_data['analysis_backend'] = 'local'
+            return extracted_data
+        except Exception as e:
+            self.logger.error(f"Local analysis failed for {document_type}: {str(e)}")
+            return None
+    
     def _verify_extracted_data(self, extracted_data, document_type):
         """
         Verify extracted data for consistency and completeness
@@ -431,35 +724,40 @@ class ExtractionService:
             'clarity_score': 0.0
         }
     
-    def _download_document(self, url):
+    def _download_document(self, url, cancel_token=None):
+        """
+        Stream a document from a URL with size caps and content sniffing
+        
+        Args:
+            url (str): Document URL (Google Drive share links supported)
+            cancel_token (CancellationToken, optional): Checked between chunks
+        
+        Returns:
+            bytes or None: Document content
+        """
         try:
             # Enhanced Google Drive link handling
-            if 'drive.google.com' in url:
-                # Extract file ID more robustly
-                file_id_match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
-                if file_id_match:
-                    file_id = file_id_match.group(1)
-                    url = f'https://drive.google.com/uc?export=download&id={file_id}'
+            url = DocumentDownloader.resolve_download_url(url)
             
-            # Robust download with multiple retries
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
                 "Accept": "*/*"
             }
             
-            response = requests.get(
+            document_data = DocumentDownloader.stream_download(
                 url, 
                 headers=headers, 
-                allow_redirects=True,
-                timeout=30
+                timeout=30,
+                cancel_token=cancel_token
             )
             
-            # Validate response
-            if response.status_code == 200:
-                return response.content
+            if document_data is None:
+                self.logger.error(f"Download failed or rejected: {url}")
             
-            self.logger.error(f"Download failed: {response.status_code}")
-            return None
+            return document_data
+        
+        except OperationCancelled:
+            raise
         
         except Exception as e:
             self.logger.error(f"Document download error: {str(e)}")
@@ -478,8 +776,9 @@ class ExtractionService:
         # Log initial document data details
         self.logger.info(f"Document data length: {len(document_data)} bytes")
         
-        # Log first 100 bytes to inspect content
-        self.logger.info(f"First 100 bytes: {document_data[:100].hex()}")
+        # Log first 100 bytes to inspect content (slicing a memoryview does not copy)
+        head = bytes(document_data[:100])
+        self.logger.info(f"First 100 bytes: {head.hex()}")
         
         try:
             # Try to identify file type
@@ -499,20 +798,12 @@ class ExtractionService:
                         return name
                 return "Unknown"
             
-            file_type = identify_file_type(document_data)
+            file_type = identify_file_type(head)
             self.logger.info(f"Identified file type: {file_type}")
             
-            # Try opening as an image first
+            # Try opening as an image first (RGB convert and PNG encode run in the preprocessing pool)
             try:
-                with Image.open(io.BytesIO(document_data)) as img:
-                    # Convert to RGB mode to ensure compatibility
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    # Save to a bytes buffer in PNG format
-                    byte_arr = io.BytesIO()
-                    img.save(byte_arr, format='PNG')
-                    return byte_arr.getvalue()
+                return image_preprocessor.convert_image(document_data)
             except (Image.UnidentifiedImageError, IOError) as img_err:
                 self.logger.warning(f"Image opening failed: {img_err}")
                 
@@ -524,7 +815,7 @@ class ExtractionService:
                     
                     # Attempt to decode as text
                     try:
-                        text_content = document_data.decode('utf-8', errors='ignore')
+                        text_content = bytes(document_data[:500]).decode('utf-8', errors='ignore')
                         self.logger.info(f"Decoded text content (first 500 chars): {text_content[:500]}")
                     except Exception as decode_err:
                         self.logger.error(f"Text decoding error: {decode_err}")
@@ -535,7 +826,7 @@ class ExtractionService:
             self.logger.error(f"Comprehensive document conversion error: {str(e)}")
             return None
         
-    def _extract_with_ai(self, image_data, document_type, extraction_prompt):
+    def _extract_with_ai(self, image_data, document_type, extraction_prompt, cancel_token=None):
         """
         Extract document data using AI with improved error handling
         
@@ -543,10 +834,14 @@ class ExtractionService:
             image_data (bytes): Image data to extract
             document_type (str): Type of document being extracted
             extraction_prompt (str): Specific prompt for document extraction
+            cancel_token (CancellationToken, optional): Skips the call once cancelled
         
         Returns:
             dict or None: Extracted document data
         """
+        # A call already sent is not interrupted, but none start after cancellation
+        raise_if_cancelled(cancel_token)
+        
         try:
             # Encode image to base64
             base64_image = base64.b64encode(image_data).decode('utf-8')
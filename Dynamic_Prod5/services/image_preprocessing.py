@@ -0,0 +1,252 @@
+import io
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image
+from pdf2image import convert_from_bytes
+
+from config.settings import Config
+
+
+def flatten_to_rgb(img):
+    """
+    Convert an image to RGB, placing transparent areas on white
+
+    Dropping the alpha channel directly turns transparent backgrounds
+    (common for signature uploads) black, hiding dark ink.
+
+    Args:
+        img (PIL.Image.Image): Decoded image
+
+    Returns:
+        PIL.Image.Image: RGB image
+    """
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def convert_image_to_png(image_data):
+    """
+    Decode an image, convert it to RGB and re-encode it as PNG
+
+    Args:
+        image_data (bytes-like): Original image data
+
+    Returns:
+        bytes: PNG image data
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not a readable image
+    """
+    with Image.open(io.BytesIO(image_data)) as img:
+        # Convert to RGB mode to ensure compatibility
+        img = flatten_to_rgb(img)
+
+        byte_arr = io.BytesIO()
+        img.save(byte_arr, format='PNG')
+        return byte_arr.getvalue()
+
+
+def convert_pdf_to_png(pdf_data):
+    """
+    Render the first page of a PDF as PNG
+
+    Args:
+        pdf_data (bytes-like): PDF document data
+
+    Returns:
+        bytes or None: PNG image data, None if the PDF has no pages
+    """
+    images = convert_from_bytes(
+        bytes(pdf_data),
+        first_page=1,
+        last_page=1,
+        fmt='png'
+    )
+
+    if not images:
+        return None
+
+    byte_arr = io.BytesIO()
+    images[0].save(byte_arr, format='PNG')
+    return byte_arr.getvalue()
+
+
+# Conversions that may run in a worker process, by task name
+PREPROCESSING_TASKS = {
+    'image': convert_image_to_png,
+    'pdf': convert_pdf_to_png
+}
+
+
+def _run_shared_memory_task(task, input_name, input_size):
+    """
+    Worker entry point: convert a document held in shared memory
+
+    The PNG result is written to a new shared memory block whose
+    ownership passes to the parent, which copies it out and unlinks it.
+
+    Args:
+        task (str): Key of PREPROCESSING_TASKS
+        input_name (str): Name of the input shared memory block
+        input_size (int): Number of document bytes in the block
+
+    Returns:
+        tuple: (output block name, output size), (None, 0) for no output
+    """
+    input_block = shared_memory.SharedMemory(name=input_name)
+    try:
+        buffer = input_block.buf[:input_size]
+        try:
+            png_data = PREPROCESSING_TASKS[task](buffer)
+        finally:
+            buffer.release()
+    finally:
+        input_block.close()
+
+    if not png_data:
+        return None, 0
+
+    output_block = shared_memory.SharedMemory(create=True, size=len(png_data))
+    output_block.buf[:len(png_data)] = png_data
+    output_name = output_block.name
+    output_block.close()
+    return output_name, len(png_data)
+
+
+class ImagePreprocessor:
+    """
+    Runs CPU-bound image decoding and re-encoding in a process pool
+
+    Document bytes are handed to workers through shared memory rather
+    than pickled, so request threads only block on I/O and the GIL is
+    not held while images are decoded and PNG-encoded. With zero workers
+    (or if the pool breaks) conversion runs inline on the calling thread.
+    """
+
+    def __init__(self, max_workers=None, start_method=None):
+        """
+        Initialize the preprocessor; the pool is started on first use
+
+        Args:
+            max_workers (int, optional): Worker process count, 0 to run inline
+            start_method (str, optional): multiprocessing start method
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers if max_workers is not None else Config.IMAGE_PREPROCESS_WORKERS
+        self.start_method = start_method or Config.IMAGE_PREPROCESS_START_METHOD
+
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        """
+        Get the process pool, creating it on first use
+
+        Returns:
+            ProcessPoolExecutor or None: Pool, None when running inline
+        """
+        if self.max_workers <= 0:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._executor
+
+    def _run(self, task, document_data):
+        """
+        Run a conversion task in the pool through shared memory
+
+        Args:
+            task (str): Key of PREPROCESSING_TASKS
+            document_data (bytes-like): Document data
+
+        Returns:
+            bytes or None: PNG image data
+        """
+        executor = self._get_executor()
+        size = len(document_data)
+        if executor is None or size == 0:
+            return PREPROCESSING_TASKS[task](document_data)
+
+        input_block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            input_block.buf[:size] = document_data
+            try:
+                output_name, output_size = executor.submit(
+                    _run_shared_memory_task, task, input_block.name, size
+                ).result()
+            except BrokenProcessPool:
+                self.logger.warning("Image preprocessing pool broke, converting inline")
+                self.shutdown()
+                return PREPROCESSING_TASKS[task](document_data)
+        finally:
+            input_block.close()
+            input_block.unlink()
+
+        if output_name is None:
+            return None
+
+        output_block = shared_memory.SharedMemory(name=output_name)
+        try:
+            return bytes(output_block.buf[:output_size])
+        finally:
+            output_block.close()
+            output_block.unlink()
+
+    def convert_image(self, image_data):
+        """
+        Convert an image to RGB PNG
+
+        Args:
+            image_data (bytes-like): Original image data
+
+        Returns:
+            bytes: PNG image data
+
+        Raises:
+            PIL.UnidentifiedImageError: If the data is not a readable image
+        """
+        return self._run('image', image_data)
+
+    def convert_pdf(self, pdf_data):
+        """
+        Render the first page of a PDF as PNG
+
+        Args:
+            pdf_data (bytes-like): PDF document data
+
+        Returns:
+            bytes or None: PNG image data
+        """
+        return self._run('pdf', pdf_data)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker processes; a new pool is started on next use
+
+        Args:
+            wait (bool): Wait for running conversions to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+# Global image preprocessor
+image_preprocessor = ImagePreprocessor()
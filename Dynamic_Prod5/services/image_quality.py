@@ -0,0 +1,147 @@
+import io
+from typing import Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from config.settings import Config
+from services.image_preprocessing import flatten_to_rgb
+
+# Document profiles whose content is ink on a plain background
+INK_PROFILES = {'signature'}
+
+
+def load_grayscale(image_data, max_side=None):
+    """
+    Decode an image into a downscaled grayscale array
+
+    Args:
+        image_data (bytes-like): Encoded image data
+        max_side (int, optional): Longest side of the analysed image
+
+    Returns:
+        tuple: (grayscale float32 array, original width, original height)
+    """
+    max_side = max_side or Config.IMAGE_QUALITY_MAX_SIDE
+    with Image.open(io.BytesIO(image_data)) as img:
+        width, height = img.size
+        img.draft('L', (max_side, max_side))
+        gray = flatten_to_rgb(img).convert('L')
+        gray.thumbnail((max_side, max_side))
+        return np.asarray(gray, dtype=np.float32), width, height
+
+
+def laplacian_variance(gray):
+    """
+    Measure sharpness as the variance of the 4-neighbour Laplacian
+
+    Args:
+        gray (numpy.ndarray): Grayscale image
+
+    Returns:
+        float: Laplacian variance (low values indicate blur)
+    """
+    if gray.shape[0] < 3 or gray.shape[1] < 3:
+        return 0.0
+
+    laplacian = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] +
+        gray[1:-1, :-2] + gray[1:-1, 2:] -
+        4.0 * gray[1:-1, 1:-1]
+    )
+    return float(laplacian.var())
+
+
+def compute_quality_metrics(gray, width, height):
+    """
+    Compute image-quality metrics on a grayscale array
+
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        width (int): Original image width
+        height (int): Original image height
+
+    Returns:
+        dict: Resolution, brightness, contrast, sharpness and ink metrics
+    """
+    histogram = np.bincount(gray.astype(np.uint8).ravel(), minlength=256)
+    cumulative = np.cumsum(histogram) / max(gray.size, 1)
+    low, high = np.searchsorted(cumulative, [0.02, 0.98])
+
+    brightness = float(gray.mean())
+    background = float(np.median(gray))
+
+    return {
+        "width": width,
+        "height": height,
+        "aspect_ratio": round(max(width, height) / max(min(width, height), 1), 3),
+        "brightness": round(brightness, 2),
+        "contrast": round(float(gray.std()), 2),
+        "dynamic_range": int(high - low),
+        "sharpness": round(laplacian_variance(gray), 2),
+        # Pixels clearly darker than the background
+        "ink_coverage": round(float((gray < background * 0.6).mean()), 4)
+    }
+
+
+def find_quality_issues(metrics, profile=None):
+    """
+    List the reasons an image is clearly unusable
+
+    Thresholds are deliberately loose: only images that the LLM would
+    certainly reject are flagged.
+
+    Args:
+        metrics (dict): Output of compute_quality_metrics
+        profile (str, optional): Extraction profile of the document
+
+    Returns:
+        list: Issue descriptions, empty if the image is usable
+    """
+    issues = []
+
+    if min(metrics["width"], metrics["height"]) < Config.IMAGE_QUALITY_MIN_SIDE:
+        issues.append(f"Image resolution too low ({metrics['width']}x{metrics['height']})")
+
+    if metrics["aspect_ratio"] > Config.IMAGE_QUALITY_MAX_ASPECT_RATIO:
+        issues.append(f"Unusual aspect ratio ({metrics['aspect_ratio']})")
+
+    if metrics["contrast"] < Config.IMAGE_QUALITY_MIN_CONTRAST:
+        issues.append("Image is blank or has no contrast")
+    elif metrics["brightness"] < Config.IMAGE_QUALITY_MIN_BRIGHTNESS:
+        issues.append("Image is too dark")
+    elif (metrics["brightness"] > Config.IMAGE_QUALITY_MAX_BRIGHTNESS
+            and metrics["ink_coverage"] < Config.IMAGE_QUALITY_MIN_INK_COVERAGE):
+        # A sparse page on white paper is as bright as a washed-out
+        # photo, but still has dark text on it
+        issues.append("Image is overexposed")
+    elif metrics["sharpness"] < Config.IMAGE_QUALITY_MIN_SHARPNESS:
+        issues.append("Image is too blurry")
+
+    if profile in INK_PROFILES and metrics["ink_coverage"] < Config.IMAGE_QUALITY_MIN_INK_COVERAGE:
+        issues.append("No ink detected")
+
+    return issues
+
+
+def assess_image_quality(image_data, profile=None) -> Optional[Dict[str, Any]]:
+    """
+    Score an image locally before it is sent for AI extraction
+
+    Args:
+        image_data (bytes-like): Encoded image data
+        profile (str, optional): Extraction profile of the document
+
+    Returns:
+        dict or None: Metrics plus 'usable' and 'issues', None if undecodable
+    """
+    try:
+        gray, width, height = load_grayscale(image_data)
+    except Exception:
+        return None
+
+    metrics = compute_quality_metrics(gray, width, height)
+    issues = find_quality_issues(metrics, profile)
+    metrics["usable"] = not issues
+    metrics["issues"] = issues
+    return metrics
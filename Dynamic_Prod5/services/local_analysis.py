@@ -0,0 +1,270 @@
+import io
+from typing import Dict, Any
+
+import numpy as np
+from PIL import Image
+
+from config.settings import Config
+from services.image_preprocessing import flatten_to_rgb
+from services.image_quality import laplacian_variance
+
+# Longest side of the working copy used by the analyzers
+ANALYSIS_MAX_SIDE = 512
+
+
+def _load_rgb(image_data):
+    """
+    Decode an image into a downscaled RGB float array
+
+    Args:
+        image_data (bytes-like): Encoded image data
+
+    Returns:
+        tuple: (RGB float32 array, original width, original height)
+    """
+    with Image.open(io.BytesIO(image_data)) as img:
+        width, height = img.size
+        rgb = flatten_to_rgb(img)
+        rgb.thumbnail((ANALYSIS_MAX_SIDE, ANALYSIS_MAX_SIDE))
+        return np.asarray(rgb, dtype=np.float32), width, height
+
+
+def _to_gray(rgb):
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def otsu_threshold(gray):
+    """
+    Find the gray level that best separates ink from background
+
+    Args:
+        gray (numpy.ndarray): Grayscale image
+
+    Returns:
+        float: Threshold; pixels below it are ink
+    """
+    histogram = np.bincount(gray.astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_low = np.cumsum(histogram)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(histogram * levels)
+    mean_low = sum_low / np.maximum(weight_low, 1)
+    mean_high = (sum_low[-1] - sum_low) / np.maximum(weight_high, 1)
+    between_variance = weight_low * weight_high * (mean_low - mean_high) ** 2
+    return float(np.argmax(between_variance)) + 0.5
+
+
+def label_components(mask):
+    """
+    Label 8-connected components of a binary mask
+
+    Each row is split into runs of set pixels, runs on adjacent rows
+    that touch (diagonals included) are joined with a vectorised
+    union-find, and component sizes are summed per root. The work grows
+    with the number of runs, not with the length of a stroke, and needs
+    no SciPy or OpenCV.
+
+    Args:
+        mask (numpy.ndarray): Boolean mask
+
+    Returns:
+        numpy.ndarray: Component sizes in pixels, largest first
+    """
+    if not mask.any():
+        return np.array([], dtype=np.int64)
+
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    steps = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(steps == 1)
+    ends = np.nonzero(steps == -1)[1]
+
+    # Runs are ordered by row then column, so keys with the row in the
+    # high part are sorted and each run's touching runs on the next row
+    # form one contiguous slice
+    stride = width + 2
+    next_row = (rows + 1) * stride
+    first = np.searchsorted(rows * stride + ends, next_row + starts, side='left')
+    last = np.searchsorted(rows * stride + starts, next_row + ends, side='right')
+    counts = np.maximum(last - first, 0)
+    upper = np.repeat(np.arange(rows.size), counts)
+    lower = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    # Hook the larger root of every joined pair onto the smaller one,
+    # then jump pointers until every run points at its root
+    parent = np.arange(rows.size)
+    while True:
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        root_upper, root_lower = parent[upper], parent[lower]
+        split = root_upper != root_lower
+        if not split.any():
+            break
+        upper, lower = upper[split], lower[split]
+        root_upper, root_lower = root_upper[split], root_lower[split]
+        np.minimum.at(parent, np.maximum(root_upper, root_lower), np.minimum(root_upper, root_lower))
+
+    sizes = np.bincount(parent, weights=ends - starts).astype(np.int64)
+    return np.sort(sizes[sizes > 0])[::-1]
+
+
+def _clarity(gray, foreground, background):
+    """
+    Combine sharpness, separation and background noise into a 0-1 score
+
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        foreground (numpy.ndarray): Foreground pixel values
+        background (numpy.ndarray): Background pixel values
+
+    Returns:
+        float: Clarity score
+    """
+    sharpness = min(laplacian_variance(gray) / 150.0, 1.0)
+    if foreground.size and background.size:
+        separation = min(abs(float(background.mean()) - float(foreground.mean())) / 100.0, 1.0)
+        noise = min(float(background.std()) / 40.0, 1.0)
+    else:
+        separation, noise = 0.0, 1.0
+    return round(0.4 * sharpness + 0.4 * separation + 0.2 * (1.0 - noise), 2)
+
+
+def analyze_signature(image_data) -> Dict[str, Any]:
+    """
+    Assess a signature image without an AI call
+
+    Args:
+        image_data (bytes-like): Encoded image data
+
+    Returns:
+        dict: clarity_score, is_handwritten and is_complete plus the
+            underlying ink, stroke and background metrics
+    """
+    rgb, width, height = _load_rgb(image_data)
+    gray = _to_gray(rgb)
+    ink = gray < otsu_threshold(gray)
+    ink_ratio = float(ink.mean())
+
+    # Stroke connectivity: cursive signatures form a few large strokes,
+    # typed names break into one small component per glyph
+    sizes = label_components(ink)
+    significant = sizes[sizes >= max(sizes.sum() * 0.01, 2)] if sizes.size else sizes
+    largest_share = float(sizes[0] / sizes.sum()) if sizes.size else 0.0
+
+    # Completeness: tightly cropped signatures touch the edge at a few
+    # stroke ends, a cut-off signature runs along it
+    edge_ink = max(
+        float(ink[0].mean()), float(ink[-1].mean()),
+        float(ink[:, 0].mean()), float(ink[:, -1].mean())
+    )
+
+    background_std = float(gray[~ink].std()) if (~ink).any() else 255.0
+
+    is_handwritten = bool(
+        Config.SIGNATURE_MIN_INK_RATIO <= ink_ratio <= Config.SIGNATURE_MAX_INK_RATIO
+        and (largest_share >= 0.2 or len(significant) <= 12)
+    )
+    is_complete = bool(ink.any() and edge_ink <= Config.SIGNATURE_MAX_EDGE_INK)
+
+    return {
+        "clarity_score": _clarity(gray, gray[ink], gray[~ink]),
+        "is_handwritten": is_handwritten,
+        "is_complete": is_complete,
+        "background_clean": background_std < Config.LOCAL_MAX_BACKGROUND_STD,
+        "ink_ratio": round(ink_ratio, 4),
+        "stroke_components": int(len(significant)),
+        "largest_stroke_share": round(largest_share, 3),
+        "edge_ink": round(edge_ink, 4),
+        "background_std": round(background_std, 2),
+        "width": width,
+        "height": height
+    }
+
+
+def _skin_mask(rgb):
+    """
+    Detect skin-coloured pixels with the usual YCbCr chroma box
+
+    Args:
+        rgb (numpy.ndarray): RGB image
+
+    Returns:
+        numpy.ndarray: Boolean skin mask
+    """
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    cb = 128 - 0.168736 * r - 0.331264 * g + 0.5 * b
+    cr = 128 + 0.5 * r - 0.418688 * g - 0.081312 * b
+    return (cb >= 77) & (cb <= 127) & (cr >= 133) & (cr <= 173)
+
+
+def analyze_passport_photo(image_data) -> Dict[str, Any]:
+    """
+    Assess a passport-size photograph without an AI call
+
+    Args:
+        image_data (bytes-like): Encoded image data
+
+    Returns:
+        dict: clarity_score, is_passport_style and face_visible plus the
+            underlying framing and background metrics
+    """
+    rgb, width, height = _load_rgb(image_data)
+    gray = _to_gray(rgb)
+    rows, cols = gray.shape
+
+    # Background: the upper corners beside the head. Spread is measured
+    # as a scaled median absolute deviation so stray hair or a frame line
+    # in a corner does not dominate
+    corner_h = max(rows // 4, 1)
+    corner_w = max(cols // 5, 1)
+    border = np.concatenate([
+        rgb[:corner_h, :corner_w].reshape(-1, 3),
+        rgb[:corner_h, -corner_w:].reshape(-1, 3)
+    ])
+    background_color = np.median(border, axis=0)
+    background_std = float((1.4826 * np.median(np.abs(border - background_color), axis=0)).mean())
+
+    # Subject: pixels that clearly differ from the background colour
+    subject = np.abs(rgb - background_color).max(axis=2) > Config.PHOTO_SUBJECT_COLOR_DISTANCE
+    subject_ratio = float(subject.mean())
+    if subject.any():
+        subject_cols = np.flatnonzero(subject.any(axis=0))
+        centroid_x = float(np.nonzero(subject)[1].mean() / cols)
+        subject_width = float((subject_cols[-1] - subject_cols[0] + 1) / cols)
+    else:
+        centroid_x, subject_width = 0.0, 0.0
+
+    # Face: skin tones in the central region where the face should sit
+    center = _skin_mask(rgb[rows // 8: rows * 3 // 4, cols // 5: cols * 4 // 5])
+    skin_ratio = float(center.mean()) if center.size else 0.0
+
+    aspect_ratio = height / max(width, 1)
+    is_portrait = Config.PHOTO_MIN_ASPECT_RATIO <= aspect_ratio <= Config.PHOTO_MAX_ASPECT_RATIO
+    is_centered = abs(centroid_x - 0.5) <= 0.15 and 0.15 <= subject_ratio <= 0.9
+    background_uniform = background_std < Config.LOCAL_MAX_BACKGROUND_STD
+
+    return {
+        "clarity_score": _clarity(gray, gray[subject], gray[~subject]),
+        "is_passport_style": bool(is_portrait and background_uniform and is_centered),
+        "face_visible": bool(skin_ratio >= Config.PHOTO_MIN_SKIN_RATIO),
+        "background_appropriate": bool(background_uniform),
+        "aspect_ratio": round(aspect_ratio, 3),
+        "background_std": round(background_std, 2),
+        "subject_ratio": round(subject_ratio, 3),
+        "subject_centroid_x": round(centroid_x, 3),
+        "subject_width": round(subject_width, 3),
+        "skin_ratio": round(skin_ratio, 3),
+        "width": width,
+        "height": height
+    }
+
+
+# Document profiles that can be assessed without an AI call
+LOCAL_ANALYZERS = {
+    'signature': analyze_signature,
+    'passport_photo': analyze_passport_photo
+}
@@ -0,0 +1,225 @@
+import copy
+import json
+import logging
+from typing import Dict, Any, Optional, Iterable, TextIO
+
+from services.document_registry import RequestDocumentRegistry, NON_DOCUMENT_KEYS
+from services.validation_service import DocumentValidationService
+from services.compliance_rules_repository import ComplianceRulesRepository
+from utils.extraction_store import extraction_store
+from models.document_models import InMemoryDocument
+
+
+class StoredExtractionService:
+    """
+    Extraction service that serves stored extraction results
+
+    Documents are in-memory documents whose content is the extraction
+    fingerprint recorded in the extraction store; nothing is downloaded
+    and no AI call is made. A document without a stored extraction gets
+    the failure record a failed extraction would produce.
+    """
+
+    def __init__(self):
+        self.extractions = {}
+        self.missing = []
+
+    def use(self, extractions: Dict[str, Dict[str, Any]]):
+        """
+        Serve the stored extractions of one application
+
+        Args:
+            extractions (dict): Extracted data keyed by content fingerprint
+        """
+        self.extractions = extractions
+        self.missing = []
+
+    def extraction_profile(self, document_type):
+        # Stored fingerprints already carry the profile
+        return document_type.lower()
+
+    def extract_document_data(self, source: InMemoryDocument, document_type: str, cancel_token=None,
+                              previous_results=None) -> dict:
+        """
+        Look up a document's stored extraction
+
+        Args:
+            source (InMemoryDocument): Document holding the content fingerprint
+            document_type (str): Type of document
+            cancel_token (CancellationToken, optional): Unused, lookups are instant
+            previous_results (dict, optional): Unused, every result is a previous one
+
+        Returns:
+            dict: Stored extracted data, or an extraction failure record
+        """
+        fingerprint = bytes(source.data).decode('utf-8', errors='replace')
+        extracted_data = self.extractions.get(fingerprint)
+        if extracted_data is None:
+            self.missing.append(source.name)
+            return {
+                'extraction_status': 'failed',
+                'document_type': document_type,
+                'error_message': 'No stored extraction for this document; it must be resubmitted',
+                'clarity_score': 0.0
+            }
+        return copy.deepcopy(extracted_data)
+
+
+class RuleReEvaluationJob:
+    """
+    Re-run the current compliance rules over stored extractions
+
+    Every stored application is validated again against its service's
+    current rule set, with documents served from the extraction store.
+    No document is downloaded or extracted and external checks (Aadhar-PAN
+    linkage) carry their last stored result over, so a rules change can
+    be applied to thousands of applications without network or AI calls.
+    The new verdict replaces the stored one.
+    """
+
+    def __init__(self, rules_repository: Optional[ComplianceRulesRepository] = None):
+        """
+        Initialize the job
+
+        Args:
+            rules_repository (ComplianceRulesRepository, optional): Compliance
+                rules source; the shared repository if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.extractions = StoredExtractionService()
+        self.validation_service = DocumentValidationService(
+            extraction_service=self.extractions,
+            rules_repository=rules_repository
+        )
+
+    def run(
+        self,
+        output: TextIO,
+        service_id: Optional[str] = None,
+        application_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Re-evaluate stored applications and write changed verdicts as JSON lines
+
+        Args:
+            output (file): Text stream receiving one JSON object per changed verdict
+            service_id (str, optional): Only applications of this service
+            application_ids (iterable, optional): Applications to re-evaluate,
+                all stored applications if omitted
+
+        Returns:
+            dict: Counts of 'evaluated', 'changed', 'not_found' and 'errors'
+        """
+        if application_ids is None:
+            application_ids = extraction_store.application_ids(service_id)
+
+        summary = {'evaluated': 0, 'changed': 0, 'not_found': 0, 'errors': 0}
+        for application_id in application_ids:
+            try:
+                change = self.reevaluate(application_id)
+            except Exception as e:
+                self.logger.error(f"Re-evaluation failed for application {application_id}: {str(e)}", exc_info=True)
+                summary['errors'] += 1
+                continue
+
+            if change is None:
+                summary['not_found'] += 1
+                continue
+
+            summary['evaluated'] += 1
+            if change['changed']:
+                summary['changed'] += 1
+                output.write(json.dumps(change, default=str) + "\n")
+                output.flush()
+
+        self.logger.info(f"Rule re-evaluation finished: {summary}")
+        return summary
+
+    def reevaluate(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Re-evaluate one stored application
+
+        Args:
+            application_id (str): Application identifier
+
+        Returns:
+            dict or None: Previous and current verdict with the rules whose
+                status changed, or None if the application is not stored
+        """
+        record = extraction_store.load(application_id)
+        if record is None:
+            return None
+
+        self.extractions.use(record['extractions'])
+        standard_result, detailed_result = self.validation_service.validate_documents(
+            record['service_id'],
+            application_id,
+            self._stored_input(application_id, record['request'])
+        )
+
+        previous = record.get('verdict') or {}
+        previous_rules = previous.get('validation_rules') or {}
+        current_rules = standard_result.get('validation_rules') or {}
+        changed_rules = {}
+        for rule_key in sorted(set(previous_rules) | set(current_rules)):
+            before = (previous_rules.get(rule_key) or {}).get('status')
+            after = (current_rules.get(rule_key) or {}).get('status')
+            if before != after:
+                changed_rules[rule_key] = {"previous": before, "current": after}
+
+        is_compliant = detailed_result.get('metadata', {}).get('is_compliant')
+        return {
+            "application_id": application_id,
+            "service_id": record['service_id'],
+            "previous_rules_version": record.get('rules_version'),
+            "rules_version": standard_result.get('rules_version'),
+            "previous_is_compliant": previous.get('is_compliant'),
+            "is_compliant": is_compliant,
+            "changed": bool(changed_rules) or previous.get('is_compliant') != is_compliant,
+            "changed_rules": changed_rules,
+            "unavailable_documents": sorted(self.extractions.missing)
+        }
+
+    @staticmethod
+    def _stored_input(application_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a validation request from its stored, fingerprinted form
+
+        Args:
+            application_id (str): Application identifier
+            request (dict): Stored request
+
+        Returns:
+            dict: Validation input served from the extraction store
+        """
+        def documents(owner, docs):
+            if not isinstance(docs, dict):
+                return {}
+            rebuilt = {}
+            for doc_key, fingerprint in docs.items():
+                if doc_key in NON_DOCUMENT_KEYS:
+                    rebuilt[doc_key] = fingerprint
+                    continue
+                slot = RequestDocumentRegistry.slot_id(owner, doc_key)
+                # Documents that were never extracted stay uploaded, without a stored result
+                content = fingerprint or f"unavailable:{slot}"
+                rebuilt[doc_key] = InMemoryDocument(data=content.encode(), name=slot)
+            return rebuilt
+
+        input_data = {
+            **request,
+            'application_id': application_id,
+            'incremental': True,
+            'offline': True,
+            'defer_linkage': False,
+            'fail_fast': False
+        }
+        input_data['directors'] = {
+            director_key: (
+                {**director_info, 'documents': documents(director_key, director_info.get('documents'))}
+                if isinstance(director_info, dict) else director_info
+            )
+            for director_key, director_info in (request.get('directors') or {}).items()
+        }
+        input_data['companyDocuments'] = documents('companyDocuments', request.get('companyDocuments'))
+        return input_data
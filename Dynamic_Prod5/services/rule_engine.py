@@ -0,0 +1,349 @@
+import logging
+from typing import Dict, Any, Callable, Iterable, Optional, Collection
+
+# Known rule conditions and their types
+CONDITION_TYPES = {
+    'min_directors': int,
+    'max_directors': int,
+    'min_age': int,
+    'max_age_days': int,
+    'min_clarity_score': float,
+    'is_passport_style': bool,
+    'face_visible': bool,
+    'different_photos_required': bool,
+    'is_handwritten': bool,
+    'is_complete': bool,
+    'name_match_required': bool,
+    'complete_address_required': bool,
+    'masked_not_allowed': bool,
+    'different_images_required': bool,
+    'identical_images_fail': bool,
+    'passport_required': bool,
+    'passport_validity_check': bool,
+    'driving_license_required': bool,
+    'noc_required': bool,
+    'signature_required': bool,
+    'linkage_api_check_required': bool,
+    'api_check_required': bool,
+    'owner_name': str
+}
+
+_UNSET = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _coerce(key, value, target_type):
+    """
+    Convert a condition value to its declared type
+
+    Values that cannot be converted are kept as given so evaluation
+    behaves exactly as it did on the raw rule document.
+
+    Args:
+        key (str): Condition name
+        value: Raw value
+        target_type (type): Declared type
+
+    Returns:
+        Converted value
+    """
+    if value is None or isinstance(value, target_type):
+        return value
+    try:
+        if target_type is bool:
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered in ('true', 'yes', '1'):
+                    return True
+                if lowered in ('false', 'no', '0'):
+                    return False
+                raise ValueError(value)
+            return bool(value)
+        if target_type is int:
+            return int(float(value))
+        return target_type(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Rule condition {key}={value!r} is not a valid {target_type.__name__}")
+        return value
+
+
+class RuleConditions:
+    """
+    Typed, read-only rule conditions
+
+    Exposes the same ``get`` lookup evaluators use on plain condition
+    dicts; unknown conditions are kept as-is.
+    """
+    __slots__ = tuple(CONDITION_TYPES) + ('_extra',)
+
+    def __init__(self, conditions: Optional[Dict[str, Any]] = None):
+        extra = {}
+        for key, value in (conditions or {}).items():
+            target_type = CONDITION_TYPES.get(key)
+            if target_type is None:
+                extra[key] = value
+            else:
+                object.__setattr__(self, key, _coerce(key, value, target_type))
+        object.__setattr__(self, '_extra', extra)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Rule conditions are read-only")
+
+    def get(self, key, default=None):
+        if key in CONDITION_TYPES:
+            return getattr(self, key, default)
+        return self._extra.get(key, default)
+
+    def __contains__(self, key):
+        return self.get(key, _UNSET) is not _UNSET
+
+    def to_dict(self) -> Dict[str, Any]:
+        conditions = {key: getattr(self, key) for key in CONDITION_TYPES if hasattr(self, key)}
+        conditions.update(self._extra)
+        return conditions
+
+    def __repr__(self):
+        return f"RuleConditions({self.to_dict()!r})"
+
+EMPTY_CONDITIONS = RuleConditions()
+
+
+class RuleInputs:
+    """
+    Documents and extracted fields a rule evaluator reads
+
+    ``documents`` are read whenever uploaded; of ``first_of`` only the
+    first uploaded document is read (e.g. the name source for a match).
+    ``required`` lists groups of alternatives the rule fails without,
+    unless ``required_condition`` is set and false in the rule conditions.
+    """
+    __slots__ = ('documents', 'first_of', 'fields', 'required', 'required_condition')
+
+    def __init__(
+        self,
+        documents: Iterable[str] = (),
+        first_of: Iterable[str] = (),
+        fields: Iterable[str] = (),
+        required: Iterable[Iterable[str]] = (),
+        required_condition: Optional[str] = None
+    ):
+        self.documents = tuple(documents)
+        self.first_of = tuple(first_of)
+        self.fields = tuple(fields)
+        self.required = tuple(tuple(group) for group in required)
+        self.required_condition = required_condition
+
+    def missing(self, available: Collection[str], conditions=None) -> list:
+        """
+        Get the required document groups with no uploaded document
+
+        Args:
+            available (collection): Uploaded document keys
+            conditions (RuleConditions, optional): Rule conditions
+
+        Returns:
+            list: Unmet groups, each a tuple of alternative document keys
+        """
+        if self.required_condition and conditions is not None and not conditions.get(self.required_condition, True):
+            return []
+        return [group for group in self.required if not any(doc_key in available for doc_key in group)]
+
+    def resolve(self, available: Collection[str]) -> frozenset:
+        """
+        Get the documents the rule reads from those uploaded
+
+        Args:
+            available (collection): Uploaded document keys
+
+        Returns:
+            frozenset: Document keys the rule depends on
+        """
+        required = {doc_key for doc_key in self.documents if doc_key in available}
+        first = next((doc_key for doc_key in self.first_of if doc_key in available), None)
+        if first is not None:
+            required.add(first)
+        return frozenset(required)
+
+    def __repr__(self):
+        return f"RuleInputs(documents={self.documents!r}, first_of={self.first_of!r})"
+
+NO_INPUTS = RuleInputs()
+
+
+class CompiledRule:
+    """
+    A compliance rule bound to its evaluator and declared inputs
+    """
+    __slots__ = ('rule_id', 'key', 'rule_name', 'description', 'severity',
+                 'is_active', 'conditions', 'evaluator', 'inputs')
+
+    def __init__(self, rule: Dict[str, Any], evaluator: Optional[Callable], inputs: Optional[RuleInputs] = None):
+        self.rule_id = rule.get('rule_id', '')
+        self.key = self.rule_id.lower()
+        self.rule_name = rule.get('rule_name')
+        self.description = rule.get('description')
+        self.severity = rule.get('severity', 'medium')
+        self.is_active = rule.get('is_active', True)
+        self.conditions = RuleConditions(rule.get('conditions') or {})
+        self.evaluator = evaluator
+        self.inputs = inputs or NO_INPUTS
+
+    def __repr__(self):
+        return f"CompiledRule({self.rule_id!r}, active={self.is_active})"
+
+
+class CompiledRuleSet:
+    """
+    Compliance rules compiled once per rules version, indexed by rule ID
+    """
+    __slots__ = ('version', 'rules', 'by_id', 'evaluators', 'defaults')
+
+    def __init__(
+        self,
+        version: str,
+        rules: Iterable[CompiledRule],
+        evaluators: Dict[str, Callable],
+        inputs: Optional[Dict[str, RuleInputs]] = None
+    ):
+        self.version = version
+        self.rules = tuple(rules)
+        self.evaluators = evaluators
+        by_id = {}
+        for rule in self.rules:
+            # First definition wins, matching the previous linear scans
+            by_id.setdefault(rule.rule_id, rule)
+        self.by_id = by_id
+        # Rules the set does not define run with empty conditions
+        inputs = inputs or {}
+        self.defaults = {
+            rule_id: CompiledRule({'rule_id': rule_id}, evaluator, inputs.get(rule_id))
+            for rule_id, evaluator in evaluators.items()
+            if rule_id not in by_id
+        }
+
+    def get(self, rule_id: str) -> Optional[CompiledRule]:
+        return self.by_id.get(rule_id)
+
+    def conditions(self, rule_id: str) -> RuleConditions:
+        rule = self.by_id.get(rule_id)
+        return rule.conditions if rule is not None else EMPTY_CONDITIONS
+
+    def evaluator(self, rule_id: str) -> Optional[Callable]:
+        return self.evaluators.get(rule_id)
+
+    def applicable(self, rule_ids: Iterable[str]) -> tuple:
+        """
+        Get the rules with an evaluator among the given rule IDs
+
+        Director and company rules are evaluated whether or not the set
+        defines them or marks them active: a rule the set leaves out runs
+        with empty conditions, and an inactive rule still counts toward
+        the verdict, as before rule sets were compiled.
+
+        Args:
+            rule_ids (iterable): Candidate rule IDs, in evaluation order
+
+        Returns:
+            tuple: CompiledRule objects
+        """
+        applicable = []
+        for rule_id in rule_ids:
+            rule = self.by_id.get(rule_id) or self.defaults.get(rule_id)
+            if rule is not None and rule.evaluator is not None:
+                applicable.append(rule)
+        return tuple(applicable)
+
+    def plan(self, rule_ids: Iterable[str], available: Collection[str]) -> 'RuleDAG':
+        """
+        Build the dependency graph of the applicable rules over uploaded documents
+
+        Args:
+            rule_ids (iterable): Candidate rule IDs, in evaluation order
+            available (collection): Uploaded document keys
+
+        Returns:
+            RuleDAG: Per-request rule graph
+        """
+        return RuleDAG(self.applicable(rule_ids), available)
+
+    def __contains__(self, rule_id):
+        return rule_id in self.by_id
+
+    def __len__(self):
+        return len(self.rules)
+
+
+class RuleDAG:
+    """
+    Per-request graph from uploaded documents to the rules that read them
+
+    Only documents some rule depends on need extracting; a rule is ready
+    as soon as every document it depends on has been extracted.
+    """
+    __slots__ = ('rules', 'requires', 'documents', '_started')
+
+    def __init__(self, rules: Iterable[CompiledRule], available: Collection[str]):
+        self.rules = tuple(rules)
+        self.requires = {rule.rule_id: rule.inputs.resolve(available) for rule in self.rules}
+        self.documents = frozenset().union(*self.requires.values())
+        self._started = set()
+
+    def ready(self, extracted: Collection[str]) -> tuple:
+        """
+        Take the rules whose documents are all extracted and that have not started
+
+        Args:
+            extracted (collection): Document keys extracted so far
+
+        Returns:
+            tuple: CompiledRule objects to start now
+        """
+        ready = tuple(
+            rule for rule in self.rules
+            if rule.rule_id not in self._started and self.requires[rule.rule_id].issubset(extracted)
+        )
+        self._started.update(rule.rule_id for rule in ready)
+        return ready
+
+    def unreferenced(self, available: Iterable[str]) -> list:
+        """
+        Get uploaded documents no rule in the graph reads
+
+        Args:
+            available (iterable): Uploaded document keys
+
+        Returns:
+            list: Document keys that can be left unextracted
+        """
+        return [doc_key for doc_key in available if doc_key not in self.documents]
+
+
+def compile_rule_set(
+    rules: Iterable[Dict[str, Any]],
+    evaluators: Dict[str, Callable],
+    version: str,
+    inputs: Optional[Dict[str, RuleInputs]] = None
+) -> CompiledRuleSet:
+    """
+    Compile rule dicts into indexed rule objects with their evaluators
+
+    Args:
+        rules (list): Rule dicts as stored in Elasticsearch
+        evaluators (dict): Evaluator keyed by rule ID
+        version (str): Rules version the set was compiled from
+        inputs (dict, optional): Declared RuleInputs keyed by rule ID
+
+    Returns:
+        CompiledRuleSet: Compiled rules
+    """
+    inputs = inputs or {}
+    return CompiledRuleSet(
+        version,
+        (
+            CompiledRule(rule, evaluators.get(rule.get('rule_id', '')), inputs.get(rule.get('rule_id', '')))
+            for rule in rules
+        ),
+        evaluators,
+        inputs
+    )
@@ -0,0 +1,42 @@
+from concurrent.futures import Future
+from typing import Dict, Any, Optional
+
+from utils.cancellation import CancellationToken
+
+
+class ValidationContext:
+    """
+    Request-scoped state of one validate_documents call
+
+    A validation service is shared by concurrent requests (the API and
+    Streamlit app keep one instance), so everything that belongs to a
+    single request is created per call and passed down the validation
+    methods in a context rather than kept on the service.
+    """
+
+    def __init__(
+        self,
+        fail_fast: bool = False,
+        cancel_token: Optional[CancellationToken] = None,
+        defer_linkage: bool = False
+    ):
+        """
+        Initialize the context
+
+        Args:
+            fail_fast (bool): Whether the first failed high-severity rule
+                decides the verdict
+            cancel_token (CancellationToken, optional): Cancels the request's
+                outstanding downloads and AI calls; a new token if omitted
+            defer_linkage (bool): Whether linkage checks are queued instead
+                of awaited
+        """
+        self.fail_fast = fail_fast
+        self.cancel_token = cancel_token or CancellationToken()
+        # Linkage futures keyed by director, collected when deferring
+        self.deferred_linkage: Optional[Dict[str, Future]] = {} if defer_linkage else None
+        # Previous and new results of an incremental validation, set by
+        # validate_documents when the application's results are kept
+        self.incremental: Optional[Dict[str, Any]] = None
+        # Offline re-evaluation carries external check results over
+        self.offline = False
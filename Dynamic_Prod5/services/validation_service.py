@@ -1,27 +1,49 @@
 import logging
 import time
-from datetime import datetime, timedelta
+import uuid
+import threading
+from datetime import date, datetime, timedelta
 import traceback
-from typing import Dict, Any, Optional, List, Tuple
+import copy
+import hashlib
+from typing import Dict, Any, Optional, List, Tuple, Callable
 import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from dateutil import parser
 import re
 import json
-import base64
-import tempfile
 import os
+import binascii
+import requests
 
 from services.extraction_service import ExtractionService
+from services.document_registry import RequestDocumentRegistry, NON_DOCUMENT_KEYS
+from services.compliance_rules_repository import (
+    ComplianceRulesRepository,
+    RuleSetSnapshot,
+    compliance_rules_repository,
+    rules_version
+)
+from services.rule_engine import CompiledRuleSet, RuleDAG, RuleInputs, compile_rule_set
+from services.validation_context import ValidationContext
+from utils.base64_stream import decode_base64_document, sniff_base64_document
+from utils.file_utils import DocumentDownloader
 from utils.elasticsearch_utils import ElasticsearchClient
 from utils.aadhar_pan_linkage import AadharPanLinkageService
+from utils.linkage_scheduler import linkage_scheduler
+from utils.linkage_results import linkage_results
+from utils.extraction_store import extraction_store
+from utils.cancellation import CancellationToken, OperationCancelled
+from utils.id_checksums import validate_aadhar_number, validate_pan_number
 from config.settings import Config
 from models.document_models import (
     ValidationResult, 
     DocumentValidationError,
-    ValidationRuleStatus
+    ValidationRuleStatus,
+    InMemoryDocument
 )
 from rules.compliance_validation_rules import ComplianceValidationRules
+from models.compliance_rules import get_default_compliance_rules
 
 
 class DocumentValidationService:
@@ -29,10 +51,109 @@ class DocumentValidationService:
     Comprehensive document validation service
     """
     
+    # Evaluator method per rule ID
+    RULE_EVALUATORS = {
+        "DIRECTOR_COUNT": "_validate_director_count_rule",
+        "PASSPORT_PHOTO": "_validate_passport_photo_rule",
+        "SIGNATURE": "_validate_signature_rule",
+        "ADDRESS_PROOF": "_validate_address_proof_rule",
+        "INDIAN_DIRECTOR_PAN": "_validate_indian_pan_rule",
+        "INDIAN_DIRECTOR_AADHAR": "_validate_indian_aadhar_rule",
+        "FOREIGN_DIRECTOR_DOCS": "_validate_foreign_director_rule",
+        "COMPANY_ADDRESS_PROOF": "_validate_company_address_proof_rule",
+        "NOC_VALIDATION": "_validate_noc_rule",
+        "AADHAR_PAN_LINKAGE": "_validate_aadhar_pan_linkage_rule",
+        "NOC_OWNER_VALIDATION": "_validate_noc_owner_name_rule"
+    }
+    
+    # Documents and extracted fields each evaluator reads; documents no
+    # rule reads are not extracted
+    RULE_INPUTS = {
+        "PASSPORT_PHOTO": RuleInputs(
+            documents=('passportPhoto',),
+            fields=('is_passport_style', 'face_visible')
+        ),
+        "SIGNATURE": RuleInputs(
+            documents=('signature',),
+            fields=('is_handwritten', 'is_complete', 'clarity_score')
+        ),
+        "ADDRESS_PROOF": RuleInputs(
+            documents=('address_proof',),
+            first_of=('panCard', 'aadharCardFront', 'passport', 'drivingLicense'),
+            fields=('date', 'bill_date', 'address', 'name', 'consumer_name')
+        ),
+        "INDIAN_DIRECTOR_PAN": RuleInputs(
+            documents=('panCard',),
+            fields=('pan_number', 'dob'),
+            required=(('panCard',),)
+        ),
+        "INDIAN_DIRECTOR_AADHAR": RuleInputs(
+            documents=('aadharCardFront', 'aadharCardBack'),
+            fields=('is_masked', 'name', 'dob', 'aadhar_number', 'gender'),
+            required=(('aadharCardFront',), ('aadharCardBack',))
+        ),
+        "FOREIGN_DIRECTOR_DOCS": RuleInputs(
+            documents=('passport', 'panCard'),
+            required=(('passport', 'panCard'),),
+            required_condition='passport_required'
+        ),
+        "AADHAR_PAN_LINKAGE": RuleInputs(
+            documents=('aadharCardFront', 'aadharCardBack', 'panCard'),
+            fields=('aadhar_number', 'pan_number', 'name')
+        ),
+        "COMPANY_ADDRESS_PROOF": RuleInputs(
+            documents=('addressProof',),
+            fields=('date', 'bill_date', 'address')
+        ),
+        "NOC_VALIDATION": RuleInputs(
+            documents=('noc',),
+            fields=('owner_name', 'property_address', 'applicant_name', 'date',
+                    'has_signature', 'purpose', 'clarity_score', 'is_valid_noc')
+        ),
+        "NOC_OWNER_VALIDATION": RuleInputs(
+            documents=('noc',),
+            fields=('owner_name',)
+        )
+    }
+    
+    # Rules evaluated against company documents rather than directors
+    COMPANY_RULES = frozenset({"COMPANY_ADDRESS_PROOF", "NOC_VALIDATION", "NOC_OWNER_VALIDATION"})
+    
+    # Per-director rules by nationality, plus rules for every director
+    NATIONALITY_RULES = {
+        'indian': ('INDIAN_DIRECTOR_PAN', 'INDIAN_DIRECTOR_AADHAR', 'AADHAR_PAN_LINKAGE'),
+        'foreign': ('FOREIGN_DIRECTOR_DOCS',)
+    }
+    COMMON_DIRECTOR_RULES = ('PASSPORT_PHOTO', 'SIGNATURE', 'ADDRESS_PROOF')
+    
+    # API response key per (lower-case) rule ID
+    API_RULE_KEYS = {
+        'director_count': 'director_count',
+        'passport_photo': 'passport_photo_validation',
+        'signature': 'signature_validation',
+        'address_proof': 'address_proof_validation',
+        'indian_director_pan': 'pan_validation',
+        'indian_director_aadhar': 'aadhar_validation',
+        'foreign_director_docs': 'foreign_director_docs_validation',
+        'company_address_proof': 'company_address_proof',
+        'noc_validation': 'noc_validation',
+        'aadhar_pan_linkage': 'aadhar_pan_linkage',
+        'noc_owner_validation': 'noc_owner_validation'
+    }
+    
+    # Rule status reported when directors disagree: the highest wins
+    STATUS_PRECEDENCE = {'passed': 0, 'skipped': 1, 'pending': 2, 'failed': 3}
+    
+    # Rules that consult an external service; incremental mode only reuses
+    # their passes and offline re-evaluation carries their last result over.
+    # Their evaluators also take the request's ValidationContext
+    EXTERNAL_RULES = {'AADHAR_PAN_LINKAGE'}
+    
     def __init__(
         self, 
         es_client: Optional[ElasticsearchClient] = None,
-        extraction_service: Optional[ExtractionService] = None
+        extraction_service: Optional[ExtractionService] = None,
+        rules_repository: Optional[ComplianceRulesRepository] = None
     ):
         """
         Initialize the validation service
@@ -40,6 +161,8 @@ class DocumentValidationService:
         Args:
             es_client (ElasticsearchClient, optional): Elasticsearch client
             extraction_service (ExtractionService, optional): Document extraction service
+            rules_repository (ComplianceRulesRepository, optional): Compliance
+                rules source; the shared repository unless es_client is given
         """
         # Initialize logger
         self.logger = logging.getLogger(__name__)
@@ -50,6 +173,63 @@ class DocumentValidationService:
             Config.OPENAI_API_KEY
         )
         self.aadhar_pan_linkage_service = AadharPanLinkageService()
+        self.rules_repository = rules_repository or (
+            ComplianceRulesRepository(es_client) if es_client else compliance_rules_repository
+        )
+        # The repository compiles each rule set once, when it publishes it
+        self.rules_repository.use_compiler(self.compile_rules)
+        if Config.RULES_WATCH_INTERVAL > 0:
+            self.rules_repository.start_watching()
+        
+        # Deferred linkage checks are finished on a bounded pool, created on first use
+        self._linkage_executor = None
+        self._linkage_executor_lock = threading.Lock()
+
+    @classmethod
+    def compile_rules(cls, rules, version: str) -> CompiledRuleSet:
+        """
+        Compile rule dicts against this service's evaluators
+        
+        Used by the rules repository when it publishes a snapshot.
+        Evaluators are the unbound methods named in RULE_EVALUATORS, so
+        one compiled set serves every service instance.
+        
+        Args:
+            rules (list): Rule dicts
+            version (str): Rules version
+        
+        Returns:
+            CompiledRuleSet: Rules indexed by rule ID with their evaluators
+        """
+        evaluators = {
+            rule_id: getattr(cls, method_name)
+            for rule_id, method_name in cls.RULE_EVALUATORS.items()
+        }
+        return compile_rule_set(rules, evaluators, version, cls.RULE_INPUTS)
+
+    def _compile_rules(self, compliance_rules) -> CompiledRuleSet:
+        """
+        Get the compiled form of a rule set
+        
+        Snapshots from the rules repository carry their compiled rules;
+        plain rule dicts passed by direct callers are compiled here.
+        
+        Args:
+            compliance_rules (RuleSetSnapshot, CompiledRuleSet or dict): Compliance rules
+        
+        Returns:
+            CompiledRuleSet: Rules indexed by rule ID with their evaluators
+        """
+        if isinstance(compliance_rules, CompiledRuleSet):
+            return compliance_rules
+        
+        if isinstance(compliance_rules, RuleSetSnapshot):
+            if compliance_rules.compiled is not None:
+                return compliance_rules.compiled
+            return self.compile_rules(compliance_rules.to_dict()['rules'], compliance_rules.version)
+        
+        rules = self._extract_rules_from_compliance_data(compliance_rules)
+        return self.compile_rules(rules, rules_version(rules))
 
     def _get_compliance_rules(self, service_id: str) -> Dict:
         """
@@ -61,57 +241,8 @@ class DocumentValidationService:
         Returns:
             dict: Compliance rules
         """
-        try:
-            # Add explicit None check
-            if self.es_client is None:
-                self.logger.warning("Elasticsearch client is None, using default rules")
-                return self._get_default_compliance_rules()
-            
-            # Retrieve rules
-            rules = self.es_client.get_compliance_rules(service_id)
-            
-            # Log full details for debugging
-            self.logger.info(f"DEBUG: Retrieved rules for service ID {service_id}: {json.dumps(rules, indent=2)}")
-            
-            # Explicitly filter and find the matching rule set
-            matching_rules = [
-                rule_set for rule_set in rules 
-                if str(rule_set.get('service_id')) == str(service_id)
-            ]
-            
-            # Add additional logging
-            self.logger.info(f"DEBUG: Matching rules found: {len(matching_rules)}")
-            
-            # If matching rules found, return the first one
-            if matching_rules:
-                selected_rules = matching_rules[0]
-                
-                # CRITICAL: ALWAYS return rules for the specific service ID
-                return {
-                    "service_id": service_id,
-                    "service_name": selected_rules.get('service_name', 'Unknown Service'),
-                    "rules": selected_rules.get('rules', [])
-                }
-            
-            # If no matching rules, log warning and use default
-            self.logger.warning(f"No compliance rules found for service ID: {service_id}")
-            default_rules = self._get_default_compliance_rules()
-            
-            # Override service ID in default rules
-            default_rules['service_id'] = service_id
-            default_rules['service_name'] = f"Default Rules for Service {service_id}"
-            
-            return default_rules
-        
-        except Exception as e:
-            self.logger.error(f"Error retrieving compliance rules: {e}")
-            self.logger.info("Using default compliance rules")
-            default_rules = self._get_default_compliance_rules()
-            default_rules['service_id'] = service_id
-            default_rules['service_name'] = f"Default Rules for Service {service_id}"
-            return default_rules
-        
-        
+        return self.rules_repository.get(service_id).to_dict()
+
     def format_validation_results(self, standard_result: Dict) -> str:
         """Format validation results for display"""
         output = []
@@ -164,123 +295,7 @@ class DocumentValidationService:
         Returns:
             dict: Default compliance rules
         """
-        default_rules = {
-            "rules": [
-                {
-                    "rule_id": "DIRECTOR_COUNT",
-                    "rule_name": "Director Count",
-                    "description": "Number of directors must be between 2 and 5",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "min_directors": 2,
-                        "max_directors": 5
-                    }
-                },
-                {
-                    "rule_id": "PASSPORT_PHOTO",
-                    "rule_name": "Passport Photo",
-                    "description": "Passport photo must be clear and properly formatted",
-                    "severity": "medium",
-                    "is_active": True,
-                    "conditions": {
-                        "min_clarity_score": 0.7,
-                        "is_passport_style": True,
-                        "face_visible": True
-                    }
-                },
-                {
-                    "rule_id": "SIGNATURE",
-                    "rule_name": "Signature",
-                    "description": "Signature must be clear and handwritten",
-                    "severity": "medium",
-                    "is_active": True,
-                    "conditions": {
-                        "min_clarity_score": 0.7,
-                        "is_handwritten": True,
-                        "is_complete": True
-                    }
-                },
-                {
-                    "rule_id": "ADDRESS_PROOF",
-                    "rule_name": "Address Proof",
-                    "description": "Address proof must be valid and recent",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "max_age_days": 45,
-                        "name_match_required": True,
-                        "complete_address_required": True
-                    }
-                },
-                {
-                    "rule_id": "INDIAN_DIRECTOR_PAN",
-                    "rule_name": "Indian Director PAN Card",
-                    "description": "Indian directors must provide a valid PAN card",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "min_age": 18
-                    }
-                },
-                {
-                    "rule_id": "INDIAN_DIRECTOR_AADHAR",
-                    "rule_name": "Indian Director Aadhar Card",
-                    "description": "Indian directors must provide valid Aadhar cards",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "masked_not_allowed": True,
-                        "different_images_required": True
-                    }
-                },
-                {
-                    "rule_id": "FOREIGN_DIRECTOR_DOCS",
-                    "rule_name": "Foreign Director Documents",
-                    "description": "Foreign directors must provide valid identification",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "passport_required": True,
-                        "passport_validity_check": True,
-                        "driving_license_required": False
-                    }
-                },
-                {
-                    "rule_id": "COMPANY_ADDRESS_PROOF",
-                    "rule_name": "Company Address Proof",
-                    "description": "Company must have valid address proof",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "max_age_days": 45,
-                        "complete_address_required": True,
-                        "name_match_required": False
-                    }
-                },
-                {
-                    "rule_id": "NOC_VALIDATION",
-                    "rule_name": "No Objection Certificate",
-                    "description": "NOC from property owner is required",
-                    "severity": "medium",
-                    "is_active": True,
-                    "conditions": {
-                        "noc_required": True,
-                        "signature_required": True
-                    }
-                },
-                {
-                    "rule_id": "AADHAR_PAN_LINKAGE",
-                    "rule_name": "Aadhar PAN Linkage",
-                    "description": "Aadhar and PAN must be linked for Indian directors",
-                    "severity": "high",
-                    "is_active": True,
-                    "conditions": {
-                        "linkage_api_check_required": True
-                    }
-                }
-            ]
-        }
+        default_rules = get_default_compliance_rules()
         
         self.logger.info(f"Using default compliance rules: {json.dumps(default_rules, indent=2)}")
         return default_rules
@@ -417,7 +432,9 @@ class DocumentValidationService:
         self, 
         service_id: str, 
         request_id: str, 
-        input_data: Dict[str, Any]
+        input_data: Dict[str, Any],
+        linkage_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Main document validation method with FORCED service ID rule selection
@@ -426,6 +443,11 @@ class DocumentValidationService:
             service_id (str): Service identifier
             request_id (str): Unique request identifier
             input_data (Dict[str, Any]): Input validation data
+            linkage_callback (callable, optional): Called with the linkage id
+                and final rule result when a deferred linkage check finishes
+            cancel_token (CancellationToken, optional): Cancels the request's
+                outstanding downloads and AI calls from outside; a fail-fast
+                verdict cancels it too
         
         Returns:
             Tuple[Dict[str, Any], Dict[str, Any]]: Validation results
@@ -434,37 +456,40 @@ class DocumentValidationService:
 
         self._current_preconditions = input_data.get('preconditions', {})
         
-        # CRITICAL: FORCE the service ID rules
-        def force_service_id_rules(rules, target_service_id):
-            """
-            Forcibly select rules for a specific service ID
-            
-            Args:
-                rules (list): Retrieved rules
-                target_service_id (str): Target service ID
-            
-            Returns:
-                dict: Selected rules for the target service
-            """
-            for rule_set in rules:
-                if str(rule_set.get('service_id')) == str(target_service_id):
-                    return {
-                        "service_id": target_service_id,
-                        "service_name": rule_set.get('service_name', f'Service {target_service_id}'),
-                        "rules": rule_set.get('rules', [])
-                    }
-            
-            # If no rules found, use default
-            default_rules = self._get_default_compliance_rules()
-            default_rules['service_id'] = target_service_id
-            return default_rules
-
+        # Fail-fast: the first failed high-severity rule decides the verdict
+        # and cancels the request's outstanding downloads and AI calls.
+        # Deferred linkage: the linkage rule queues its checks in the context
+        # instead of waiting for the portal, and the response carries the
+        # rule as pending
+        context = ValidationContext(
+            fail_fast=bool(input_data.get('fail_fast', Config.FAIL_FAST)),
+            cancel_token=cancel_token,
+            defer_linkage=bool(input_data.get('defer_linkage', Config.LINKAGE_DEFERRED))
+        )
+        
+        # Incremental mode: documents and rules whose inputs are unchanged
+        # since the application's previous validation reuse its results.
+        # Offline re-evaluation also carries external checks over instead of
+        # repeating them
+        application_id = input_data.get('application_id') or request_id
+        incremental = bool(input_data.get('incremental', Config.INCREMENTAL_VALIDATION))
+        context.offline = bool(input_data.get('offline', False))
+        if application_id and (incremental or Config.EXTRACTION_STORE_ENABLED):
+            previous = (extraction_store.load(str(application_id)) if incremental else None) or {}
+            context.incremental = {
+                'application_id': str(application_id),
+                'extractions': previous.get('extractions', {}),
+                'rule_results': previous.get('rule_results', {}),
+                'evaluated_rules': {},
+                'reused_rules': []
+            }
+        
         try:
-            # Retrieve ALL rules from Elasticsearch
-            all_rules = self.es_client.get_compliance_rules(service_id)
-            
-            # FORCE selection of rules for specific service ID
-            compliance_rules = force_service_id_rules(all_rules, service_id)
+            # Rules come from the in-memory snapshot; Elasticsearch is only
+            # consulted by the repository's background refresh
+            rules_snapshot = self.rules_repository.get(service_id)
+            compliance_rules = rules_snapshot.to_dict()
+            compiled_rules = self._compile_rules(rules_snapshot)
             
             # Log forced rule selection for debugging
             self.logger.info(f"FORCED Rule Selection for Service ID {service_id}: {json.dumps(compliance_rules, indent=2)}")
@@ -472,10 +497,24 @@ class DocumentValidationService:
             # Extract preconditions if available
             preconditions = input_data.get('preconditions', {})
 
+            # Only documents read by a director or company rule are extracted
+            planned_directors, planned_company_docs, skipped_documents = self._plan_document_extraction(
+                input_data.get('directors', {}),
+                input_data.get('companyDocuments', {}),
+                compiled_rules
+            )
+            
+            # Canonicalize every document source up front so identical
+            # documents are downloaded and extracted once per request
+            document_registry = RequestDocumentRegistry()
+            document_registry.plan(planned_directors, planned_company_docs)
+
             # Validate directors
             directors_validation = self._validate_directors(
                 input_data.get('directors', {}), 
-                compliance_rules
+                compiled_rules,
+                document_registry,
+                context
             )
             
             # Validate company documents
@@ -486,12 +525,30 @@ class DocumentValidationService:
             #     preconditions
             # )
             company_docs_validation = self._process_company_documents(
-                input_data.get('companyDocuments', {})#,
+                input_data.get('companyDocuments', {}),
+                document_registry,
+                compiled_rules,
+                context#,
                 #input_data.get('directors', {}),
                 #compliance_rules,
                 #preconditions
             )
             
+            # Hand queued linkage checks to a background job; the result is
+            # kept under a server-generated id, never the client's request id
+            pending_checks = []
+            deferred_linkage_id = None
+            if context.deferred_linkage:
+                pending_checks.append('aadhar_pan_linkage')
+                deferred_linkage_id = uuid.uuid4().hex
+                self._start_deferred_linkage(
+                    deferred_linkage_id,
+                    context.deferred_linkage,
+                    linkage_callback,
+                    self._linkage_callback_url(input_data.get('linkage_callback_url')),
+                    request_id
+                )
+            
             # Calculate processing time
             processing_time = time.time() - start_time
             
@@ -499,8 +556,15 @@ class DocumentValidationService:
             if isinstance(directors_validation, list):
                 directors_validation = {str(idx): info for idx, info in enumerate(directors_validation)}
             
-            # Determine overall compliance
-            is_compliant = all(
+            # Checks and documents abandoned after a fail-fast verdict
+            skipped_checks, cancelled_documents = self._collect_cancelled_work(
+                directors_validation,
+                company_docs_validation
+            )
+            
+            # Determine overall compliance; a fail-fast cancellation means a
+            # deciding rule already failed
+            is_compliant = not context.cancel_token.cancelled and all(
                 director.get('is_valid', False) 
                 for director in directors_validation.values() 
                 if isinstance(director, dict)
@@ -508,6 +572,11 @@ class DocumentValidationService:
             
             # Prepare standard result
             standard_result = {
+                "rules_version": rules_snapshot.version,
+                "skipped_checks": skipped_checks,
+                "is_provisional": bool(pending_checks),
+                "pending_checks": pending_checks,
+                "deferred_linkage_id": deferred_linkage_id,
                 "validation_rules": self._prepare_validation_rules(directors_validation, company_docs_validation, compliance_rules),
                 "document_validation": {
                     "directors": directors_validation,
@@ -515,6 +584,19 @@ class DocumentValidationService:
                 }
             }
             
+            # Persist this validation for the application's next resubmission
+            incremental_summary = None
+            if context.incremental is not None:
+                incremental_summary = self._save_incremental_results(
+                    context,
+                    service_id,
+                    input_data,
+                    directors_validation,
+                    company_docs_validation,
+                    rules_snapshot.version,
+                    {"is_compliant": is_compliant, "validation_rules": standard_result["validation_rules"]}
+                )
+            
             # Prepare detailed result
             detailed_result = {
                 "validation_rules": self._prepare_detailed_validation_rules(directors_validation, company_docs_validation, compliance_rules),
@@ -527,7 +609,19 @@ class DocumentValidationService:
                     "request_id": request_id,
                     "timestamp": datetime.now().isoformat(),
                     "processing_time": processing_time,
-                    "is_compliant": is_compliant
+                    "is_compliant": is_compliant,
+                    "rules_version": rules_snapshot.version,
+                    "rules_source": rules_snapshot.source,
+                    "is_provisional": bool(pending_checks),
+                    "pending_checks": pending_checks,
+                    "deferred_linkage_id": deferred_linkage_id,
+                    "duplicate_documents": document_registry.duplicate_groups(),
+                    "skipped_documents": skipped_documents,
+                    "fail_fast": context.fail_fast,
+                    "cancel_reason": context.cancel_token.reason,
+                    "skipped_checks": skipped_checks,
+                    "cancelled_documents": cancelled_documents,
+                    "incremental": incremental_summary
                 }
             }
             
@@ -611,6 +705,106 @@ class DocumentValidationService:
             
             return error_result, error_detailed_result
         
+    def preflight(self, service_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reject requests that are certain to fail before any download or extraction
+        
+        Runs against the compiled rules for the service: director count,
+        documents the director rules cannot pass without (per nationality),
+        URL shape and a head/tail base64 sanity check. Nothing here reads
+        document content beyond a few characters.
+        
+        Args:
+            service_id (str): Service identifier
+            input_data (dict): Input validation data
+        
+        Returns:
+            dict: 'passed', 'rules_version', 'rule_failures' (rule result
+                keyed by API rule key), 'input_errors' and 'elapsed_us'
+        """
+        start = time.perf_counter()
+        
+        rules_snapshot = self.rules_repository.get(service_id)
+        compiled_rules = self._compile_rules(rules_snapshot)
+        
+        rule_failures = {}
+        input_errors = []
+        
+        def fail(rule_id, error_message):
+            key = self.API_RULE_KEYS.get(rule_id.lower(), rule_id.lower())
+            if key not in rule_failures:
+                rule_failures[key] = {"status": "failed", "error_message": error_message}
+        
+        directors = input_data.get('directors')
+        if isinstance(directors, dict):
+            # Same check as _validate_directors
+            director_count_rule = compiled_rules.get('DIRECTOR_COUNT')
+            if director_count_rule:
+                min_directors = director_count_rule.conditions.get('min_directors', 2)
+                max_directors = director_count_rule.conditions.get('max_directors', 5)
+                if len(directors) < min_directors:
+                    fail('DIRECTOR_COUNT', f"Insufficient directors. Found {len(directors)}, minimum required is {min_directors}.")
+                elif len(directors) > max_directors:
+                    fail('DIRECTOR_COUNT', f"Too many directors. Found {len(directors)}, maximum allowed is {max_directors}.")
+            
+            for director_key, director_info in directors.items():
+                if not isinstance(director_info, dict):
+                    continue
+                documents = director_info.get('documents', {})
+                if not isinstance(documents, dict):
+                    continue
+                
+                available = self._uploaded_documents(documents)
+                for rule in self._director_rule_plan(director_info, compiled_rules).rules:
+                    for group in rule.inputs.missing(available, rule.conditions):
+                        fail(rule.rule_id, f"Missing {' or '.join(group)} required for director {director_key}")
+                
+                for doc_key in available:
+                    error = self._document_content_error(documents[doc_key])
+                    if error:
+                        input_errors.append(f"Document {doc_key} for director {director_key}: {error}")
+        
+        company_docs = input_data.get('companyDocuments', {})
+        if isinstance(company_docs, dict):
+            for doc_key in self._uploaded_documents(company_docs):
+                error = self._document_content_error(company_docs[doc_key])
+                if error:
+                    input_errors.append(f"Company document {doc_key}: {error}")
+        
+        return {
+            "passed": not rule_failures and not input_errors,
+            "rules_version": rules_snapshot.version,
+            "rule_failures": rule_failures,
+            "input_errors": input_errors,
+            "elapsed_us": int((time.perf_counter() - start) * 1e6)
+        }
+
+    @staticmethod
+    def _document_content_error(doc_content) -> Optional[str]:
+        """
+        Cheaply check that document content can be a URL or base64 document
+        
+        Args:
+            doc_content (str or InMemoryDocument): Document content
+        
+        Returns:
+            str or None: Problem found, None if the content looks usable
+        """
+        if isinstance(doc_content, InMemoryDocument):
+            return None
+        
+        if doc_content.startswith("http"):
+            if not DocumentDownloader.validate_url(doc_content):
+                return "malformed URL"
+            return None
+        
+        try:
+            if sniff_base64_document(doc_content) == 'HTML':
+                return "base64 content is an HTML page"
+        except (binascii.Error, ValueError):
+            return "invalid base64 content"
+        return None
+
     def _get_document_status(self, doc_info: Dict) -> str:
         """Determine document validation status"""
         if not isinstance(doc_info, dict):
@@ -691,19 +885,7 @@ class DocumentValidationService:
         rules = compliance_rules.get('rules', [])
         
         # Standard rule ID mapping for API response keys
-        rule_id_mapping = {
-            'director_count': 'director_count',
-            'passport_photo': 'passport_photo_validation',
-            'signature': 'signature_validation',
-            'address_proof': 'address_proof_validation',
-            'indian_director_pan': 'pan_validation',
-            'indian_director_aadhar': 'aadhar_validation',
-            'foreign_director_docs': 'foreign_director_docs_validation',
-            'company_address_proof': 'company_address_proof',
-            'noc_validation': 'noc_validation',
-            'aadhar_pan_linkage': 'aadhar_pan_linkage',
-            'noc_owner_validation': 'noc_owner_validation'  # Added this mapping
-        }
+        rule_id_mapping = self.API_RULE_KEYS
         
         # Initialize validation results with default values
         validation_defaults = {}
@@ -735,6 +917,12 @@ class DocumentValidationService:
                     rule_validations = director_info.get('rule_validations', {})
                     for rule_id, rule_result in rule_validations.items():
                         api_rule_id = rule_id_mapping.get(rule_id.lower(), rule_id.lower())
+                        # A failure, pending or skipped check for any director
+                        # must not be masked by a later pass
+                        current_status = validation_defaults.get(api_rule_id, {}).get('status')
+                        new_status = rule_result.get('status', 'failed').lower()
+                        if self.STATUS_PRECEDENCE.get(new_status, 3) < self.STATUS_PRECEDENCE.get(current_status, -1):
+                            continue
                         validation_defaults[api_rule_id] = {
                             "status": rule_result.get('status', 'failed').lower(),
                             "error_message": rule_result.get('error_message')
@@ -922,18 +1110,26 @@ class DocumentValidationService:
     def _validate_directors(
         self, 
         directors: Dict,
-        compliance_rules: Dict
+        compliance_rules: Dict,
+        document_registry: Optional[RequestDocumentRegistry] = None,
+        context: Optional[ValidationContext] = None
     ) -> Dict:
         """
         Comprehensive validation of all directors
         
         Args:
             directors (dict): Directors to validate
-            compliance_rules (dict): Compliance rules to apply
+            compliance_rules (dict or CompiledRuleSet): Compliance rules to apply
+            document_registry (RequestDocumentRegistry, optional): Request-scoped
+                document deduplication registry
+            context (ValidationContext, optional): Request-scoped state; a
+                new context if omitted
         
         Returns:
             dict: Detailed validation results for all directors
         """
+        context = context or ValidationContext()
+        
         # Validate input types
         if not isinstance(directors, dict):
             error_msg = f"Invalid directors input. Expected dict, got {type(directors)}"
@@ -945,8 +1141,8 @@ class DocumentValidationService:
                 "raw_input": str(directors)
             }
         
-        # Extract rules
-        rules = self._extract_rules_from_compliance_data(compliance_rules)
+        # Compiled when the rules snapshot was published
+        compiled_rules = self._compile_rules(compliance_rules)
         
         # Prepare validation results
         validation_results = {}
@@ -954,13 +1150,10 @@ class DocumentValidationService:
         rule_validations = {}
         
         # Director count validation
-        director_count_rule = next(
-            (rule for rule in rules if rule.get('rule_id') == 'DIRECTOR_COUNT'), 
-            None
-        )
+        director_count_rule = compiled_rules.get('DIRECTOR_COUNT')
         
         if director_count_rule:
-            conditions = director_count_rule.get('conditions', {})
+            conditions = director_count_rule.conditions
             min_directors = conditions.get('min_directors', 2)
             max_directors = conditions.get('max_directors', 5)
             
@@ -984,12 +1177,16 @@ class DocumentValidationService:
                     "status": "passed",
                     "error_message": None
                 }
+            
+            self._check_fail_fast(director_count_rule, rule_validations['director_count'], context)
         
         # Process directors in parallel
         with ThreadPoolExecutor(max_workers=min(len(directors), 5)) as executor:
             # Create futures for each director validation
             future_to_director = {
-                executor.submit(self._validate_single_director, director_key, director_info, rules): director_key
+                executor.submit(
+                    self._validate_single_director, director_key, director_info, compiled_rules, document_registry, context
+                ): director_key
                 for director_key, director_info in directors.items()
             }
             
@@ -1028,7 +1225,9 @@ class DocumentValidationService:
         self, 
         director_key: str, 
         director_info: Dict[str, Any], 
-        rules: List
+        compiled_rules: CompiledRuleSet,
+        document_registry: Optional[RequestDocumentRegistry] = None,
+        context: Optional[ValidationContext] = None
     ) -> Dict:
         """
         Comprehensive validation for a single director
@@ -1036,11 +1235,17 @@ class DocumentValidationService:
         Args:
             director_key (str): Director identifier
             director_info (dict): Director information
-            rules (list): Validation rules
+            compiled_rules (CompiledRuleSet): Compiled validation rules
+            document_registry (RequestDocumentRegistry, optional): Request-scoped
+                document deduplication registry
+            context (ValidationContext, optional): Request-scoped state; a
+                new context if omitted
         
         Returns:
             dict: Detailed validation results
         """
+        context = context or ValidationContext()
+        
         # Validate basic structure
         validation_errors = []
         required_keys = ['nationality', 'authorised', 'documents']
@@ -1048,84 +1253,55 @@ class DocumentValidationService:
             if key not in director_info:
                 validation_errors.append(f"Missing required key: {key}")
         
-        # Get nationality and documents
-        nationality = director_info.get('nationality', '').lower()
+        # Build the rule graph from the rules that apply to this director
         documents = director_info.get('documents', {})
-        
-        # Prepare full document validation with extraction results in parallel
-        full_documents = self._process_director_documents_parallel(documents)
-        
-        # Specific nationality-based rules mapping
-        nationality_rules = {
-            'indian': [
-                'INDIAN_DIRECTOR_PAN', 
-                'INDIAN_DIRECTOR_AADHAR', 
-                'AADHAR_PAN_LINKAGE'
-            ],
-            'foreign': ['FOREIGN_DIRECTOR_DOCS']
-        }
-        
-        # Common rules for all directors
-        common_rules = ['PASSPORT_PHOTO', 'SIGNATURE', 'ADDRESS_PROOF']
-        
-        # Get applicable rules based on nationality
-        applicable_rules = nationality_rules.get(nationality, []) + common_rules
-        
-        # Rule processing map
-        rule_processing_map = {
-            "INDIAN_DIRECTOR_PAN": self._validate_indian_pan_rule,
-            "INDIAN_DIRECTOR_AADHAR": self._validate_indian_aadhar_rule,
-            "FOREIGN_DIRECTOR_DOCS": self._validate_foreign_director_rule,
-            "AADHAR_PAN_LINKAGE": self._validate_aadhar_pan_linkage_rule,
-            "PASSPORT_PHOTO": self._validate_passport_photo_rule,
-            "SIGNATURE": self._validate_signature_rule,
-            "ADDRESS_PROOF": self._validate_address_proof_rule
-        }
+        rule_dag = self._director_rule_plan(director_info, compiled_rules)
+        
+        # Extract referenced documents and run each rule once its inputs are ready
+        full_documents, rule_results = self._run_director_rules(
+            director_key,
+            director_info,
+            rule_dag,
+            document_registry,
+            context
+        )
+        for doc_key in rule_dag.unreferenced(self._uploaded_documents(documents)):
+            full_documents[doc_key] = self._skipped_document(doc_key)
         
         # Storage for rule validations
         rule_validations = {}
         
-        # Apply each relevant rule
-        for rule_id in applicable_rules:
-            try:
-                # Get rule conditions
-                rule_conditions = next(
-                    (rule.get('conditions', {}) for rule in rules if rule.get('rule_id') == rule_id), 
-                    {}
-                )
-                
-                # Prepare director data with full documents
-                director_validation_data = {
-                    director_key: {
-                        **director_info,
-                        'documents': full_documents
-                    }
+        # Report rules in evaluation order, whatever order they finished in
+        for rule in rule_dag.rules:
+            rule_id = rule.rule_id
+            result = rule_results.get(rule_id)
+            
+            # Not started before the fail-fast verdict was reached
+            if result is None:
+                rule_validations[rule.key] = {
+                    "status": "skipped",
+                    "error_message": f"Not evaluated: {context.cancel_token.reason}"
                 }
-                
-                # Apply validation method
-                validation_method = rule_processing_map.get(rule_id)
-                if validation_method:
-                    result = validation_method(
-                        director_validation_data, 
-                        rule_conditions
-                    )
-                    
-                    # Store the rule validation result
-                    rule_validations[rule_id.lower()] = result
-                    
-                    # Collect errors if validation fails
-                    if result.get('status') != 'passed':
-                        validation_errors.append(
-                            result.get('error_message', f'Validation failed for {rule_id}')
-                        )
+                continue
             
-            except Exception as e:
-                self.logger.error(f"Rule validation error for {rule_id}: {str(e)}", exc_info=True)
-                validation_errors.append(f"Error in {rule_id} validation: {str(e)}")
-                rule_validations[rule_id.lower()] = {
+            if isinstance(result, Exception):
+                self.logger.error(f"Rule validation error for {rule_id}: {str(result)}", exc_info=result)
+                validation_errors.append(f"Error in {rule_id} validation: {str(result)}")
+                rule_validations[rule.key] = {
                     "status": "failed",
-                    "error_message": str(e)
+                    "error_message": str(result)
                 }
+                continue
+            
+            # Store the rule validation result
+            rule_validations[rule.key] = result
+            
+            # Collect errors if validation fails; pending checks are reported
+            # once their deferred result arrives, skipped ones never ran
+            if result.get('status') not in ('passed', 'pending', 'skipped'):
+                validation_errors.append(
+                    result.get('error_message', f'Validation failed for {rule_id}')
+                )
         
         # Determine overall validation status
         is_valid = len(validation_errors) == 0
@@ -1140,61 +1316,618 @@ class DocumentValidationService:
             'rule_validations': rule_validations
         }
     
-    def _process_director_documents_parallel(
-        self, 
-        documents: Dict[str, str]
-    ) -> Dict[str, Dict[str, Any]]:
-        processed_docs = {}
+    def _director_rule_plan(self, director_info: Dict[str, Any], compiled_rules: CompiledRuleSet) -> RuleDAG:
+        """
+        Build the rule graph for one director
+        
+        Args:
+            director_info (dict): Director information
+            compiled_rules (CompiledRuleSet): Compiled validation rules
+        
+        Returns:
+            RuleDAG: Nationality and common rules over the uploaded documents
+        """
+        nationality = str(director_info.get('nationality', '')).lower()
+        applicable_rules = self.NATIONALITY_RULES.get(nationality, ()) + self.COMMON_DIRECTOR_RULES
+        
+        return compiled_rules.plan(
+            applicable_rules,
+            self._uploaded_documents(director_info.get('documents', {}))
+        )
 
-        if not documents:
-            return processed_docs
-
-        futures = {}
-        with ThreadPoolExecutor(max_workers=min(len(documents), 10)) as executor:
-            for doc_key, doc_content in documents.items():
-                if isinstance(doc_content, str) and doc_content:
-                    future = executor.submit(
-                        self._extract_document_data_safe,
-                        doc_key,
-                        doc_content
-                    )
-                    futures[future] = doc_key
+    def _company_rule_plan(self, company_docs: Dict[str, Any], compiled_rules: CompiledRuleSet) -> RuleDAG:
+        """
+        Build the rule graph for the company documents
+        
+        Args:
+            company_docs (dict): Company documents
+            compiled_rules (CompiledRuleSet): Compiled validation rules
+        
+        Returns:
+            RuleDAG: Company rules over the uploaded documents
+        """
+        return compiled_rules.plan(sorted(self.COMPANY_RULES), self._uploaded_documents(company_docs))
 
-        for future in as_completed(futures):
-            doc_key = futures[future]
-            try:
-                result = future.result()
-                processed_docs[doc_key] = result
-            except Exception as e:
-                self.logger.error(f"Error processing document {doc_key}: {str(e)}", exc_info=True)
-                processed_docs[doc_key] = {
-                    "is_valid": False,
-                    "error": str(e)
+    @staticmethod
+    def _uploaded_documents(documents: Dict[str, Any]) -> List[str]:
+        """
+        Get the keys of documents that can be extracted
+        
+        Args:
+            documents (dict): Document content keyed by document key
+        
+        Returns:
+            list: Document keys with non-empty content
+        """
+        if not isinstance(documents, dict):
+            return []
+        return [
+            doc_key for doc_key, doc_content in documents.items()
+            if doc_key not in NON_DOCUMENT_KEYS
+            and isinstance(doc_content, (str, InMemoryDocument)) and doc_content
+        ]
+
+    def _skipped_document(self, doc_key: str, doc_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the result for an uploaded document no rule reads
+        
+        Args:
+            doc_key (str): Document key
+            doc_type (str, optional): Document type; mapped from the key if omitted
+        
+        Returns:
+            dict: Skipped document result
+        """
+        return {
+            "document_type": doc_type or self._get_document_type(doc_key),
+            "is_valid": None,
+            "extraction_status": "skipped",
+            "skip_reason": "Not read by any compliance rule"
+        }
+
+    def _cancelled_document(
+        self,
+        doc_key: str,
+        doc_type: Optional[str] = None,
+        context: Optional[ValidationContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the result for a document whose extraction was cancelled
+        
+        Args:
+            doc_key (str): Document key
+            doc_type (str, optional): Document type; mapped from the key if omitted
+            context (ValidationContext, optional): Request-scoped state
+        
+        Returns:
+            dict: Cancelled document result
+        """
+        reason = context.cancel_token.reason if context is not None else None
+        return {
+            "document_type": doc_type or self._get_document_type(doc_key),
+            "is_valid": None,
+            "extraction_status": "cancelled",
+            "skip_reason": f"Cancelled after fail-fast verdict: {reason}"
+        }
+
+    def _decides_verdict(self, rule, context: ValidationContext) -> bool:
+        """
+        Check whether a failure of the rule ends a fail-fast request
+        
+        Args:
+            rule (CompiledRule): Compiled rule
+            context (ValidationContext): Request-scoped state
+        
+        Returns:
+            bool: Whether fail-fast is on and the rule has a fail-fast severity
+        """
+        return context.fail_fast and str(rule.severity).lower() in Config.FAIL_FAST_SEVERITIES
+
+    def _check_fail_fast(self, rule, result, context: ValidationContext, owner: Optional[str] = None):
+        """
+        Cancel the request's outstanding work if a deciding rule failed
+        
+        Args:
+            rule (CompiledRule): Evaluated rule
+            result (dict or Exception): Rule result, or the error it raised
+            context (ValidationContext): Request-scoped state
+            owner (str, optional): Director the rule was evaluated for
+        """
+        if not self._decides_verdict(rule, context):
+            return
+        
+        failed = isinstance(result, Exception) or (
+            isinstance(result, dict) and result.get('status') == 'failed'
+        )
+        if failed and not context.cancel_token.cancelled:
+            reason = f"{rule.rule_id} failed" + (f" for {owner}" if owner else "")
+            self.logger.info(f"Fail-fast verdict reached ({reason}), cancelling outstanding checks")
+            context.cancel_token.cancel(reason)
+
+    def _collect_cancelled_work(
+        self,
+        directors_validation: Dict[str, Any],
+        company_docs_validation: Dict[str, Any]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        List the checks and documents abandoned after a fail-fast verdict
+        
+        Args:
+            directors_validation (dict): Directors validation results
+            company_docs_validation (dict): Company documents validation results
+        
+        Returns:
+            tuple: Skipped checks ("director1.passport_photo") and cancelled
+                document slot identifiers
+        """
+        skipped_checks = []
+        cancelled_documents = []
+        
+        for director_key, director_info in directors_validation.items():
+            if not isinstance(director_info, dict) or director_key in ('global_errors', 'rule_validations'):
+                continue
+            for rule_key, rule_result in director_info.get('rule_validations', {}).items():
+                if isinstance(rule_result, dict) and rule_result.get('status') == 'skipped':
+                    skipped_checks.append(f"{director_key}.{rule_key}")
+            for doc_key, doc_info in director_info.get('documents', {}).items():
+                if isinstance(doc_info, dict) and doc_info.get('extraction_status') == 'cancelled':
+                    cancelled_documents.append(RequestDocumentRegistry.slot_id(director_key, doc_key))
+        
+        if isinstance(company_docs_validation, dict):
+            for doc_key, doc_info in company_docs_validation.items():
+                if isinstance(doc_info, dict) and doc_info.get('extraction_status') == 'cancelled':
+                    cancelled_documents.append(RequestDocumentRegistry.slot_id('companyDocuments', doc_key))
+        
+        return skipped_checks, cancelled_documents
+
+    @staticmethod
+    def _previous_extractions(context: Optional[ValidationContext]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get the stored extractions an incremental validation may reuse
+        
+        Args:
+            context (ValidationContext, optional): Request-scoped state
+        
+        Returns:
+            dict or None: Extracted data keyed by content fingerprint
+        """
+        if context is None or context.incremental is None:
+            return None
+        return context.incremental['extractions']
+
+    def _rule_fingerprint(self, rule, rule_data: Dict[str, Any], context: ValidationContext) -> Optional[str]:
+        """
+        Fingerprint everything a rule evaluation reads
+        
+        Rules compare dates against today (document expiry, age), so the
+        date is part of the fingerprint and results are reused within a day.
+        
+        Args:
+            rule (CompiledRule): Rule to evaluate
+            rule_data (dict): Director data passed to the evaluator
+            context (ValidationContext): Request-scoped state
+        
+        Returns:
+            str or None: Hex digest, or None outside incremental mode
+        """
+        if context.incremental is None:
+            return None
+        
+        canonical = json.dumps(
+            [rule.rule_id, rule.conditions.to_dict(), date.today().isoformat(), rule_data],
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _reuse_rule_result(
+        self,
+        fingerprint: Optional[str],
+        rule,
+        owner: str,
+        context: ValidationContext
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the previous result of a rule whose inputs are unchanged
+        
+        External checks only reuse a pass, unless the validation is offline:
+        then their last stored result for the director is carried over
+        whatever the inputs, and with none stored the rule is skipped.
+        
+        Args:
+            fingerprint (str, optional): Rule input fingerprint
+            rule (CompiledRule): Rule to evaluate
+            owner (str): Director the rule is evaluated for
+            context (ValidationContext): Request-scoped state
+        
+        Returns:
+            dict or None: Copy of the stored rule result
+        """
+        if fingerprint is None:
+            return None
+        
+        stored = context.incremental['rule_results']
+        external = rule.rule_id in self.EXTERNAL_RULES
+        previous = stored.get(fingerprint)
+        if previous is not None and (previous['rule_key'] != rule.key or (
+                external and previous['result'].get('status') != 'passed')):
+            previous = None
+        
+        if previous is None and external and context.offline:
+            previous = next(
+                (
+                    entry for entry in stored.values()
+                    if entry.get('owner') == owner and entry['rule_key'] == rule.key
+                ),
+                None
+            )
+            if previous is None:
+                return {
+                    "status": "skipped",
+                    "error_message": f"{rule.rule_id} is not re-checked offline"
                 }
+        
+        if previous is None:
+            return None
+        
+        context.incremental['evaluated_rules'][fingerprint] = {**previous, 'owner': owner}
+        context.incremental['reused_rules'].append(f"{owner}.{rule.key}")
+        return copy.deepcopy(previous['result'])
 
-        return processed_docs
+    @staticmethod
+    def _record_rule_result(fingerprint: Optional[str], rule, result, owner: str, context: ValidationContext):
+        """
+        Keep a definite rule result for the next incremental validation
+        
+        Args:
+            fingerprint (str, optional): Rule input fingerprint
+            rule (CompiledRule): Evaluated rule
+            result (dict or Exception): Rule result, or the error it raised
+            owner (str): Director the rule was evaluated for
+            context (ValidationContext): Request-scoped state
+        """
+        if fingerprint is None or not isinstance(result, dict):
+            return
+        
+        if result.get('status') in ('passed', 'failed'):
+            context.incremental['evaluated_rules'][fingerprint] = {
+                'owner': owner,
+                'rule_key': rule.key,
+                'result': result
+            }
+
+    def _save_incremental_results(
+        self,
+        context: ValidationContext,
+        service_id: str,
+        input_data: Dict[str, Any],
+        directors_validation: Dict[str, Any],
+        company_docs_validation: Dict[str, Any],
+        rules_version: str,
+        verdict: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Persist the application's extractions and rule results
+        
+        Args:
+            context (ValidationContext): Request-scoped state
+            service_id (str): Service identifier
+            input_data (dict): Validated request
+            directors_validation (dict): Directors validation results
+            company_docs_validation (dict): Company documents validation results
+            rules_version (str): Rules version used
+            verdict (dict): Overall verdict
+        
+        Returns:
+            dict: Reused and extracted document slots and reused rules
+        """
+        extractions = {}
+        
+        for director_key, director_info in directors_validation.items():
+            if not isinstance(director_info, dict) or director_key in ('global_errors', 'rule_validations'):
+                continue
+            for doc_key, doc_info in (director_info.get('documents') or {}).items():
+                data = doc_info.get('extracted_data') if isinstance(doc_info, dict) else None
+                if isinstance(data, dict) and data.get('content_fingerprint'):
+                    extractions[RequestDocumentRegistry.slot_id(director_key, doc_key)] = {
+                        'fingerprint': data['content_fingerprint'],
+                        'data': data
+                    }
+        
+        for doc_key, data in (company_docs_validation or {}).items():
+            if isinstance(data, dict) and data.get('content_fingerprint'):
+                extractions[RequestDocumentRegistry.slot_id('companyDocuments', doc_key)] = {
+                    'fingerprint': data['content_fingerprint'],
+                    'data': data
+                }
+        
+        incremental = context.incremental
+        extraction_store.save(
+            incremental['application_id'],
+            service_id,
+            self._fingerprinted_request(input_data, extractions),
+            extractions,
+            incremental['evaluated_rules'],
+            rules_version,
+            verdict
+        )
+        
+        reused_documents = sorted(
+            slot for slot, entry in extractions.items()
+            if entry['fingerprint'] in incremental['extractions']
+        )
+        return {
+            "application_id": incremental['application_id'],
+            "reused_documents": reused_documents,
+            "extracted_documents": sorted(set(extractions) - set(reused_documents)),
+            "reused_rules": sorted(incremental['reused_rules'])
+        }
+
+    @staticmethod
+    def _fingerprinted_request(input_data: Dict[str, Any], extractions: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Copy a request with each document's content replaced by its fingerprint
+        
+        Args:
+            input_data (dict): Validated request
+            extractions (dict): 'fingerprint' and 'data' keyed by slot
+        
+        Returns:
+            dict: Request without document content; documents that were not
+                extracted map to None
+        """
+        def documents(owner, docs):
+            if not isinstance(docs, dict):
+                return {}
+            return {
+                doc_key: value if doc_key in NON_DOCUMENT_KEYS else extractions.get(
+                    RequestDocumentRegistry.slot_id(owner, doc_key), {}
+                ).get('fingerprint')
+                for doc_key, value in docs.items()
+            }
+        
+        request = {key: value for key, value in input_data.items() if key not in ('directors', 'companyDocuments')}
+        request['directors'] = {
+            director_key: (
+                {**director_info, 'documents': documents(director_key, director_info.get('documents'))}
+                if isinstance(director_info, dict) else director_info
+            )
+            for director_key, director_info in (input_data.get('directors') or {}).items()
+        }
+        request['companyDocuments'] = documents('companyDocuments', input_data.get('companyDocuments'))
+        return request
+
+    def _plan_document_extraction(
+        self,
+        directors: Dict[str, Any],
+        company_docs: Dict[str, Any],
+        compiled_rules: CompiledRuleSet
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+        """
+        Restrict a request's documents to those the director and company rules read
+        
+        Args:
+            directors (dict): Director information keyed by director
+            company_docs (dict): Company documents
+            compiled_rules (CompiledRuleSet): Compiled validation rules
+        
+        Returns:
+            tuple: Planned directors, planned company documents and the
+                slot identifiers of skipped documents
+        """
+        planned_directors = {}
+        skipped = []
+        
+        if isinstance(directors, dict):
+            for director_key, director_info in directors.items():
+                if not isinstance(director_info, dict):
+                    continue
+                documents = director_info.get('documents', {})
+                rule_dag = self._director_rule_plan(director_info, compiled_rules)
+                planned_directors[director_key] = {
+                    **director_info,
+                    'documents': {
+                        doc_key: doc_content for doc_key, doc_content in documents.items()
+                        if doc_key in rule_dag.documents
+                    }
+                }
+                skipped.extend(
+                    RequestDocumentRegistry.slot_id(director_key, doc_key)
+                    for doc_key in rule_dag.unreferenced(self._uploaded_documents(documents))
+                )
+        
+        planned_company_docs = {}
+        if isinstance(company_docs, dict):
+            rule_dag = self._company_rule_plan(company_docs, compiled_rules)
+            planned_company_docs = {
+                doc_key: doc_content for doc_key, doc_content in company_docs.items()
+                if doc_key in rule_dag.documents
+            }
+            skipped.extend(
+                RequestDocumentRegistry.slot_id('companyDocuments', doc_key)
+                for doc_key in rule_dag.unreferenced(self._uploaded_documents(company_docs))
+            )
+        
+        if skipped:
+            self.logger.info(f"Skipping extraction of documents no rule reads: {skipped}")
+        
+        return planned_directors, planned_company_docs, skipped
 
-    def _process_company_documents(self, company_docs: Dict[str, str]) -> Dict[str, Any]:
+    def _run_director_rules(
+        self,
+        director_key: str,
+        director_info: Dict[str, Any],
+        rule_dag: RuleDAG,
+        document_registry: Optional[RequestDocumentRegistry] = None,
+        context: Optional[ValidationContext] = None
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """
+        Extract a director's referenced documents and evaluate each rule as
+        soon as the documents it reads are extracted
+        
+        Args:
+            director_key (str): Director identifier
+            director_info (dict): Director information
+            rule_dag (RuleDAG): Rule graph for the director
+            document_registry (RequestDocumentRegistry, optional): Request-scoped
+                document deduplication registry
+            context (ValidationContext, optional): Request-scoped state; a
+                new context if omitted
+        
+        Returns:
+            tuple: Extracted documents, and rule results (or the raised
+                exception) keyed by rule ID
+        """
+        context = context or ValidationContext()
+        documents = director_info.get('documents', {})
         processed_docs = {}
+        rule_results = {}
+        
+        if not rule_dag.rules:
+            return processed_docs, rule_results
+        
+        cancel_token = context.cancel_token
+        if cancel_token.cancelled:
+            for doc_key in rule_dag.documents:
+                processed_docs[doc_key] = self._cancelled_document(doc_key, context=context)
+            return processed_docs, rule_results
+        
+        # In fail-fast mode the rules that can decide the verdict, and the
+        # documents they read, go first
+        doc_order = [doc_key for doc_key in documents if doc_key in rule_dag.documents]
+        if context.fail_fast:
+            deciding_docs = set()
+            for rule in rule_dag.rules:
+                if self._decides_verdict(rule, context):
+                    deciding_docs.update(rule_dag.requires[rule.rule_id])
+            doc_order.sort(key=lambda doc_key: doc_key not in deciding_docs)
+        
+        pending = {}
+        rule_fingerprints = {}
+        with ThreadPoolExecutor(max_workers=min(len(rule_dag.documents) + len(rule_dag.rules), 10)) as executor:
+            def start_ready_rules():
+                if cancel_token.cancelled:
+                    return
+                ready = sorted(rule_dag.ready(processed_docs), key=lambda rule: not self._decides_verdict(rule, context))
+                for rule in ready:
+                    # Each rule sees exactly the documents it declared
+                    rule_data = {
+                        director_key: {
+                            **director_info,
+                            'documents': {
+                                doc_key: processed_docs[doc_key]
+                                for doc_key in rule_dag.requires[rule.rule_id]
+                            }
+                        }
+                    }
+                    
+                    # Unchanged inputs since the previous validation reuse its result
+                    fingerprint = self._rule_fingerprint(rule, rule_data, context)
+                    previous = self._reuse_rule_result(fingerprint, rule, director_key, context)
+                    if previous is not None:
+                        rule_results[rule.rule_id] = previous
+                        self._check_fail_fast(rule, previous, context, director_key)
+                        continue
+                    
+                    if rule.rule_id in self.EXTERNAL_RULES:
+                        future = executor.submit(rule.evaluator, self, rule_data, rule.conditions, context)
+                    else:
+                        future = executor.submit(rule.evaluator, self, rule_data, rule.conditions)
+                    pending[future] = ('rule', rule)
+                    rule_fingerprints[rule.rule_id] = fingerprint
+            
+            for doc_key in doc_order:
+                future = executor.submit(
+                    self._extract_registered_document,
+                    RequestDocumentRegistry.slot_id(director_key, doc_key),
+                    doc_key,
+                    documents[doc_key],
+                    document_registry,
+                    context
+                )
+                pending[future] = ('document', doc_key)
+            
+            start_ready_rules()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, item = pending.pop(future)
+                    if kind == 'rule':
+                        try:
+                            rule_results[item.rule_id] = future.result()
+                        except Exception as e:
+                            rule_results[item.rule_id] = e
+                        self._record_rule_result(
+                            rule_fingerprints.get(item.rule_id), item, rule_results[item.rule_id], director_key, context
+                        )
+                        self._check_fail_fast(item, rule_results[item.rule_id], context, director_key)
+                        continue
+                    
+                    try:
+                        processed_docs[item] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error processing document {item}: {str(e)}", exc_info=True)
+                        processed_docs[item] = {
+                            "is_valid": False,
+                            "error": str(e)
+                        }
+                
+                # Drop queued work once the verdict is decided; running
+                # extractions stop at their next cancellation check
+                if cancel_token.cancelled:
+                    for future, (kind, item) in list(pending.items()):
+                        if future.cancel():
+                            del pending[future]
+                            if kind == 'document':
+                                processed_docs[item] = self._cancelled_document(item, context=context)
+                
+                start_ready_rules()
+        
+        return processed_docs, rule_results
+
+    def _process_company_documents(
+        self, 
+        company_docs: Dict[str, str],
+        document_registry: Optional[RequestDocumentRegistry] = None,
+        compiled_rules: Optional[CompiledRuleSet] = None,
+        context: Optional[ValidationContext] = None
+    ) -> Dict[str, Any]:
+        context = context or ValidationContext()
+        processed_docs = {}
+        
+        # Without rules every document is extracted
+        skipped = set()
+        if compiled_rules is not None:
+            skipped = set(self._company_rule_plan(company_docs, compiled_rules).unreferenced(
+                self._uploaded_documents(company_docs)
+            ))
         
         for doc_key, doc_content in company_docs.items():
             try:
-                # Save base64 string to temp file (if not URL)
-                if isinstance(doc_content, str):
-                    if doc_content.startswith("http://") or doc_content.startswith("https://"):
-                        source = doc_content
+                if doc_key in skipped:
+                    # Company document keys double as document types
+                    processed_docs[doc_key] = self._skipped_document(doc_key, doc_key)
+                elif context.cancel_token.cancelled and doc_key not in NON_DOCUMENT_KEYS:
+                    processed_docs[doc_key] = self._cancelled_document(doc_key, doc_key, context)
+                elif isinstance(doc_content, (str, InMemoryDocument)):
+                    slot = RequestDocumentRegistry.slot_id('companyDocuments', doc_key)
+                    
+                    if document_registry is not None and document_registry.source_key(slot):
+                        # Share the extraction with any slot holding the same document
+                        result = document_registry.extract(
+                            slot,
+                            self.extraction_service.extraction_profile(doc_key),
+                            lambda: self._extract_company_document(doc_key, doc_content, context)
+                        )
+                        result = document_registry.annotate(slot, result)
                     else:
-                        # Determine file extension
-                        file_ext = "pdf" if "JVBER" in doc_content[:20] else "jpg"
-                        decoded = base64.b64decode(doc_content)
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp_file:
-                            tmp_file.write(decoded)
-                            source = tmp_file.name
-
-                    # Extract data
-                    result = self.extraction_service.extract_document_data(source, doc_key)
+                        result = self._extract_company_document(doc_key, doc_content, context)
+                    
                     processed_docs[doc_key] = result
 
+            except OperationCancelled:
+                processed_docs[doc_key] = self._cancelled_document(doc_key, doc_key, context)
+            
             except Exception as e:
                 self.logger.error(f"Error processing company document {doc_key}: {e}")
                 processed_docs[doc_key] = {
@@ -1204,12 +1937,97 @@ class DocumentValidationService:
         
         return processed_docs
 
+    def _extract_company_document(
+        self,
+        doc_key: str,
+        doc_content: str,
+        context: Optional[ValidationContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract a single company document from base64 or URL
+        
+        Args:
+            doc_key (str): Company document key (used as document type)
+            doc_content (str): base64-encoded file or URL
+            context (ValidationContext, optional): Request-scoped state
+        
+        Returns:
+            dict: Extracted document data
+        """
+        source = self._resolve_document_source(doc_key, doc_content)
+
+        # Extract data
+        return self.extraction_service.extract_document_data(
+            source,
+            doc_key,
+            cancel_token=context.cancel_token if context is not None else None,
+            previous_results=self._previous_extractions(context)
+        )
+
+    def _resolve_document_source(self, doc_key: str, doc_content):
+        """
+        Turn request document content into an extraction source
+        
+        URLs and in-memory documents are passed through; base64 content is
+        decoded in chunks straight into an in-memory document so it never
+        touches disk.
+        
+        Args:
+            doc_key (str): Document key
+            doc_content (str or InMemoryDocument): base64-encoded file, URL
+                or in-memory document
+        
+        Returns:
+            str or InMemoryDocument: Extraction source
+        """
+        if isinstance(doc_content, InMemoryDocument):
+            return doc_content
+
+        if doc_content.startswith("http://") or doc_content.startswith("https://"):
+            return doc_content
+
+        return decode_base64_document(doc_content, name=doc_key)
+
+    def _extract_registered_document(
+        self,
+        slot: str,
+        doc_key: str,
+        doc_content: str,
+        document_registry: Optional[RequestDocumentRegistry] = None,
+        context: Optional[ValidationContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract a director document once per request and fan the result out
+        
+        Args:
+            slot (str): Document slot identifier
+            doc_key (str): Document key
+            doc_content (str): base64-encoded file or URL
+            document_registry (RequestDocumentRegistry, optional): Request-scoped
+                document deduplication registry
+            context (ValidationContext, optional): Request-scoped state
+        
+        Returns:
+            dict: Document validation result flagged with duplicate reuse
+        """
+        if document_registry is None:
+            return self._extract_document_data_safe(doc_key, doc_content, context)
+
+        doc_type = self._get_document_type(doc_key)
+        result = document_registry.extract(
+            slot,
+            self.extraction_service.extraction_profile(doc_type),
+            lambda: self._extract_document_data_safe(doc_key, doc_content, context)
+        )
+        result['document_type'] = doc_type
 
+        return document_registry.annotate(slot, result)
 
     def _extract_document_data_safe(
         self, 
         doc_key: str, 
-        doc_content: str  # either base64 string or URL
+        doc_content: str,  # either base64 string or URL
+        context: Optional[ValidationContext] = None
     ) -> Dict[str, Any]:
         """
         Thread-safe method to extract document data from base64 or URL
@@ -1217,6 +2035,7 @@ class DocumentValidationService:
         Args:
             doc_key (str): Document key
             doc_content (str): base64-encoded file or URL
+            context (ValidationContext, optional): Request-scoped state
         
         Returns:
             dict: Document validation result
@@ -1224,23 +2043,17 @@ class DocumentValidationService:
         try:
             doc_type = self._get_document_type(doc_key)
 
-            # Detect base64 string (naive but works well)
-            if doc_content.startswith("http://") or doc_content.startswith("https://"):
-                input_source = doc_content
-            else:
-                # Save base64 to temp file
-                file_ext = "pdf" if "JVBER" in doc_content[:20] else "jpg"
-                decoded = base64.b64decode(doc_content)
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp_file:
-                    tmp_file.write(decoded)
-                    input_source = tmp_file.name
+            input_source = self._resolve_document_source(doc_key, doc_content)
 
             extracted_data = self.extraction_service.extract_document_data(
-                input_source, doc_type
+                input_source,
+                doc_type,
+                cancel_token=context.cancel_token if context is not None else None,
+                previous_results=self._previous_extractions(context)
             )
 
             return {
-                "source": input_source,
+                "source": getattr(input_source, 'source', input_source),
                 "document_type": doc_type,
                 "is_valid": extracted_data is not None and not (
                     isinstance(extracted_data, dict) and extracted_data.get('extraction_status') == 'failed'
@@ -1248,6 +2061,9 @@ class DocumentValidationService:
                 "extracted_data": extracted_data or {}
             }
 
+        except OperationCancelled:
+            return self._cancelled_document(doc_key, context=context)
+
         except Exception as e:
             self.logger.error(f"Document extraction error for {doc_key}: {str(e)}", exc_info=True)
             return {
@@ -1436,15 +2252,15 @@ class DocumentValidationService:
         Args:
             company_docs (dict): Company document information
             directors (dict): Director information
-            compliance_rules (dict): Compliance rules
+            compliance_rules (dict or CompiledRuleSet): Compliance rules
             preconditions (dict, optional): Additional validation preconditions
         
         Returns:
             dict: Validation results for company documents
         """
         try:
-            # Extract rules
-            rules = self._extract_rules_from_compliance_data(compliance_rules)
+            # Compiled when the rules snapshot was published
+            compiled_rules = self._compile_rules(compliance_rules)
             
             validation_result = {}
             validation_errors = []
@@ -1499,14 +2315,11 @@ class DocumentValidationService:
                         # Validate age if extracted data available
                         if address_proof_data:
                             # Get company address proof rule
-                            company_address_rule = next(
-                                (rule for rule in rules if rule.get('rule_id') == 'COMPANY_ADDRESS_PROOF'), 
-                                None
-                            )
+                            company_address_rule = compiled_rules.get('COMPANY_ADDRESS_PROOF')
                             
                             if company_address_rule:
                                 # Get conditions
-                                conditions = company_address_rule.get('conditions', {})
+                                conditions = company_address_rule.conditions
                                 max_age_days = conditions.get('max_age_days', 45)
                                 
                                 # Check address proof age
@@ -1546,10 +2359,7 @@ class DocumentValidationService:
                         
                         # Validate NOC Owner Name if preconditions are provided
                         if noc_data and preconditions and 'owner_name' in preconditions:
-                            noc_owner_rule = next(
-                                (rule for rule in rules if rule.get('rule_id') == 'NOC_OWNER_VALIDATION'), 
-                                None
-                            )
+                            noc_owner_rule = compiled_rules.get('NOC_OWNER_VALIDATION')
                             
                             if noc_owner_rule:
                                 expected_owner_name = preconditions.get('owner_name')
@@ -1668,63 +2478,39 @@ class DocumentValidationService:
             }
         
         try:
-            # Extract rules, handling potential nested structure
-            rules = self._extract_rules_from_compliance_data(compliance_rules)
+            # Compiled when the rules snapshot was published
+            compiled_rules = self._compile_rules(compliance_rules)
             
             # Log processing rules for debugging
-            self.logger.info(f"Processing {len(rules)} compliance rules")
-            
-            # Rule processing map
-            rule_processing_map = {
-                "DIRECTOR_COUNT": self._validate_director_count_rule,
-                "PASSPORT_PHOTO": self._validate_passport_photo_rule,
-                "SIGNATURE": self._validate_signature_rule,
-                "ADDRESS_PROOF": self._validate_address_proof_rule,
-                "INDIAN_DIRECTOR_PAN": self._validate_indian_pan_rule,
-                "INDIAN_DIRECTOR_AADHAR": self._validate_indian_aadhar_rule,
-                "FOREIGN_DIRECTOR_DOCS": self._validate_foreign_director_rule,
-                "COMPANY_ADDRESS_PROOF": self._validate_company_address_proof_rule,
-                "NOC_VALIDATION": self._validate_noc_rule,
-                "AADHAR_PAN_LINKAGE": self._validate_aadhar_pan_linkage_rule,
-                "NOC_OWNER_VALIDATION": self._validate_noc_owner_name_rule
-            }
+            self.logger.info(f"Processing {len(compiled_rules)} compliance rules")
             
             # Process each rule
-            for rule in rules:
-                rule_id = rule.get('rule_id', '')
+            for rule in compiled_rules.rules:
+                rule_id = rule.rule_id
                 
                 # Skip inactive rules
-                if not rule.get('is_active', True):
+                if not rule.is_active:
                     self.logger.info(f"Skipping inactive rule: {rule_id}")
                     continue
                 
-                # Find appropriate validation method
-                validation_method = rule_processing_map.get(rule_id)
+                # Evaluators are unbound service methods
+                validation_method = rule.evaluator
                 
                 if not validation_method:
                     self.logger.warning(f"No validation method found for rule: {rule_id}")
                     continue
                 
                 try:
-                    # Prepare conditions for the rule
-                    conditions = rule.get('conditions', {})
-                    
                     # For NOC Owner validation, we need preconditions
                     if rule_id == "NOC_OWNER_VALIDATION":
                         # Get preconditions from the last called validate_documents method
                         preconditions = getattr(self, '_current_preconditions', {})
-                        validation_result = validation_method(company_docs_validation, conditions, preconditions)
+                        validation_result = validation_method(self, company_docs_validation, rule.conditions, preconditions)
                     # Determine which data to pass based on rule type
-                    elif rule_id in ["DIRECTOR_COUNT", "PASSPORT_PHOTO", "SIGNATURE", 
-                                "ADDRESS_PROOF", "INDIAN_DIRECTOR_PAN", 
-                                "INDIAN_DIRECTOR_AADHAR", "FOREIGN_DIRECTOR_DOCS", 
-                                "AADHAR_PAN_LINKAGE"]:
-                        validation_result = validation_method(directors_validation, conditions)
-                    elif rule_id in ["COMPANY_ADDRESS_PROOF", "NOC_VALIDATION"]:
-                        validation_result = validation_method(company_docs_validation, conditions)
+                    elif rule_id in self.COMPANY_RULES:
+                        validation_result = validation_method(self, company_docs_validation, rule.conditions)
                     else:
-                        self.logger.warning(f"Unhandled rule type: {rule_id}")
-                        continue
+                        validation_result = validation_method(self, directors_validation, rule.conditions)
                     
                     # Store validation result under lowercase rule_id
                     validation_rules[rule_id.lower()] = validation_result
@@ -1830,6 +2616,7 @@ class DocumentValidationService:
         min_clarity_score = conditions.get('min_clarity_score', 0.1)  # Lower threshold
         require_passport_style = conditions.get('is_passport_style', False)  # Make optional
         require_face_visible = conditions.get('face_visible', True)  # Keep this requirement
+        different_photos_required = conditions.get('different_photos_required', False)
         
         # Check each director
         for director_key, director_info in safe_directors.items():
@@ -1841,6 +2628,19 @@ class DocumentValidationService:
                 self.logger.warning(f"No passport photo found for {director_key}")
                 continue
             
+            # The same photo file must not be reused by another director
+            if different_photos_required:
+                other_directors = sorted({
+                    slot.split('.', 1)[0]
+                    for slot in passport_photo.get('duplicate_slots', [])
+                    if slot.endswith('.passportPhoto') and slot.split('.', 1)[0] != director_key
+                })
+                if other_directors:
+                    return {
+                        "status": "failed",
+                        "error_message": f"Same passport photo used for {director_key} and {', '.join(other_directors)}"
+                    }
+            
             # If extraction failed, be lenient
             if not passport_photo.get('is_valid', False):
                 self.logger.warning(f"Passport photo extraction issues for {director_key}, but proceeding with validation")
@@ -2067,6 +2867,7 @@ class DocumentValidationService:
         # Get conditions
         masked_not_allowed = conditions.get('masked_not_allowed', True)
         different_images_required = conditions.get('different_images_required', True)
+        identical_images_fail = conditions.get('identical_images_fail', False)
         
         # Check each director
         for director_key, director_info in safe_directors.items():
@@ -2117,46 +2918,19 @@ class DocumentValidationService:
             
             # If different_images_required is True, do stricter checking
             if different_images_required:
-                # Check URL or file uniqueness
-                # Try comparing base64 content if URL is missing
-                front_raw = aadhar_front.get('base64') or aadhar_front.get('content') or ''
-                back_raw = aadhar_back.get('base64') or aadhar_back.get('content') or ''
-
-                # fallback: compare by hash (short hash, to avoid long strings)
-                import hashlib
-                front_hash = hashlib.md5(front_raw.encode()).hexdigest() if front_raw else ''
-                back_hash = hashlib.md5(back_raw.encode()).hexdigest() if back_raw else ''
-
-                # If hashes are equal, assume same image
-                if front_hash and front_hash == back_hash:
-                    if len(inconsistent_fields) > 1:
+                # Slots sharing a source key reference the same file (same
+                # Drive file, S3 object or decoded bytes)
+                front_key = aadhar_front.get('source_key')
+                back_key = aadhar_back.get('source_key')
+
+                # The same file only fails when its key fields also disagree,
+                # unless the rule opts into failing every identical pair
+                if front_key and front_key == back_key:
+                    if identical_images_fail or len(inconsistent_fields) > 1:
                         return {
                             "status": "failed",
                             "error_message": f"Same image used for Aadhar front and back for {director_key}"
                         }
-
-                # front_url = aadhar_front.get('url', '')
-                # back_url = aadhar_back.get('url', '')
-                
-                # # Extract file ID from Google Drive URL
-                # def extract_google_drive_id(url):
-                #     if 'drive.google.com' in url:
-                #         match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
-                #         if match:
-                #             return match.group(1)
-                #     return url
-                
-                # front_id = extract_google_drive_id(front_url)
-                # back_id = extract_google_drive_id(back_url)
-                
-                # # If URLs are identical and we require different images
-                # if front_id == back_id:
-                #     # But allow if key information is consistent and not masked
-                #     if len(inconsistent_fields) > 1:
-                #         return {
-                #             "status": "failed",
-                #             "error_message": f"Same image used for Aadhar front and back for {director_key}"
-                #         }
                     
                     # Log a warning about potential duplicate
                     self.logger.warning(f"Potential duplicate Aadhar images for {director_key}")
@@ -2404,13 +3178,20 @@ class DocumentValidationService:
             "error_message": None
         }
     
-    def _validate_aadhar_pan_linkage_rule(self, directors_validation, conditions):
+    def _validate_aadhar_pan_linkage_rule(self, directors_validation, conditions, context=None):
         """
         Validate Aadhar PAN linkage with strict error handling
         
+        Director rules run per director as soon as that director's
+        documents are extracted, so each call normally checks a single
+        Aadhar/PAN pair. Checks of different directors still overlap,
+        because directors are validated in parallel and every check goes
+        through the shared linkage scheduler and its portal rate budget.
+        
         Args:
             directors_validation (dict): Directors validation data
             conditions (dict): Rule conditions
+            context (ValidationContext, optional): Request-scoped state
         
         Returns:
             dict: Validation result
@@ -2426,92 +3207,229 @@ class DocumentValidationService:
                 "error_message": None
             }
         
-        # Check each director
+        # Collect the Aadhar/PAN pair of each Indian director passed in
+        pairs = {}
         for director_key, director_info in safe_directors.items():
             # Only validate Indian directors
             if director_info.get('nationality', '').lower() != 'indian':
                 continue
-                
+
             documents = director_info.get('documents', {})
-            
+
             # Get Aadhar and PAN documents
             aadhar_front = documents.get('aadharCardFront', {})
             aadhar_back = documents.get('aadharCardBack', {})
             pan_card = documents.get('panCard', {})
-            
+
             # Check if both documents exist
             if not aadhar_front and not aadhar_back:
                 self.logger.warning(f"No Aadhar card found for {director_key}")
                 continue
-                
+
             if not pan_card:
                 self.logger.warning(f"No PAN card found for {director_key}")
                 continue
-            
+
             # Get extraction data
             aadhar_data = aadhar_front.get('extracted_data', {})
             aadhar_back_data = aadhar_back.get('extracted_data', {}) if aadhar_back else {}
             pan_data = pan_card.get('extracted_data', {})
-            
+
             # Get Aadhar number (try from both front and back)
             aadhar_number = aadhar_data.get('aadhar_number', '')
-            
+
             # If front is masked, try to get from back
             if aadhar_data.get('is_masked', False) and aadhar_back_data:
                 aadhar_number = aadhar_back_data.get('aadhar_number', aadhar_number)
-            
+
             pan_number = pan_data.get('pan_number', '')
-            
+
             # Check if both numbers are available and valid
             if not aadhar_number or 'XXXX' in aadhar_number:
                 self.logger.warning(f"Masked or missing Aadhar number for {director_key}")
                 continue
-                
+
             if not pan_number:
                 self.logger.warning(f"Missing PAN number for {director_key}")
                 continue
-            
+
             # Remove spaces and any other non-numeric characters from Aadhar number
             formatted_aadhar = re.sub(r'\D', '', aadhar_number)
-            
-            # Verify linkage
-            try:
-                self.logger.info(f"Verifying Aadhar-PAN linkage for {director_key}: Aadhar={formatted_aadhar}, PAN={pan_number}")
-                
-                linkage_result = self.aadhar_pan_linkage_service.verify_linkage(
-                    formatted_aadhar,
-                    pan_number
-                )
-                
-                # Log the result for debugging
-                self.logger.info(f"Linkage result: {linkage_result}")
-                
-                # Strictly check for linkage - fail on any error or non-linked status
-                if not linkage_result.get('is_linked', False):
-                    error_message = linkage_result.get('message', 'Unknown error')
+
+            # Numbers that fail offline validation cannot be linked; skip the portal call
+            aadhar_check = validate_aadhar_number(formatted_aadhar)
+            pan_check = validate_pan_number(pan_number, pan_data.get('name'))
+            for label, check in (("Aadhar", aadhar_check), ("PAN", pan_check)):
+                if not check['valid']:
                     return {
                         "status": "failed",
-                        "error_message": f"Aadhar and PAN not linked for {director_key}: {error_message}"
+                        "error_message": f"{label} number for {director_key} failed offline validation: {check['error']}"
                     }
-                
-                # Successful linkage for at least one Indian director
-                return {
-                    "status": "passed",
-                    "error_message": None
-                }
+
+            pairs[director_key] = (formatted_aadhar, pan_number)
+
+        if not pairs:
+            # No Indian directors found for linkage check
+            return {
+                "status": "passed",
+                "error_message": None
+            }
+
+        # Deferred mode: queue the checks and report them as pending
+        deferred_linkage = context.deferred_linkage if context is not None else None
+        if deferred_linkage is not None:
+            for director_key, (aadhar_number, pan_number) in pairs.items():
+                deferred_linkage[director_key] = linkage_scheduler.submit(aadhar_number, pan_number)
+            return {
+                "status": "pending",
+                "error_message": None,
+                "details": {director_key: {"status": "pending"} for director_key in pairs}
+            }
+
+        # Verify through the scheduler so concurrent requests share its rate budget
+        try:
+            self.logger.info(f"Verifying Aadhar-PAN linkage for {len(pairs)} director(s)")
+            results = linkage_scheduler.verify_many(
+                pairs,
+                cancel_token=context.cancel_token if context is not None else None
+            )
+        except Exception as e:
+            self.logger.error(f"Error verifying Aadhar-PAN linkage: {str(e)}", exc_info=True)
+            return {
+                "status": "failed",
+                "error_message": f"Error during Aadhar-PAN linkage verification: {str(e)}"
+            }
+
+        return self._summarize_linkage_results(results)
+
+    def _summarize_linkage_results(self, results):
+        """
+        Turn per-director linkage results into the linkage rule result
+
+        Args:
+            results (dict): Linkage verification result keyed by director
+
+        Returns:
+            dict: Validation result with per-director details
+        """
+        details = {}
+        failures = []
+        cancelled = False
+        for director_key, linkage_result in results.items():
+            self.logger.info(f"Linkage result for {director_key}: {linkage_result}")
+            is_linked = linkage_result.get('is_linked', False)
+            details[director_key] = {
+                "is_linked": is_linked,
+                "message": linkage_result.get('message'),
+                "cached": linkage_result.get('cached', False),
+                "rechecks": linkage_result.get('rechecks', 0)
+            }
+
+            # Abandoned after a fail-fast verdict, not a linkage failure
+            if linkage_result.get('error') == 'cancelled':
+                cancelled = True
+                continue
+
+            # Strictly check for linkage - fail on any error or non-linked status
+            if not is_linked:
+                error_message = linkage_result.get('message', 'Unknown error')
+                failures.append(f"Aadhar and PAN not linked for {director_key}: {error_message}")
+
+        if cancelled and not failures:
+            return {
+                "status": "skipped",
+                "error_message": "Linkage verification cancelled",
+                "details": details
+            }
+
+        return {
+            "status": "failed" if failures else "passed",
+            "error_message": "; ".join(failures) if failures else None,
+            "details": details
+        }
+
+    def _linkage_callback_url(self, requested_url=None):
+        """
+        Get the URL a deferred linkage result is POSTed to
+
+        Callback URLs come from configuration only: the service must not
+        POST to hosts a caller chooses, so a requested URL is used only if
+        it is in LINKAGE_CALLBACK_ALLOWED_URLS.
+
+        Args:
+            requested_url (str, optional): 'linkage_callback_url' of the request
+
+        Returns:
+            str or None: Callback URL
+        """
+        if requested_url:
+            if requested_url in Config.LINKAGE_CALLBACK_ALLOWED_URLS:
+                return requested_url
+            self.logger.warning(f"Ignoring linkage callback URL not in LINKAGE_CALLBACK_ALLOWED_URLS: {requested_url}")
+        return Config.LINKAGE_CALLBACK_URL or None
+
+    def _start_deferred_linkage(self, linkage_id, futures, callback=None, callback_url=None, request_id=None):
+        """
+        Finish queued linkage checks in the background and deliver the result
+
+        The final rule result is written to the linkage result store and,
+        when given, passed to the callback and POSTed to the callback URL.
+        At most LINKAGE_CALLBACK_WORKERS requests are finished at a time.
+
+        Args:
+            linkage_id (str): Server-generated id the result is stored and delivered under
+            futures (dict): Linkage check futures keyed by director
+            callback (callable, optional): Called with (linkage_id, rule result)
+            callback_url (str, optional): Configured URL the rule result is POSTed to
+            request_id (str, optional): Client request id, echoed in the POST
+        """
+        linkage_results.mark_pending(linkage_id, {
+            "status": "pending",
+            "error_message": None,
+            "details": {director_key: {"status": "pending"} for director_key in futures}
+        })
+
+        def finish():
+            try:
+                rule_result = self._summarize_linkage_results(linkage_scheduler.collect(futures))
             except Exception as e:
-                self.logger.error(f"Error verifying Aadhar-PAN linkage for {director_key}: {str(e)}", exc_info=True)
-                return {
+                self.logger.error(f"Deferred Aadhar-PAN linkage failed for {linkage_id}: {str(e)}", exc_info=True)
+                rule_result = {
                     "status": "failed",
                     "error_message": f"Error during Aadhar-PAN linkage verification: {str(e)}"
                 }
-        
-        # No Indian directors found for linkage check
-        return {
-            "status": "passed",
-            "error_message": None
-        }
-    
+
+            linkage_results.complete(linkage_id, rule_result)
+            self.logger.info(f"Deferred Aadhar-PAN linkage for {linkage_id}: {rule_result.get('status')}")
+
+            if callback:
+                try:
+                    callback(linkage_id, rule_result)
+                except Exception as e:
+                    self.logger.error(f"Linkage callback failed for {linkage_id}: {str(e)}", exc_info=True)
+
+            if callback_url:
+                try:
+                    requests.post(
+                        callback_url,
+                        json={
+                            "deferred_linkage_id": linkage_id,
+                            "request_id": request_id,
+                            "validation_rules": {"aadhar_pan_linkage": rule_result}
+                        },
+                        timeout=Config.LINKAGE_CALLBACK_TIMEOUT
+                    )
+                except requests.exceptions.RequestException as e:
+                    self.logger.error(f"Linkage callback POST failed for {linkage_id}: {str(e)}")
+
+        with self._linkage_executor_lock:
+            if self._linkage_executor is None:
+                self._linkage_executor = ThreadPoolExecutor(
+                    max_workers=max(1, Config.LINKAGE_CALLBACK_WORKERS),
+                    thread_name_prefix='linkage-callback'
+                )
+        self._linkage_executor.submit(finish)
+
     def _extract_director_name(self, director_info):
         """
         Extract director name from documents
@@ -1,8 +1,8 @@
 import streamlit as st
-import base64
 import json
 from services.validation_service import DocumentValidationService
 from api.document_validation_api import DocumentValidationAPI
+from models.document_models import InMemoryDocument
 
 import os
 
@@ -15,13 +15,20 @@ if "ELASTICSEARCH_PASSWORD" in st.secrets:
 
 st.title("Document Validation UI")
 
-validation_api = DocumentValidationAPI()
+@st.cache_resource
+def get_validation_api():
+    # Built once per server process: reruns reuse the rules snapshots,
+    # Elasticsearch connection and worker pools instead of rebuilding them
+    return DocumentValidationAPI()
+
+validation_api = get_validation_api()
 
 def encode_file(file):
     if file is None:
         return None
     try:
-        return base64.b64encode(file.read()).decode("utf-8")
+        # Hand the uploaded buffer over as-is: no base64 round-trip, no copy
+        return InMemoryDocument(data=file.getbuffer(), name=file.name, media_type=file.type)
     except Exception as e:
         return None
 
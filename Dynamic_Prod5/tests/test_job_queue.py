@@ -0,0 +1,114 @@
+import pytest
+
+import utils.job_queue as job_queue_module
+from utils.job_queue import ValidationJobQueue, RUNNING, COMPLETED, FAILED
+
+LEASE = 10
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Leases are read from time.time(); a fake clock expires them without sleeping
+    clock = Clock()
+    monkeypatch.setattr(job_queue_module, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return ValidationJobQueue(db_path=str(tmp_path / 'jobs.sqlite3'), lease=LEASE, max_attempts=2, ttl=3600)
+
+
+def test_claims_oldest_queued_job_first(queue, clock):
+    first = queue.submit({'request_id': 'first'})
+    clock.advance(1)
+    second = queue.submit({'request_id': 'second'})
+
+    assert queue.claim('worker1') == (first, {'request_id': 'first'}, 1)
+    assert queue.claim('worker2') == (second, {'request_id': 'second'}, 1)
+    assert queue.claim('worker3') is None
+
+
+def test_renewed_lease_keeps_job_with_its_worker(queue, clock):
+    job_id = queue.submit({'request_id': 'job'})
+    queue.claim('worker1')
+
+    clock.advance(LEASE - 1)
+    assert queue.renew(job_id, 'worker1')
+    clock.advance(LEASE - 1)
+
+    assert queue.claim('worker2') is None
+    assert queue.get(job_id)['state'] == RUNNING
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(queue, clock):
+    job_id = queue.submit({'request_id': 'job'})
+    queue.claim('worker1')
+
+    clock.advance(LEASE)
+
+    assert queue.claim('worker2') == (job_id, {'request_id': 'job'}, 2)
+    assert not queue.renew(job_id, 'worker1')
+    assert queue.renew(job_id, 'worker2')
+
+
+def test_stale_worker_result_is_dropped_and_checkpoints_kept(queue, clock):
+    job_id = queue.submit({'request_id': 'job'})
+    queue.claim('worker1')
+    queue.checkpoint_document(job_id, 'fingerprint1', {'name': 'JOHN DOE'})
+
+    clock.advance(LEASE)
+    queue.claim('worker2')
+    queue.complete(job_id, 'worker1', {'response': 'stale'})
+
+    job = queue.get(job_id, include_result=True)
+    assert job['state'] == RUNNING
+    assert job['result'] is None
+    assert queue.documents(job_id) == {'fingerprint1': {'name': 'JOHN DOE'}}
+
+    queue.complete(job_id, 'worker2', {'response': 'fresh'})
+
+    job = queue.get(job_id, include_result=True)
+    assert job['state'] == COMPLETED
+    assert job['result'] == {'response': 'fresh'}
+    assert queue.documents(job_id) == {}
+
+
+def test_job_fails_once_attempts_are_exhausted(queue, clock):
+    job_id = queue.submit({'request_id': 'job'})
+    queue.claim('worker1')
+    clock.advance(LEASE)
+    queue.claim('worker2')
+    queue.checkpoint_document(job_id, 'fingerprint1', {'name': 'JOHN DOE'})
+    clock.advance(LEASE)
+
+    assert queue.claim('worker3') is None
+
+    job = queue.get(job_id)
+    assert job['state'] == FAILED
+    assert job['attempts'] == 2
+    assert job['error'] == 'Validation was interrupted 2 times'
+    assert job['documents_checkpointed'] == 0
+
+
+def test_failed_job_keeps_error(queue):
+    job_id = queue.submit({'request_id': 'job'})
+    queue.claim('worker1')
+
+    queue.fail(job_id, 'worker1', 'Missing required input field: directors')
+
+    job = queue.get(job_id)
+    assert job['state'] == FAILED
+    assert job['error'] == 'Missing required input field: directors'
+    assert queue.claim('worker2') is None
@@ -0,0 +1,62 @@
+import io
+import json
+import base64
+
+from models.document_models import InMemoryDocument
+from utils.json_stream import StreamingJSONReader
+
+DOCUMENT = b'%PDF-1.4\n' + bytes(range(256)) * 40
+
+
+def read(text, spill_threshold=256, chunk_size=100):
+    return list(StreamingJSONReader(io.StringIO(text), spill_threshold=spill_threshold, chunk_size=chunk_size))
+
+
+def test_small_values_are_read_line_by_line():
+    values = read('{"request_id": "a", "count": 2}\n{"request_id": "b", "tags": ["x", null]}\n')
+
+    assert values == [
+        (1, {'request_id': 'a', 'count': 2}, None),
+        (2, {'request_id': 'b', 'tags': ['x', None]}, None)
+    ]
+
+
+def test_large_string_is_spilled_to_a_document():
+    encoded = base64.b64encode(DOCUMENT).decode('ascii')
+
+    (line, value, error), = read(json.dumps({'request_id': 'a', 'passport': encoded}) + '\n')
+
+    assert error is None
+    document = value['passport']
+    assert isinstance(document, InMemoryDocument)
+    assert document.name == 'passport'
+    assert document.media_type == 'application/pdf'
+    assert bytes(document.data) == DOCUMENT
+
+
+def test_escaped_base64_is_decoded_when_spilled():
+    # Wrapped base64 with escaped slashes, as some JSON encoders write it
+    encoded = base64.encodebytes(DOCUMENT).decode('ascii')
+    text = '{"passport": ' + json.dumps(encoded).replace('/', '\\/') + '}\n'
+
+    (line, value, error), = read(text)
+
+    assert error is None
+    assert bytes(value['passport'].data) == DOCUMENT
+
+
+def test_invalid_spilled_base64_is_reported_and_reading_resumes():
+    text = json.dumps({'passport': '!' * 1024}) + '\n' + json.dumps({'request_id': 'b'}) + '\n'
+
+    (first, second) = read(text)
+
+    assert first[1] is None
+    assert first[2].startswith('Invalid base64 content in passport')
+    assert second == (2, {'request_id': 'b'}, None)
+
+
+def test_malformed_line_is_reported_and_reading_resumes():
+    (first, second) = read('{bad json\n{"request_id": "b"}\n')
+
+    assert first[0] == 1 and first[1] is None and first[2]
+    assert second == (2, {'request_id': 'b'}, None)
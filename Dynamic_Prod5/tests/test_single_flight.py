@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from models.document_models import InMemoryDocument
+from services.extraction_service import ExtractionService, extraction_flights
+from utils.cancellation import CancellationToken, OperationCancelled, raise_if_cancelled
+from utils.single_flight import SingleFlight
+
+DOCUMENT = InMemoryDocument(data=b'%PDF-1.4\nsingle flight test', name='passport')
+
+
+@pytest.fixture
+def followed(monkeypatch):
+    """
+    Event set once a caller joins a call that is already in flight
+    """
+    joined = threading.Event()
+    join = extraction_flights._join
+
+    def tracking_join(key):
+        future, is_leader = join(key)
+        if not is_leader:
+            joined.set()
+        return future, is_leader
+
+    monkeypatch.setattr(extraction_flights, '_join', tracking_join)
+    return joined
+
+
+def test_concurrent_callers_share_one_call(monkeypatch):
+    flights = SingleFlight()
+    followers = threading.Semaphore(0)
+    join = flights._join
+
+    def tracking_join(key):
+        future, is_leader = join(key)
+        if not is_leader:
+            followers.release()
+        return future, is_leader
+
+    monkeypatch.setattr(flights, '_join', tracking_join)
+    calls = []
+
+    def work():
+        calls.append(1)
+        # Hold the call open until both followers have joined it
+        for _ in range(2):
+            followers.acquire(timeout=5)
+        return {'name': 'JOHN DOE'}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do('key', work))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{'name': 'JOHN DOE'}] * 3
+    assert flights.in_flight() == 0
+
+
+def test_follower_extracts_again_after_leader_is_cancelled(followed):
+    service = ExtractionService('sk-test')
+    leader_started = threading.Event()
+    calls = []
+
+    def extract(document_data, document_type, cancel_token=None):
+        calls.append(cancel_token)
+        if len(calls) == 1:
+            leader_started.set()
+            followed.wait(5)
+            raise_if_cancelled(cancel_token)
+        return {'name': 'JOHN DOE'}
+
+    service._extract_from_document_data = extract
+    leader_token = CancellationToken()
+    outcomes = {}
+
+    def leader():
+        try:
+            service.extract_document_data(DOCUMENT, 'passport', leader_token)
+        except OperationCancelled:
+            outcomes['leader'] = 'cancelled'
+
+    def follower():
+        outcomes['follower'] = service.extract_document_data(DOCUMENT, 'passport')
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    assert leader_started.wait(5)
+    leader_token.cancel('fail-fast')
+    follower_thread = threading.Thread(target=follower)
+    follower_thread.start()
+    leader_thread.join(5)
+    follower_thread.join(5)
+
+    assert outcomes['leader'] == 'cancelled'
+    assert outcomes['follower']['name'] == 'JOHN DOE'
+    assert 'content_fingerprint' in outcomes['follower']
+    assert len(calls) == 2
+    assert calls[1] is None
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from services.validation_service import DocumentValidationService
+
+COMPLIANCE_RULES = {
+    'rules': [
+        {'rule_id': 'SIGNATURE'},
+        {'rule_id': 'ADDRESS_PROOF'}
+    ]
+}
+
+
+@pytest.fixture
+def service():
+    # The summary only reads rule results; no Elasticsearch or AI client is needed
+    service = DocumentValidationService.__new__(DocumentValidationService)
+    service.logger = logging.getLogger(__name__)
+    return service
+
+
+def director(**rule_statuses):
+    return {
+        'rule_validations': {
+            rule_id: {
+                'status': status,
+                'error_message': None if status == 'passed' else f"{rule_id} {status}"
+            }
+            for rule_id, status in rule_statuses.items()
+        }
+    }
+
+
+@pytest.mark.parametrize('first, second', [('failed', 'passed'), ('passed', 'failed')])
+def test_failure_of_any_director_decides_rule(service, first, second):
+    directors_validation = {
+        'director1': director(signature=first),
+        'director2': director(signature=second)
+    }
+
+    summary = service._prepare_validation_rules(directors_validation, {}, COMPLIANCE_RULES)
+
+    assert summary['signature_validation'] == {'status': 'failed', 'error_message': 'signature failed'}
+
+
+def test_rules_are_summarized_independently(service):
+    directors_validation = {
+        'director1': director(signature='failed', address_proof='passed'),
+        'director2': director(signature='passed', address_proof='passed')
+    }
+
+    summary = service._prepare_validation_rules(directors_validation, {}, COMPLIANCE_RULES)
+
+    assert summary['signature_validation']['status'] == 'failed'
+    assert summary['address_proof_validation'] == {'status': 'passed', 'error_message': None}
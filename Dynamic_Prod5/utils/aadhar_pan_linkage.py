@@ -2,11 +2,15 @@ import time
 import requests
 import logging
 import random
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Callable
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 import re
 
+from config.settings import Config
+from utils.id_checksums import validate_aadhar_number
+from utils.linkage_cache import linkage_cache, LINKED, NOT_LINKED, INCONCLUSIVE
+
 class AadharPanLinkageService:
     """
     Enhanced service to verify Aadhar and PAN linkage with robust error handling
@@ -45,7 +49,9 @@ class AadharPanLinkageService:
     def verify_linkage(
         aadhar_number: str, 
         pan_number: str,
-        max_retries: int = 3
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+        before_request: Optional[Callable[[], None]] = None
     ) -> Dict[str, Any]:
         """
         Advanced Aadhar and PAN linkage verification
@@ -54,6 +60,9 @@ class AadharPanLinkageService:
             aadhar_number (str): Aadhar number
             pan_number (str): PAN number
             max_retries (int): Maximum number of retries
+            session (requests.Session, optional): Shared session to reuse
+            before_request (callable, optional): Throttle called before the
+                portal request, replacing the default randomised sleep
         
         Returns:
             dict: Linkage verification result
@@ -75,6 +84,15 @@ class AadharPanLinkageService:
                 'error': 'invalid_aadhar'
             }
         
+        # Offline Verhoeff check: never spend a portal call on a misread number
+        aadhar_check = validate_aadhar_number(cleaned_aadhar)
+        if not aadhar_check['valid']:
+            return {
+                'is_linked': False,
+                'message': aadhar_check['error'],
+                'error': 'invalid_aadhar'
+            }
+        
         # Clean and validate PAN number
         cleaned_pan = pan_number.strip().upper()
         if not re.match(r'^[A-Z]{5}\d{4}[A-Z]{1}$', cleaned_pan):
@@ -84,9 +102,72 @@ class AadharPanLinkageService:
                 'error': 'invalid_pan'
             }
         
+        # Cached results skip both the portal call and the throttling sleep
+        if Config.LINKAGE_CACHE_ENABLED:
+            cached_result = linkage_cache.get(cleaned_aadhar, cleaned_pan)
+            if cached_result is not None:
+                cached_result['cached'] = True
+                return cached_result
+        
+        result = AadharPanLinkageService._query_portal(
+            cleaned_aadhar, cleaned_pan, max_retries, session, before_request
+        )
+        
+        if Config.LINKAGE_CACHE_ENABLED:
+            outcome = AadharPanLinkageService.classify_result(result)
+            if outcome:
+                # Cache only the verdict; portal payloads are not persisted
+                linkage_cache.put(cleaned_aadhar, cleaned_pan, outcome, {
+                    'is_linked': result.get('is_linked', False),
+                    'message': result.get('message'),
+                    'outcome': outcome
+                })
+        
+        return result
+    
+    @staticmethod
+    def classify_result(result: Dict[str, Any]):
+        """
+        Classify a linkage result for caching
+        
+        Args:
+            result (dict): Linkage verification result
+        
+        Returns:
+            str or None: Cache outcome, None for errors and rate limiting
+        """
+        if result.get('is_linked'):
+            return LINKED
+        if result.get('is_not_linked'):
+            return NOT_LINKED
+        if 'raw_response' in result:
+            return INCONCLUSIVE
+        return None
+    
+    @staticmethod
+    def _query_portal(
+        cleaned_aadhar: str,
+        cleaned_pan: str,
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+        before_request: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the income-tax portal for Aadhar-PAN linkage
+        
+        Args:
+            cleaned_aadhar (str): Validated 12-digit Aadhar number
+            cleaned_pan (str): Validated PAN
+            max_retries (int): Maximum number of retries
+            session (requests.Session, optional): Shared session to reuse
+            before_request (callable, optional): Throttle called before the request
+        
+        Returns:
+            dict: Linkage verification result
+        """
         try:
             # Create robust session
-            session = AadharPanLinkageService._create_retry_session(max_retries)
+            session = session or AadharPanLinkageService._create_retry_session(max_retries)
             
             # Prepare request with better error handling
             url = 'https://eportal.incometax.gov.in/iec/servicesapi/getEntity'
@@ -107,8 +188,11 @@ class AadharPanLinkageService:
                 'X-Requested-With': 'XMLHttpRequest'
             }
             
-            # Add randomized delays between attempts
-            time.sleep(random.uniform(0.5, 1.5))
+            # Throttle: the caller's rate budget, or a randomized delay
+            if before_request is not None:
+                before_request()
+            else:
+                time.sleep(random.uniform(0.5, 1.5))
             
             # Make request with timeout and error handling
             try:
@@ -140,6 +224,15 @@ class AadharPanLinkageService:
                                         'details': message
                                     }
                                 
+                                # Definitive not-linked response
+                                if 'not linked' in message.get('desc', '').lower():
+                                    return {
+                                        'is_linked': False,
+                                        'message': message.get('desc'),
+                                        'is_not_linked': True,
+                                        'details': message
+                                    }
+                                
                                 # Rate limiting or temporary error
                                 if (message.get('code') == 'EF00077' or 
                                     'exceeded the limit' in message.get('desc', '').lower()):
@@ -0,0 +1,218 @@
+import re
+import base64
+import hashlib
+import binascii
+
+from config.settings import Config
+from models.document_models import InMemoryDocument
+from utils.file_utils import sniff_document_type, SNIFF_LENGTH
+
+# Media types of the sniffed document formats
+MEDIA_TYPES = {
+    'PDF': 'application/pdf',
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg'
+}
+
+_STR_WHITESPACE = re.compile(r'\s')
+_BYTES_WHITESPACE = re.compile(rb'\s')
+
+# Encoded characters decoded to sniff the type (covers SNIFF_LENGTH bytes)
+_SNIFF_CHARS = -(-SNIFF_LENGTH // 3) * 4 + 4
+_BASE64_TAIL = re.compile(rb'^[A-Za-z0-9+/]*={0,2}$')
+
+
+def _strip_whitespace(encoded):
+    """
+    Remove line breaks and other whitespace from base64 content
+
+    Chunked decoding relies on chunk boundaries falling on 4-character
+    groups, so wrapped input has to be compacted first. Unwrapped input,
+    the common case, is returned as is without copying.
+
+    Args:
+        encoded (str or bytes-like): base64 content
+
+    Returns:
+        str or bytes-like: base64 content without whitespace
+    """
+    if isinstance(encoded, str):
+        if _STR_WHITESPACE.search(encoded):
+            return ''.join(encoded.split())
+        return encoded
+
+    if _BYTES_WHITESPACE.search(encoded):
+        return b''.join(bytes(encoded).split())
+    return encoded
+
+
+def decoded_length(encoded):
+    """
+    Compute the decoded size of base64 content without decoding it
+
+    Args:
+        encoded (str or bytes-like): base64 content without whitespace
+
+    Returns:
+        int: Number of decoded bytes
+
+    Raises:
+        binascii.Error: If the content length is not a multiple of 4
+    """
+    length = len(encoded)
+    if length % 4:
+        raise binascii.Error("Incorrect padding")
+
+    tail = encoded[-2:]
+    if not isinstance(tail, str):
+        tail = bytes(tail).decode('ascii', errors='ignore')
+    return (length // 4) * 3 - tail.count('=')
+
+
+def iter_base64_chunks(encoded, chunk_size=None):
+    """
+    Decode base64 content one bounded chunk at a time
+
+    Args:
+        encoded (str or bytes-like): base64 content without whitespace
+        chunk_size (int, optional): Encoded characters per chunk
+
+    Yields:
+        bytes: Decoded chunk
+    """
+    chunk_size = chunk_size or Config.BASE64_DECODE_CHUNK_SIZE
+    # Keep chunk boundaries on 4-character groups
+    chunk_size = max(chunk_size - chunk_size % 4, 4)
+
+    if not isinstance(encoded, str):
+        encoded = memoryview(encoded)
+
+    for start in range(0, len(encoded), chunk_size):
+        yield binascii.a2b_base64(encoded[start:start + chunk_size])
+
+
+def decode_base64_document(encoded, name="", chunk_size=None):
+    """
+    Decode base64 content into a preallocated in-memory document
+
+    The decoded size is known up front, so chunks are written straight
+    into a single bytearray instead of building intermediate strings.
+    The type is sniffed from the first decoded chunk.
+
+    Args:
+        encoded (str or bytes-like): base64 content
+        name (str, optional): Document name
+        chunk_size (int, optional): Encoded characters per chunk
+
+    Returns:
+        InMemoryDocument: Decoded document backed by a memoryview
+
+    Raises:
+        binascii.Error: If the content is not valid base64
+    """
+    encoded = _strip_whitespace(encoded)
+    buffer = bytearray(decoded_length(encoded))
+    offset = 0
+    file_type = None
+
+    for chunk in iter_base64_chunks(encoded, chunk_size):
+        end = offset + len(chunk)
+        if end > len(buffer):
+            raise binascii.Error("Invalid base64 content")
+        buffer[offset:end] = chunk
+        offset = end
+
+        if file_type is None and offset >= SNIFF_LENGTH:
+            file_type = sniff_document_type(buffer[:SNIFF_LENGTH])
+
+    if offset != len(buffer):
+        # Invalid characters were discarded by the decoder
+        raise binascii.Error("Invalid base64 content")
+
+    if file_type is None:
+        file_type = sniff_document_type(buffer)
+
+    return InMemoryDocument(
+        data=memoryview(buffer),
+        name=name,
+        media_type=MEDIA_TYPES.get(file_type)
+    )
+
+
+def validate_base64_stream(encoded, chunk_size=None):
+    """
+    Check base64 content without materialising the decoded document
+
+    Args:
+        encoded (str or bytes-like): base64 content
+        chunk_size (int, optional): Encoded characters per chunk
+
+    Returns:
+        str: Sniffed document type ('PDF', 'PNG', 'JPEG', 'HTML' or 'Unknown')
+
+    Raises:
+        binascii.Error: If the content is not valid base64
+    """
+    encoded = _strip_whitespace(encoded)
+    expected = decoded_length(encoded)
+    total = 0
+    head = b''
+
+    for chunk in iter_base64_chunks(encoded, chunk_size):
+        if len(head) < SNIFF_LENGTH:
+            head += chunk[:SNIFF_LENGTH - len(head)]
+        total += len(chunk)
+
+    if total != expected:
+        raise binascii.Error("Invalid base64 content")
+
+    return sniff_document_type(head)
+
+
+def sniff_base64_document(encoded):
+    """
+    Sanity-check base64 content from its first and last characters only
+
+    Cheap enough to run before any real work; the full check is still
+    done by validate_base64_stream.
+
+    Args:
+        encoded (str or bytes-like): base64 content
+
+    Returns:
+        str: Sniffed document type ('PDF', 'PNG', 'JPEG', 'HTML' or 'Unknown')
+
+    Raises:
+        binascii.Error: If the content is clearly not base64
+    """
+    head = _strip_whitespace(encoded[:_SNIFF_CHARS * 2])
+    tail = _strip_whitespace(encoded[-_SNIFF_CHARS:])
+    if isinstance(tail, str):
+        tail = tail.encode('ascii', errors='replace')
+
+    group = head[:_SNIFF_CHARS]
+    if len(group) < 4 or not _BASE64_TAIL.match(bytes(tail)):
+        raise binascii.Error("Invalid base64 content")
+
+    decoded = base64.b64decode(group[:len(group) - len(group) % 4], validate=True)
+    return sniff_document_type(decoded)
+
+
+def sha256_base64_stream(encoded, chunk_size=None):
+    """
+    Hash the decoded bytes of base64 content chunk by chunk
+
+    Args:
+        encoded (str or bytes-like): base64 content
+        chunk_size (int, optional): Encoded characters per chunk
+
+    Returns:
+        str: Hex SHA-256 digest of the decoded content
+
+    Raises:
+        binascii.Error: If the content is not valid base64
+    """
+    digest = hashlib.sha256()
+    for chunk in iter_base64_chunks(_strip_whitespace(encoded), chunk_size):
+        digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,79 @@
+import threading
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """
+    Raised when work is abandoned because its request was cancelled
+    """
+
+
+class CancellationToken:
+    """
+    Request-scoped flag that tells outstanding work to stop
+
+    Downloads check the token between chunks and extractions check it
+    before every AI call, so cancelling a request frees its workers at
+    the next checkpoint. Work that is already talking to a remote
+    service is not interrupted; its result is discarded.
+    """
+
+    def __init__(self):
+        """
+        Initialize an uncancelled token
+        """
+        self._event = threading.Event()
+        self._reason = None
+
+    def cancel(self, reason: str):
+        """
+        Cancel the token; the first reason given is kept
+
+        Args:
+            reason (str): Why outstanding work is no longer needed
+        """
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def raise_if_cancelled(self):
+        """
+        Raises:
+            OperationCancelled: If the token has been cancelled
+        """
+        if self._event.is_set():
+            raise OperationCancelled(self._reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the token is cancelled or the timeout expires
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            bool: Whether the token is cancelled
+        """
+        return self._event.wait(timeout)
+
+
+def raise_if_cancelled(cancel_token: Optional[CancellationToken]):
+    """
+    Check an optional token
+
+    Args:
+        cancel_token (CancellationToken, optional): Token to check
+
+    Raises:
+        OperationCancelled: If the token has been cancelled
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
@@ -0,0 +1,395 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qsl
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: the index is only locked within the process
+    fcntl = None
+
+from config.settings import Config
+
+# Query parameters that only carry an S3 request signature
+PRESIGNED_QUERY_PARAMS = {
+    'x-amz-algorithm', 'x-amz-credential', 'x-amz-date', 'x-amz-expires',
+    'x-amz-signedheaders', 'x-amz-signature', 'x-amz-security-token',
+    'awsaccesskeyid', 'signature', 'expires'
+}
+
+
+class DownloadCache:
+    """
+    URL-keyed on-disk cache for downloaded documents
+
+    Entries are served straight from disk while fresh, revalidated with
+    ETag/Last-Modified once stale, and evicted least-recently-used first
+    when the cache grows beyond its byte budget.
+
+    Several processes may share the cache directory. Every index update
+    re-reads the index under an exclusive lock on index.lock, so no
+    process overwrites another's entries. Cache hits only record their
+    access time in memory; the times are merged into the index with the
+    next update, or at most every access_flush_interval seconds.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_bytes=None,
+        default_ttl=None,
+        presigned_ttl=None,
+        access_flush_interval=None
+    ):
+        """
+        Initialize the download cache
+
+        Args:
+            cache_dir (str, optional): Directory holding cached documents
+            max_bytes (int, optional): Total size budget of the cache
+            default_ttl (int, optional): Seconds an entry is served without revalidation
+            presigned_ttl (int, optional): Freshness for pre-signed S3 URLs
+            access_flush_interval (float, optional): Seconds cache hits may
+                go without persisting their access times
+        """
+        self.cache_dir = cache_dir or Config.DOWNLOAD_CACHE_DIR
+        self.max_bytes = max_bytes or Config.DOWNLOAD_CACHE_MAX_BYTES
+        self.default_ttl = default_ttl if default_ttl is not None else Config.DOWNLOAD_CACHE_TTL
+        self.presigned_ttl = presigned_ttl if presigned_ttl is not None else Config.DOWNLOAD_CACHE_PRESIGNED_TTL
+        self.access_flush_interval = (
+            access_flush_interval if access_flush_interval is not None
+            else Config.DOWNLOAD_CACHE_ACCESS_FLUSH_INTERVAL
+        )
+
+        self._lock = threading.RLock()
+        self._index = None
+        self._index_stat = None
+        self._index_path = os.path.join(self.cache_dir, 'index.json')
+        self._lock_path = os.path.join(self.cache_dir, 'index.lock')
+        # Access times of cache hits not yet written to the index
+        self._accessed = {}
+        self._last_flush = time.time()
+
+    @staticmethod
+    def is_presigned_url(url):
+        """
+        Check whether a URL is a pre-signed S3 URL
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            bool: Whether the URL carries an S3 signature
+        """
+        query_keys = {key.lower() for key, _ in parse_qsl(urlparse(url).query)}
+        return 'x-amz-signature' in query_keys or 'signature' in query_keys
+
+    @staticmethod
+    def cache_key(url):
+        """
+        Build the cache key for a URL
+
+        Google Drive links are keyed by file ID and pre-signed S3 URLs by
+        bucket/object path, so re-shared or re-signed links hit the same entry.
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            str: Cache key
+        """
+        if 'drive.google.com' in url:
+            file_id_match = re.search(r'(?:/d/|[?&]id=)([a-zA-Z0-9_-]+)', url)
+            if file_id_match:
+                return hashlib.sha256(f"gdrive:{file_id_match.group(1)}".encode()).hexdigest()
+
+        parsed = urlparse(url)
+        if DownloadCache.is_presigned_url(url):
+            query = sorted(
+                (key, value) for key, value in parse_qsl(parsed.query)
+                if key.lower() not in PRESIGNED_QUERY_PARAMS
+            )
+            canonical = f"s3:{parsed.netloc}{parsed.path}?{query}"
+        else:
+            canonical = url
+
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _presigned_expiry(self, url):
+        """
+        Get the expiry time of an S3 signature, if present
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            float or None: Signature expiry as a UNIX timestamp
+        """
+        params = {key.lower(): value for key, value in parse_qsl(urlparse(url).query)}
+        try:
+            if 'x-amz-date' in params and 'x-amz-expires' in params:
+                signed_at = datetime.strptime(params['x-amz-date'], '%Y%m%dT%H%M%SZ')
+                signed_at = signed_at.replace(tzinfo=timezone.utc).timestamp()
+                return signed_at + int(params['x-amz-expires'])
+            if 'expires' in params:
+                return float(params['expires'])
+        except (ValueError, TypeError):
+            return None
+        return None
+
+    def ttl_for(self, url):
+        """
+        Get the freshness lifetime for a URL
+
+        Pre-signed URLs address immutable uploads, so they stay fresh for
+        presigned_ttl, capped by the lifetime of the signature itself.
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            float: Seconds the entry may be served without revalidation
+        """
+        if not self.is_presigned_url(url):
+            return self.default_ttl
+
+        ttl = self.presigned_ttl
+        expiry = self._presigned_expiry(url)
+        if expiry is not None:
+            ttl = min(ttl, max(expiry - time.time(), 0))
+        return ttl
+
+    def _stat_index(self):
+        try:
+            stat = os.stat(self._index_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load_index(self):
+        """
+        Load the cache index, re-reading it if another process replaced it
+
+        Returns:
+            dict: Cache index keyed by cache key
+        """
+        index_stat = self._stat_index()
+        if self._index is None or index_stat != self._index_stat:
+            try:
+                with open(self._index_path, 'r') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+            self._index_stat = index_stat
+        return self._index
+
+    @contextmanager
+    def _locked_index(self):
+        """
+        Hold the index for a read-modify-write across threads and processes
+
+        Yields:
+            dict: Current cache index with pending access times merged in
+        """
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._lock_path, 'a') as lock_file:
+                if fcntl is not None:
+                    # Released when the lock file is closed
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                index = self._load_index()
+                for key, accessed_at in self._accessed.items():
+                    if key in index:
+                        index[key]['last_access'] = max(index[key].get('last_access', 0), accessed_at)
+                yield index
+
+    def _save_index(self):
+        """
+        Atomically persist the cache index; call within _locked_index
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+        self._index_stat = self._stat_index()
+        self._accessed.clear()
+        self._last_flush = time.time()
+
+    def _data_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def lookup(self, url):
+        """
+        Find the cache entry for a URL
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            dict or None: Cache entry metadata
+        """
+        with self._lock:
+            entry = self._load_index().get(self.cache_key(url))
+            return dict(entry) if entry else None
+
+    def is_fresh(self, entry):
+        """
+        Check whether an entry can be served without revalidation
+
+        Args:
+            entry (dict): Cache entry metadata
+
+        Returns:
+            bool: Whether the entry is still fresh
+        """
+        return entry.get('fresh_until', 0) > time.time()
+
+    def conditional_headers(self, entry):
+        """
+        Build revalidation headers for a stale entry
+
+        Args:
+            entry (dict): Cache entry metadata
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, url):
+        """
+        Read cached content for a URL and mark it as recently used
+
+        Args:
+            url (str): Document URL
+
+        Returns:
+            bytes or None: Cached document content
+        """
+        key = self.cache_key(url)
+        try:
+            with open(self._data_path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.invalidate(url)
+            return None
+
+        # Access times are persisted in batches, not on every hit
+        with self._lock:
+            now = time.time()
+            self._accessed[key] = now
+            flush = now - self._last_flush >= self.access_flush_interval
+
+        if flush:
+            try:
+                with self._locked_index():
+                    self._save_index()
+            except OSError as e:
+                logging.warning(f"Download cache index write failed: {str(e)}")
+
+        return data
+
+    def refresh(self, url):
+        """
+        Extend the freshness of an entry after a 304 Not Modified
+
+        Args:
+            url (str): Document URL
+        """
+        try:
+            with self._locked_index() as index:
+                entry = index.get(self.cache_key(url))
+                if entry:
+                    entry['fresh_until'] = time.time() + self.ttl_for(url)
+                    self._save_index()
+        except OSError as e:
+            logging.warning(f"Download cache index write failed: {str(e)}")
+
+    def store(self, url, data, etag=None, last_modified=None):
+        """
+        Store downloaded content for a URL
+
+        Args:
+            url (str): Document URL
+            data (bytes): Document content
+            etag (str, optional): ETag response header
+            last_modified (str, optional): Last-Modified response header
+        """
+        if len(data) > self.max_bytes:
+            return
+
+        key = self.cache_key(url)
+        now = time.time()
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._data_path(key))
+
+            with self._locked_index() as index:
+                index[key] = {
+                    'size': len(data),
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'fresh_until': now + self.ttl_for(url),
+                    'last_access': now
+                }
+                self._evict()
+                self._save_index()
+
+        except OSError as e:
+            logging.warning(f"Download cache write failed: {str(e)}")
+
+    def invalidate(self, url):
+        """
+        Drop the cache entry for a URL
+
+        Args:
+            url (str): Document URL
+        """
+        key = self.cache_key(url)
+        try:
+            with self._locked_index() as index:
+                if index.pop(key, None) is not None:
+                    self._save_index()
+        except OSError as e:
+            logging.warning(f"Download cache index write failed: {str(e)}")
+        try:
+            os.remove(self._data_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """
+        Evict least-recently-used entries until the byte budget is met;
+        call within _locked_index
+        """
+        index = self._load_index()
+        total_bytes = sum(entry['size'] for entry in index.values())
+
+        for key, entry in sorted(index.items(), key=lambda item: item[1]['last_access']):
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= entry['size']
+            del index[key]
+            try:
+                os.remove(self._data_path(key))
+            except OSError:
+                pass
+
+# Global download cache
+download_cache = DownloadCache()
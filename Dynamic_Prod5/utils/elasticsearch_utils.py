@@ -1,3 +1,5 @@
+import time
+import threading
 from elasticsearch import Elasticsearch
 from utils.logging_utils import logger
 from config.settings import Config
@@ -5,6 +7,10 @@ from config.settings import Config
 class ElasticsearchClient:
     """
     Elasticsearch connection and query management
+    
+    The connection is opened on first use rather than at construction,
+    so building the client never blocks on the cluster. A failed
+    connection is retried at most once per ES_RECONNECT_INTERVAL.
     """
     
     def __init__(self, config=None):
@@ -15,7 +21,29 @@ class ElasticsearchClient:
             config (dict, optional): Custom Elasticsearch configuration
         """
         self.config = config or Config.get_elasticsearch_config()
-        self.client = self._create_client()
+        self._client = None
+        self._last_attempt = None
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """
+        Elasticsearch client, connected on first access
+        
+        Returns:
+            Elasticsearch or None: Connected client, None if unavailable
+        """
+        if self._client is not None:
+            return self._client
+        
+        with self._lock:
+            if self._client is None and (
+                self._last_attempt is None
+                or time.monotonic() - self._last_attempt >= Config.ES_RECONNECT_INTERVAL
+            ):
+                self._last_attempt = time.monotonic()
+                self._client = self._create_client()
+            return self._client
     
     def _create_client(self):
         """
@@ -50,33 +78,94 @@ class ElasticsearchClient:
             list: Matching compliance rules
         """
         try:
-            # Search query with exact service_id match
-            search_query = {
+            return self.search_compliance_rules(service_id)
+        
+        except Exception as e:
+            logger.error(f"Error retrieving compliance rules: {str(e)}")
+            return []
+    
+    def search_compliance_rules(self, service_id):
+        """
+        Retrieve compliance rules for a specific service ID
+        
+        Args:
+            service_id (str): Service identifier
+        
+        Returns:
+            list: Matching compliance rules
+        
+        Raises:
+            ConnectionError: If Elasticsearch is unavailable
+            Exception: Any search error
+        """
+        client = self.client
+        if client is None:
+            raise ConnectionError("Elasticsearch is unavailable")
+        
+        # Search query with exact service_id match
+        search_query = {
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"service_id.keyword": str(service_id)}}
+                    ]
+                }
+            }
+        }
+        
+        # Execute search
+        results = client.search(
+            index=Config.VALIDATION_RULES_INDEX, 
+            body=search_query
+        )
+        
+        # Convert Elasticsearch response to standard list
+        rules = [hit['_source'] for hit in results.body['hits']['hits']]
+        
+        logger.info(f"Retrieved {len(rules)} rules for service ID: {service_id}")
+        
+        return rules
+    
+    def get_compliance_rules_version(self, service_id):
+        """
+        Get a cheap change marker for a service's rule documents
+        
+        Only document metadata is fetched, so this is suitable for polling.
+        
+        Args:
+            service_id (str): Service identifier
+        
+        Returns:
+            tuple: (id, seq_no, primary_term, version) per rule document
+        
+        Raises:
+            ConnectionError: If Elasticsearch is unavailable
+            Exception: Any search error
+        """
+        client = self.client
+        if client is None:
+            raise ConnectionError("Elasticsearch is unavailable")
+        
+        results = client.search(
+            index=Config.VALIDATION_RULES_INDEX,
+            body={
                 "query": {
                     "bool": {
                         "must": [
                             {"term": {"service_id.keyword": str(service_id)}}
                         ]
                     }
-                }
+                },
+                "_source": False,
+                "seq_no_primary_term": True,
+                "version": True
             }
-            
-            # Execute search
-            results = self.client.search(
-                index=Config.VALIDATION_RULES_INDEX, 
-                body=search_query
-            )
-            
-            # Convert Elasticsearch response to standard list
-            rules = [hit['_source'] for hit in results.body['hits']['hits']]
-            
-            logger.info(f"Retrieved {len(rules)} rules for service ID: {service_id}")
-            
-            return rules
+        )
         
-        except Exception as e:
-            logger.error(f"Error retrieving compliance rules: {str(e)}")
-            return []
+        return tuple(sorted(
+            (hit['_id'], hit.get('_seq_no'), hit.get('_primary_term'), hit.get('_version'))
+            for hit in results.body['hits']['hits']
+        ))
     
     def validate_index_exists(self, index_name=None):
         """
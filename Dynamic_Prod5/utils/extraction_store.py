@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from config.settings import Config
+
+
+class ExtractionStore:
+    """
+    Persistent SQLite store of per-application extraction and rule results
+
+    Each application (keyed by application or request id) keeps the
+    request it was last validated with, with every document's content
+    replaced by its extraction fingerprint, the extracted data of every
+    document keyed by that fingerprint and the rule results keyed by a
+    fingerprint of the inputs each rule read. A resubmission reuses the
+    stored results of the documents and rules whose inputs are unchanged.
+    Document content itself is never stored.
+    """
+
+    # Bumped, with a step in _migrate, whenever an existing table changes
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path=None, ttl=None):
+        """
+        Initialize the store; the database is opened on first use
+
+        Args:
+            db_path (str, optional): SQLite database path
+            ttl (int, optional): Seconds an application's results are kept
+        """
+        self.db_path = db_path or Config.EXTRACTION_STORE_PATH
+        self.ttl = ttl or Config.EXTRACTION_STORE_TTL
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """
+        Open the database and create the schema on first use
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS applications ("
+                " application_id TEXT PRIMARY KEY,"
+                " service_id TEXT,"
+                " request TEXT NOT NULL,"
+                " rules_version TEXT,"
+                " verdict TEXT,"
+                " updated_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS document_extractions ("
+                " application_id TEXT NOT NULL,"
+                " slot TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " PRIMARY KEY (application_id, slot));"
+                "CREATE TABLE IF NOT EXISTS rule_results ("
+                " application_id TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " owner TEXT,"
+                " rule_key TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " PRIMARY KEY (application_id, fingerprint));"
+            )
+            self._migrate(self._connection)
+            self._connection.commit()
+        return self._connection
+
+    def _migrate(self, connection):
+        """
+        Bring a store created by an earlier version up to the current schema
+
+        Args:
+            connection (sqlite3.Connection): Database connection
+        """
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            # Version 1 records the director each rule result belongs to
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(rule_results)")}
+            if 'owner' not in columns:
+                connection.execute("ALTER TABLE rule_results ADD COLUMN owner TEXT")
+
+        connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def save(
+        self,
+        application_id: str,
+        service_id: str,
+        request: Dict[str, Any],
+        extractions: Dict[str, Dict[str, Any]],
+        rule_results: Dict[str, Dict[str, Any]],
+        rules_version: Optional[str] = None,
+        verdict: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Replace an application's stored results
+
+        Args:
+            application_id (str): Application or request identifier
+            service_id (str): Service identifier
+            request (dict): Request with document content replaced by fingerprints
+            extractions (dict): 'fingerprint' and extracted 'data' keyed by slot
+            rule_results (dict): 'owner', 'rule_key' and 'result' keyed by rule
+                input fingerprint
+            rules_version (str, optional): Rules version the results were produced with
+            verdict (dict, optional): Overall verdict of the validation
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT INTO applications"
+                        " (application_id, service_id, request, rules_version, verdict, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)"
+                        " ON CONFLICT(application_id) DO UPDATE SET"
+                        " service_id = excluded.service_id, request = excluded.request,"
+                        " rules_version = excluded.rules_version, verdict = excluded.verdict,"
+                        " updated_at = excluded.updated_at",
+                        (application_id, str(service_id), json.dumps(request, default=str), rules_version,
+                         json.dumps(verdict, default=str) if verdict is not None else None, now)
+                    )
+                    connection.execute(
+                        "DELETE FROM document_extractions WHERE application_id = ?", (application_id,)
+                    )
+                    connection.executemany(
+                        "INSERT INTO document_extractions (application_id, slot, fingerprint, result)"
+                        " VALUES (?, ?, ?, ?)",
+                        [
+                            (application_id, slot, entry['fingerprint'], json.dumps(entry['data'], default=str))
+                            for slot, entry in extractions.items()
+                        ]
+                    )
+                    connection.execute(
+                        "DELETE FROM rule_results WHERE application_id = ?", (application_id,)
+                    )
+                    connection.executemany(
+                        "INSERT INTO rule_results (application_id, fingerprint, owner, rule_key, result)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (application_id, fingerprint, entry.get('owner'), entry['rule_key'],
+                             json.dumps(entry['result'], default=str))
+                            for fingerprint, entry in rule_results.items()
+                        ]
+                    )
+                    self._purge(connection, now)
+
+        except sqlite3.Error as e:
+            logging.warning(f"Extraction store write failed: {str(e)}")
+
+    def _purge(self, connection, now):
+        expired = "SELECT application_id FROM applications WHERE updated_at <= ?"
+        cutoff = (now - self.ttl,)
+        connection.execute(f"DELETE FROM document_extractions WHERE application_id IN ({expired})", cutoff)
+        connection.execute(f"DELETE FROM rule_results WHERE application_id IN ({expired})", cutoff)
+        connection.execute("DELETE FROM applications WHERE updated_at <= ?", cutoff)
+
+    def load(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an application's stored results
+
+        Args:
+            application_id (str): Application or request identifier
+
+        Returns:
+            dict or None: 'service_id', 'request', 'rules_version', 'verdict',
+                'updated_at', 'slots' (fingerprint by slot), 'extractions'
+                (extracted data by fingerprint) and 'rule_results'
+                ('owner', 'rule_key' and 'result' by fingerprint)
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT service_id, request, rules_version, verdict, updated_at"
+                    " FROM applications WHERE application_id = ? AND updated_at > ?",
+                    (application_id, time.time() - self.ttl)
+                ).fetchone()
+                if row is None:
+                    return None
+                documents = connection.execute(
+                    "SELECT slot, fingerprint, result FROM document_extractions WHERE application_id = ?",
+                    (application_id,)
+                ).fetchall()
+                rules = connection.execute(
+                    "SELECT fingerprint, owner, rule_key, result FROM rule_results WHERE application_id = ?",
+                    (application_id,)
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Extraction store read failed: {str(e)}")
+            return None
+
+        return {
+            'service_id': row[0],
+            'request': json.loads(row[1]),
+            'rules_version': row[2],
+            'verdict': json.loads(row[3]) if row[3] else None,
+            'updated_at': datetime.fromtimestamp(row[4]).isoformat(),
+            'slots': {slot: fingerprint for slot, fingerprint, _ in documents},
+            'extractions': {fingerprint: json.loads(result) for _, fingerprint, result in documents},
+            'rule_results': {
+                fingerprint: {'owner': owner, 'rule_key': rule_key, 'result': json.loads(result)}
+                for fingerprint, owner, rule_key, result in rules
+            }
+        }
+
+    def application_ids(self, service_id: Optional[str] = None) -> List[str]:
+        """
+        List the applications with stored results
+
+        Args:
+            service_id (str, optional): Only applications of this service
+
+        Returns:
+            list: Application identifiers, least recently validated first
+        """
+        query = "SELECT application_id FROM applications WHERE updated_at > ?"
+        params = [time.time() - self.ttl]
+        if service_id is not None:
+            query += " AND service_id = ?"
+            params.append(str(service_id))
+
+        try:
+            with self._lock:
+                rows = self._connect().execute(query + " ORDER BY updated_at", params).fetchall()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Extraction store read failed: {str(e)}")
+            return []
+
+        return [row[0] for row in rows]
+
+# Global extraction store
+extraction_store = ExtractionStore()
@@ -1,13 +1,197 @@
+import re
 import requests
 import logging
 import json
 from urllib.parse import urlparse
 
+from config.settings import Config
+from utils.download_cache import download_cache
+from utils.cancellation import raise_if_cancelled
+
+# Leading byte signatures of the document formats accepted for download
+DOCUMENT_SIGNATURES = {
+    'PDF': b'%PDF-',
+    'PNG': b'\x89PNG\r\n\x1a\n',
+    'JPEG': b'\xff\xd8\xff'
+}
+
+# Markers of HTML/XML bodies (e.g. Google Drive interstitial pages)
+HTML_MARKERS = (b'<!doctype', b'<html', b'<head', b'<body', b'<?xml')
+
+# Number of leading bytes needed to recognise any supported signature
+SNIFF_LENGTH = max(len(sig) for sig in DOCUMENT_SIGNATURES.values())
+
+
+def sniff_document_type(head):
+    """
+    Identify a document type from its leading bytes
+
+    Args:
+        head (bytes): First bytes of the document
+
+    Returns:
+        str: 'PDF', 'PNG', 'JPEG', 'HTML' or 'Unknown'
+    """
+    head = bytes(head[:512])
+    for name, signature in DOCUMENT_SIGNATURES.items():
+        if head.startswith(signature):
+            return name
+
+    if head.lstrip().lower().startswith(HTML_MARKERS):
+        return 'HTML'
+
+    return 'Unknown'
+
+
 class DocumentDownloader:
     """
     Utility for downloading and validating documents
     """
     
+    @staticmethod
+    def resolve_download_url(url):
+        """
+        Convert share links into direct download links
+        
+        Args:
+            url (str): Document URL
+        
+        Returns:
+            str: URL that serves the raw document
+        """
+        if 'drive.google.com' in url:
+            file_id_match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
+            if file_id_match:
+                return f'https://drive.google.com/uc?export=download&id={file_id_match.group(1)}'
+        
+        return url
+    
+    @staticmethod
+    def stream_download(url, headers=None, timeout=30, max_sizes=None, use_cache=True, cancel_token=None):
+        """
+        Stream a document into a bounded buffer
+        
+        The first bytes are sniffed for a PDF/PNG/JPEG signature and the
+        download is aborted as soon as the body turns out to be HTML,
+        an unsupported format or larger than the limit for its type.
+        Completed downloads go through the on-disk download cache and
+        stale entries are revalidated with ETag/Last-Modified.
+        
+        Args:
+            url (str): Document URL
+            headers (dict, optional): Request headers
+            timeout (int): Request timeout in seconds
+            max_sizes (dict, optional): Maximum bytes per file type
+            use_cache (bool): Whether to use the download cache
+            cancel_token (CancellationToken, optional): Checked before the
+                request and between chunks
+        
+        Returns:
+            bytes or None: Document content
+        
+        Raises:
+            OperationCancelled: If the token is cancelled mid-download
+        """
+        max_sizes = max_sizes or Config.get_download_size_limits()
+        largest_allowed = max(max_sizes.values())
+        headers = dict(headers or {})
+        
+        cache = download_cache if use_cache and Config.DOWNLOAD_CACHE_ENABLED else None
+        cache_entry = cache.lookup(url) if cache else None
+        
+        if cache_entry:
+            if cache.is_fresh(cache_entry):
+                cached_data = cache.read(url)
+                if cached_data is not None:
+                    logging.info(f"Serving document from download cache: {url}")
+                    return cached_data
+            headers.update(cache.conditional_headers(cache_entry))
+        
+        raise_if_cancelled(cancel_token)
+        response = requests.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=True,
+            stream=True
+        )
+        
+        try:
+            if response.status_code == 304 and cache_entry:
+                cached_data = cache.read(url)
+                if cached_data is not None:
+                    cache.refresh(url)
+                    logging.info(f"Download cache entry revalidated: {url}")
+                    return cached_data
+                
+                # Cached body vanished (read() dropped the entry); fetch it again
+                response.close()
+                return DocumentDownloader.stream_download(
+                    url, headers={key: value for key, value in headers.items()
+                                  if key not in ('If-None-Match', 'If-Modified-Since')},
+                    timeout=timeout, max_sizes=max_sizes, cancel_token=cancel_token
+                )
+            
+            if response.status_code not in [200, 206]:  # 206 is Partial Content for range requests
+                logging.error(f"Failed to download document. Status: {response.status_code}")
+                return None
+            
+            content_type = response.headers.get('Content-Type', '').lower()
+            if 'text/html' in content_type:
+                logging.error(f"Download rejected: HTML page served for {url}")
+                return None
+            
+            # Reject before reading the body when the server announces the size
+            declared_length = response.headers.get('Content-Length')
+            declared_length = int(declared_length) if declared_length and declared_length.isdigit() else None
+            if declared_length and declared_length > largest_allowed:
+                logging.error(f"Download rejected: {declared_length} bytes exceeds {largest_allowed} bytes limit")
+                return None
+            
+            buffer = bytearray()
+            file_type = None
+            size_limit = largest_allowed
+            
+            for chunk in response.iter_content(chunk_size=Config.DOWNLOAD_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                raise_if_cancelled(cancel_token)
+                buffer.extend(chunk)
+                
+                if file_type is None and len(buffer) >= SNIFF_LENGTH:
+                    file_type = sniff_document_type(buffer)
+                    if file_type not in max_sizes:
+                        logging.error(f"Download rejected: unsupported content ({file_type}) for {url}")
+                        return None
+                    
+                    size_limit = max_sizes[file_type]
+                    if declared_length and declared_length > size_limit:
+                        logging.error(f"Download rejected: {file_type} of {declared_length} bytes exceeds {size_limit} bytes limit")
+                        return None
+                
+                if len(buffer) > size_limit:
+                    logging.error(f"Download rejected: {file_type or 'document'} exceeds {size_limit} bytes limit")
+                    return None
+            
+            # Bodies shorter than the sniff length never got classified
+            if file_type is None and sniff_document_type(buffer) not in max_sizes:
+                logging.error(f"Download rejected: unsupported or empty content for {url}")
+                return None
+            
+            document_data = bytes(buffer)
+            if use_cache and Config.DOWNLOAD_CACHE_ENABLED:
+                download_cache.store(
+                    url,
+                    document_data,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+            
+            return document_data
+        
+        finally:
+            response.close()
+    
     @staticmethod
     def download_document(url, timeout=30):
         """
@@ -37,19 +221,11 @@ class DocumentDownloader:
                 headers["Range"] = "bytes=0-"
             
             # Download document
-            response = requests.get(
+            return DocumentDownloader.stream_download(
                 url, 
                 headers=headers, 
-                timeout=timeout,
-                stream=True
+                timeout=timeout
             )
-            
-            # Check response
-            if response.status_code not in [200, 206]:  # 206 is Partial Content for range requests
-                logging.error(f"Failed to download document. Status: {response.status_code}")
-                return None
-            
-            return response.content
         
         except requests.exceptions.RequestException as e:
             logging.error(f"Download error: {str(e)}")
@@ -0,0 +1,131 @@
+import re
+from typing import Dict, Any, Optional
+
+# Verhoeff dihedral group multiplication table
+VERHOEFF_MULTIPLICATION = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 2, 3, 4, 0, 6, 7, 8, 9, 5),
+    (2, 3, 4, 0, 1, 7, 8, 9, 5, 6),
+    (3, 4, 0, 1, 2, 8, 9, 5, 6, 7),
+    (4, 0, 1, 2, 3, 9, 5, 6, 7, 8),
+    (5, 9, 8, 7, 6, 0, 4, 3, 2, 1),
+    (6, 5, 9, 8, 7, 1, 0, 4, 3, 2),
+    (7, 6, 5, 9, 8, 2, 1, 0, 4, 3),
+    (8, 7, 6, 5, 9, 3, 2, 1, 0, 4),
+    (9, 8, 7, 6, 5, 4, 3, 2, 1, 0)
+)
+
+# Verhoeff position permutation table
+VERHOEFF_PERMUTATION = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 5, 7, 6, 2, 8, 3, 0, 9, 4),
+    (5, 8, 0, 3, 7, 9, 6, 1, 4, 2),
+    (8, 9, 1, 6, 0, 4, 3, 5, 2, 7),
+    (9, 4, 5, 3, 1, 2, 7, 0, 6, 8),
+    (4, 2, 8, 6, 5, 7, 3, 9, 0, 1),
+    (2, 7, 9, 3, 8, 0, 6, 4, 1, 5),
+    (7, 0, 4, 6, 9, 1, 3, 2, 5, 8)
+)
+
+# PAN 4th character: holder entity type
+PAN_ENTITY_TYPES = {
+    'P': 'Individual',
+    'C': 'Company',
+    'H': 'Hindu Undivided Family',
+    'F': 'Firm',
+    'A': 'Association of Persons',
+    'T': 'Trust',
+    'B': 'Body of Individuals',
+    'L': 'Local Authority',
+    'J': 'Artificial Juridical Person',
+    'G': 'Government'
+}
+
+PAN_PATTERN = re.compile(r'^[A-Z]{5}\d{4}[A-Z]$')
+
+
+def verhoeff_valid(number: str) -> bool:
+    """
+    Check the Verhoeff check digit of a numeric string
+
+    Args:
+        number (str): Digits, check digit last
+
+    Returns:
+        bool: Whether the check digit is correct
+    """
+    checksum = 0
+    for position, digit in enumerate(reversed(number)):
+        checksum = VERHOEFF_MULTIPLICATION[checksum][VERHOEFF_PERMUTATION[position % 8][int(digit)]]
+    return checksum == 0
+
+
+def validate_aadhar_number(aadhar_number: Optional[str]) -> Dict[str, Any]:
+    """
+    Validate an Aadhaar number offline
+
+    Aadhaar numbers are 12 digits, never start with 0 or 1 and end in a
+    Verhoeff check digit, so most single-digit misreads are caught here.
+
+    Args:
+        aadhar_number (str): Aadhaar number, spaces allowed
+
+    Returns:
+        dict: 'valid', normalised 'number' and an 'error' message if invalid
+    """
+    digits = re.sub(r'\D', '', aadhar_number or '')
+
+    if len(digits) != 12:
+        return {"valid": False, "number": digits, "error": "Aadhar number must have 12 digits"}
+
+    if digits[0] in '01':
+        return {"valid": False, "number": digits, "error": "Aadhar number cannot start with 0 or 1"}
+
+    if not verhoeff_valid(digits):
+        return {"valid": False, "number": digits, "error": "Aadhar number failed checksum validation"}
+
+    return {"valid": True, "number": digits, "error": None}
+
+
+def validate_pan_number(
+    pan_number: Optional[str],
+    name: Optional[str] = None,
+    expected_entity_type: Optional[str] = 'P'
+) -> Dict[str, Any]:
+    """
+    Validate the structure of a PAN offline
+
+    Checks the AAAAA9999A format, the entity-type 4th character and, for
+    individuals, that the 5th character is the initial of the surname
+    (or, for names without a surname, of another name part).
+
+    Args:
+        pan_number (str): PAN
+        name (str, optional): Holder name as extracted from the card
+        expected_entity_type (str, optional): Required 4th character, None for any
+
+    Returns:
+        dict: 'valid', normalised 'number', 'entity_type' and an 'error' message if invalid
+    """
+    pan = re.sub(r'\s', '', pan_number or '').upper()
+
+    if not PAN_PATTERN.match(pan):
+        return {"valid": False, "number": pan, "entity_type": None, "error": "Invalid PAN number format"}
+
+    entity_code = pan[3]
+    entity_type = PAN_ENTITY_TYPES.get(entity_code)
+    if entity_type is None:
+        return {"valid": False, "number": pan, "entity_type": None,
+                "error": f"Invalid PAN entity type character '{entity_code}'"}
+
+    if expected_entity_type and entity_code != expected_entity_type:
+        return {"valid": False, "number": pan, "entity_type": entity_type,
+                "error": f"PAN belongs to a {entity_type}, expected {PAN_ENTITY_TYPES[expected_entity_type]}"}
+
+    if name and entity_code == 'P':
+        name_parts = [part for part in re.split(r'[^A-Za-z]+', name.upper()) if part]
+        if name_parts and pan[4] != name_parts[-1][0] and pan[4] not in {part[0] for part in name_parts}:
+            return {"valid": False, "number": pan, "entity_type": entity_type,
+                    "error": f"PAN 5th character '{pan[4]}' does not match the holder's surname initial"}
+
+    return {"valid": True, "number": pan, "entity_type": entity_type, "error": None}
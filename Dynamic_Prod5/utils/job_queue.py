@@ -0,0 +1,341 @@
+import os
+import json
+import time
+import uuid
+import base64
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import Config
+from models.document_models import InMemoryDocument
+
+# Validation job states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+def _encode_value(value):
+    # In-memory uploads are queued as the base64 content the API accepts
+    if isinstance(value, InMemoryDocument):
+        return base64.b64encode(bytes(value.data)).decode('ascii')
+    return str(value)
+
+
+class ValidationJobQueue:
+    """
+    Durable SQLite queue of validation jobs
+
+    The database runs in WAL mode, so the API process can submit and poll
+    while worker processes claim and finish jobs. A worker claims a job
+    under a lease that it renews while the job runs; a job whose lease
+    runs out, because its worker crashed or was stopped, is claimed again
+    by the next free worker, up to JOB_MAX_ATTEMPTS times.
+
+    Every document extracted for a job is checkpointed under the job id
+    as soon as it finishes, so a resumed job reuses the extractions of
+    the previous attempt instead of repeating their AI calls.
+    """
+
+    def __init__(self, db_path=None, lease=None, max_attempts=None, ttl=None):
+        """
+        Initialize the queue; the database is opened on first use
+
+        Args:
+            db_path (str, optional): SQLite database path
+            lease (float, optional): Seconds a claimed job stays with its worker
+                without a renewal
+            max_attempts (int, optional): Claims before a job is failed
+            ttl (int, optional): Seconds finished jobs are kept
+        """
+        self.db_path = db_path or Config.JOB_QUEUE_PATH
+        self.lease = lease or Config.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        self.ttl = ttl or Config.JOB_RESULTS_TTL
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """
+        Open the database and create the schema on first use
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " state TEXT NOT NULL,"
+                " payload TEXT,"
+                " result TEXT,"
+                " error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " worker TEXT,"
+                " lease_expires REAL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, created_at);"
+                "CREATE TABLE IF NOT EXISTS job_documents ("
+                " job_id TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " PRIMARY KEY (job_id, fingerprint));"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def submit(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Queue a validation request
+
+        Args:
+            payload (dict): Validation input, as accepted by validate_document
+
+        Returns:
+            str or None: Job identifier, None if the job could not be stored
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT INTO jobs (job_id, state, payload, created_at, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (job_id, QUEUED, json.dumps(payload, default=_encode_value), now, now)
+                    )
+                    self._purge(connection, now)
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue write failed: {str(e)}")
+            return None
+
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any], int]]:
+        """
+        Claim the oldest queued job, or a job whose worker stopped renewing it
+
+        Args:
+            worker_id (str): Identifier of the claiming worker
+
+        Returns:
+            tuple or None: (job_id, payload, attempt number), None if no
+                job is available
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    exhausted = connection.execute(
+                        "UPDATE jobs SET state = ?, payload = NULL, worker = NULL, updated_at = ?,"
+                        " error = 'Validation was interrupted ' || attempts || ' times'"
+                        " WHERE state = ? AND lease_expires <= ? AND attempts >= ?",
+                        (FAILED, now, RUNNING, now, self.max_attempts)
+                    )
+                    if exhausted.rowcount:
+                        connection.execute(
+                            "DELETE FROM job_documents WHERE job_id IN"
+                            " (SELECT job_id FROM jobs WHERE state = ? AND result IS NULL)",
+                            (FAILED,)
+                        )
+                    # A single UPDATE claims atomically across processes
+                    row = connection.execute(
+                        "UPDATE jobs SET state = ?, worker = ?, attempts = attempts + 1,"
+                        " lease_expires = ?, updated_at = ?"
+                        " WHERE job_id = ("
+                        "  SELECT job_id FROM jobs"
+                        "  WHERE state = ? OR (state = ? AND lease_expires <= ?)"
+                        "  ORDER BY created_at LIMIT 1)"
+                        " RETURNING job_id, payload, attempts",
+                        (RUNNING, worker_id, now + self.lease, now, QUEUED, RUNNING, now)
+                    ).fetchone()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue claim failed: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend the lease of a running job
+
+        Args:
+            job_id (str): Job identifier
+            worker_id (str): Worker holding the job
+
+        Returns:
+            bool: False if the job is no longer held by the worker
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    cursor = connection.execute(
+                        "UPDATE jobs SET lease_expires = ?, updated_at = ?"
+                        " WHERE job_id = ? AND worker = ? AND state = ?",
+                        (now + self.lease, now, job_id, worker_id, RUNNING)
+                    )
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue write failed: {str(e)}")
+            return True
+
+        return cursor.rowcount > 0
+
+    def _finish(self, job_id: str, worker_id: str, state: str, result=None, error=None):
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    cursor = connection.execute(
+                        "UPDATE jobs SET state = ?, result = ?, error = ?, payload = NULL,"
+                        " lease_expires = NULL, updated_at = ?"
+                        " WHERE job_id = ? AND worker = ? AND state = ?",
+                        (state, json.dumps(result, default=str) if result is not None else None,
+                         error, now, job_id, worker_id, RUNNING)
+                    )
+                    # A worker that lost the lease leaves the checkpoints
+                    # to the job's new holder
+                    if cursor.rowcount > 0:
+                        connection.execute("DELETE FROM job_documents WHERE job_id = ?", (job_id,))
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue write failed: {str(e)}")
+            return
+
+        if cursor.rowcount == 0:
+            logging.warning(f"Result of job {job_id} dropped: {worker_id} no longer holds it")
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        """
+        Store the result of a finished job
+
+        Args:
+            job_id (str): Job identifier
+            worker_id (str): Worker holding the job
+            result (dict): Job result
+        """
+        self._finish(job_id, worker_id, COMPLETED, result=result)
+
+    def fail(self, job_id: str, worker_id: str, error: str):
+        """
+        Record that a job failed
+
+        Args:
+            job_id (str): Job identifier
+            worker_id (str): Worker holding the job
+            error (str): Error description
+        """
+        self._finish(job_id, worker_id, FAILED, error=error)
+
+    def checkpoint_document(self, job_id: str, fingerprint: str, result: Dict[str, Any]):
+        """
+        Keep a finished document extraction of a running job
+
+        Args:
+            job_id (str): Job identifier
+            fingerprint (str): Content fingerprint of the extraction
+            result (dict): Extracted data
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO job_documents (job_id, fingerprint, result) VALUES (?, ?, ?)",
+                        (job_id, fingerprint, json.dumps(result, default=str))
+                    )
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue write failed: {str(e)}")
+
+    def documents(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up the checkpointed extractions of a job
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            dict: Extracted data keyed by content fingerprint
+        """
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT fingerprint, result FROM job_documents WHERE job_id = ?", (job_id,)
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue read failed: {str(e)}")
+            return {}
+
+        return {fingerprint: json.loads(result) for fingerprint, result in rows}
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job
+
+        Args:
+            job_id (str): Job identifier
+            include_result (bool): Whether to include the stored result
+
+        Returns:
+            dict or None: 'job_id', 'state', 'attempts', 'documents_checkpointed',
+                'error', 'created_at', 'updated_at' and, if requested, 'result'
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT state, attempts, error, created_at, updated_at, result FROM jobs WHERE job_id = ?",
+                    (job_id,)
+                ).fetchone()
+                documents = connection.execute(
+                    "SELECT COUNT(*) FROM job_documents WHERE job_id = ?", (job_id,)
+                ).fetchone()[0]
+
+        except sqlite3.Error as e:
+            logging.warning(f"Job queue read failed: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+        job = {
+            'job_id': job_id,
+            'state': row[0],
+            'attempts': row[1],
+            'documents_checkpointed': documents,
+            'error': row[2],
+            'created_at': datetime.fromtimestamp(row[3]).isoformat(),
+            'updated_at': datetime.fromtimestamp(row[4]).isoformat()
+        }
+        if include_result:
+            job['result'] = json.loads(row[5]) if row[5] else None
+        return job
+
+    def _purge(self, connection, now):
+        connection.execute(
+            "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at <= ?",
+            (COMPLETED, FAILED, now - self.ttl)
+        )
+
+# Global validation job queue
+validation_job_queue = ValidationJobQueue()
@@ -0,0 +1,457 @@
+import re
+import json
+import mmap
+import base64
+import binascii
+import tempfile
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+from config.settings import Config
+from models.document_models import InMemoryDocument
+from utils.file_utils import sniff_document_type, SNIFF_LENGTH
+from utils.base64_stream import MEDIA_TYPES
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_INLINE_WHITESPACE = re.compile(r'[ \t\r]*')
+_STRING_RUN = re.compile(r'[^"\\\n]*')
+_ESCAPE = re.compile(r'\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})')
+_SCALAR = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_BASE64_WHITESPACE = (' ', '\n', '\r', '\t')
+
+
+class JSONStreamError(ValueError):
+    """
+    Malformed JSON in a stream
+    """
+
+
+class Base64Spill:
+    """
+    base64 text decoded incrementally into a memory-mapped scratch file
+
+    The decoded document lives in an anonymous temporary file, so its
+    pages belong to the page cache rather than the process heap and the
+    file disappears once the document is released.
+    """
+
+    def __init__(self, name: str = "", scratch_dir: Optional[str] = None):
+        """
+        Initialize the spill
+
+        Args:
+            name (str, optional): Document name
+            scratch_dir (str, optional): Directory for the scratch file
+                (defaults to Config.JSON_SPILL_DIR, or the system temp directory)
+        """
+        self.name = name
+        self.error = None
+        self._file = tempfile.TemporaryFile(dir=scratch_dir or Config.JSON_SPILL_DIR or None)
+        self._carry = ''
+        self._padded = False
+        self._head = b''
+        self._size = 0
+
+    def write(self, text: str):
+        """
+        Decode the next piece of base64 text
+
+        Args:
+            text (str): base64 text, whitespace allowed
+        """
+        if self.error is not None:
+            return
+
+        if any(char in text for char in _BASE64_WHITESPACE):
+            text = ''.join(text.split())
+        text = self._carry + text
+        # Keep decoding on 4-character groups
+        usable = len(text) - len(text) % 4
+        self._carry = text[usable:]
+        if not usable:
+            return
+
+        try:
+            if self._padded:
+                raise binascii.Error("Invalid base64 content")
+            group = text[:usable]
+            decoded = base64.b64decode(group, validate=True)
+        except (binascii.Error, ValueError) as e:
+            self._fail(str(e))
+            return
+
+        self._padded = group.endswith('=')
+        if len(self._head) < SNIFF_LENGTH:
+            self._head += decoded[:SNIFF_LENGTH - len(self._head)]
+        self._file.write(decoded)
+        self._size += len(decoded)
+
+    def _fail(self, message: str):
+        self.error = message
+        self.discard()
+
+    def discard(self):
+        """
+        Drop the scratch file
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def finish(self) -> Optional[InMemoryDocument]:
+        """
+        Map the decoded document
+
+        Returns:
+            InMemoryDocument or None: Document backed by the scratch file,
+                None if the text was not valid base64
+        """
+        if self.error is None and self._carry:
+            self._fail("Incorrect padding")
+        if self.error is not None:
+            return None
+
+        media_type = MEDIA_TYPES.get(sniff_document_type(self._head))
+        if not self._size:
+            self.discard()
+            return InMemoryDocument(data=b'', name=self.name, media_type=media_type)
+
+        self._file.flush()
+        mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # The mapping keeps the file's pages after the file is closed
+        self.discard()
+        return InMemoryDocument(data=memoryview(mapping), name=self.name, media_type=media_type)
+
+
+class StreamingJSONReader:
+    """
+    Read JSON values one at a time from a text stream
+
+    The stream is read in bounded chunks, so a file of any size can be
+    read value by value: JSON lines, or whitespace-separated documents. A
+    string longer than the spill threshold is taken to be a base64
+    document and decoded straight into a memory-mapped scratch file
+    while it is read; it is returned as an InMemoryDocument named after
+    its key. Memory use is therefore bounded by the chunk size and the
+    small fields of the current value, whatever the size of the stream.
+
+    A malformed value is reported with its line and the reader resumes on
+    the next line, as a JSON lines reader would.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        spill_threshold: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        scratch_dir: Optional[str] = None
+    ):
+        """
+        Initialize the reader
+
+        Args:
+            stream (file): Text stream
+            spill_threshold (int, optional): Characters above which a string
+                is spilled (defaults to Config.JSON_SPILL_THRESHOLD)
+            chunk_size (int, optional): Characters read at a time (defaults
+                to Config.JSON_READ_CHUNK_SIZE)
+            scratch_dir (str, optional): Directory for spilled documents
+        """
+        self.stream = stream
+        self.spill_threshold = spill_threshold or Config.JSON_SPILL_THRESHOLD
+        self.chunk_size = chunk_size or Config.JSON_READ_CHUNK_SIZE
+        self.scratch_dir = scratch_dir
+
+        self.line = 1
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+        self._spill_errors = []
+
+    def __iter__(self) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """
+        Yields:
+            tuple: (line the value starts on, value, error message or None)
+        """
+        while self._peek():
+            line = self.line
+            self._spill_errors = []
+            try:
+                value = self._value("")
+                if not self._rest_of_line_blank():
+                    self._error("Extra data")
+            except JSONStreamError as e:
+                self._skip_line()
+                yield line, None, str(e)
+                continue
+
+            if self._spill_errors:
+                yield line, None, "; ".join(self._spill_errors)
+            else:
+                yield line, value, None
+
+    def _fill(self) -> bool:
+        """
+        Read the next chunk, dropping the consumed part of the buffer
+
+        Returns:
+            bool: False at the end of the stream
+        """
+        if self._eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """
+        Skip whitespace
+
+        Returns:
+            str: Next character, '' at the end of the stream
+        """
+        while True:
+            end = _WHITESPACE.match(self._buffer, self._pos).end()
+            self.line += self._buffer.count('\n', self._pos, end)
+            self._pos = end
+            if end < len(self._buffer):
+                return self._buffer[end]
+            if not self._fill():
+                return ''
+
+    def _rest_of_line_blank(self) -> bool:
+        while True:
+            self._pos = _INLINE_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos] == '\n'
+            if not self._fill():
+                return True
+
+    def _skip_line(self):
+        while True:
+            newline = self._buffer.find('\n', self._pos)
+            if newline >= 0:
+                self._pos = newline + 1
+                self.line += 1
+                return
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return
+
+    def _error(self, message: str):
+        raise JSONStreamError(
+            f"Invalid JSON: {message}: line {self.line} (char {self._offset + self._pos})"
+        )
+
+    def _value(self, key: str) -> Any:
+        char = self._peek()
+        if char == '{':
+            return self._object()
+        if char == '[':
+            return self._array(key)
+        if char == '"':
+            self._pos += 1
+            return self._string(key)
+        if not char:
+            self._error("Expecting value")
+        return self._scalar()
+
+    def _object(self) -> dict:
+        self._pos += 1
+        result = {}
+        if self._peek() == '}':
+            self._pos += 1
+            return result
+
+        while True:
+            if self._peek() != '"':
+                self._error("Expecting property name enclosed in double quotes")
+            self._pos += 1
+            key = self._string("", spill=False)
+            if self._peek() != ':':
+                self._error("Expecting ':' delimiter")
+            self._pos += 1
+            result[key] = self._value(key)
+
+            char = self._peek()
+            if char == '}':
+                self._pos += 1
+                return result
+            if char != ',':
+                self._error("Expecting ',' delimiter")
+            self._pos += 1
+
+    def _array(self, key: str) -> list:
+        self._pos += 1
+        result = []
+        if self._peek() == ']':
+            self._pos += 1
+            return result
+
+        while True:
+            result.append(self._value(key))
+            char = self._peek()
+            if char == ']':
+                self._pos += 1
+                return result
+            if char != ',':
+                self._error("Expecting ',' delimiter")
+            self._pos += 1
+
+    def _scalar(self) -> Any:
+        # A token may continue in the next chunk
+        while len(self._buffer) - self._pos < 64 and self._fill():
+            pass
+        match = _SCALAR.match(self._buffer, self._pos)
+        while match is not None and match.end() == len(self._buffer) and self._fill():
+            match = _SCALAR.match(self._buffer, self._pos)
+        if match is None:
+            self._error("Expecting value")
+
+        token = match.group()
+        self._pos = match.end()
+        if token in _LITERALS:
+            return _LITERALS[token]
+        return json.loads(token)
+
+    def _string_run_end(self) -> int:
+        """
+        Find the end of the unescaped characters at the current position
+
+        Strings may be megabytes long and escape-heavy (base64 with \\/),
+        so each run is scanned once, stopping at the first character that
+        ends it; a raw newline ends the run, since a string cannot span
+        lines. Other control characters are rejected when the string is
+        decoded.
+
+        Returns:
+            int: Position of the next quote, backslash or newline, or the
+                end of the buffer
+        """
+        return _STRING_RUN.match(self._buffer, self._pos).end()
+
+    def _decode_string(self, parts: list) -> str:
+        """
+        Decode the escapes of consecutive string pieces
+
+        Args:
+            parts (list): Raw pieces, each a run or a whole escape
+
+        Returns:
+            str: Decoded text
+        """
+        try:
+            return json.loads('"' + ''.join(parts) + '"')
+        except json.JSONDecodeError:
+            self._error("Invalid control character")
+
+    def _string(self, key: str, spill: bool = True) -> Any:
+        """
+        Read a string whose opening quote has been consumed
+
+        Args:
+            key (str): Key the string belongs to, names a spilled document
+            spill (bool): Whether an oversized string may be spilled
+
+        Returns:
+            str or InMemoryDocument or None: String, spilled document, or
+                None if an oversized string was not valid base64
+        """
+        parts = []
+        size = 0
+        spilled = None
+        try:
+            while True:
+                end = self._string_run_end()
+                if end > self._pos:
+                    piece = self._buffer[self._pos:end]
+                    self._pos = end
+                else:
+                    if end == len(self._buffer):
+                        if not self._fill():
+                            self._error("Unterminated string")
+                        continue
+
+                    char = self._buffer[end]
+                    if char == '"':
+                        self._pos = end + 1
+                        break
+                    if char != '\\':
+                        self._error("Unterminated string")
+                    # An escape may continue in the next chunk
+                    if len(self._buffer) - end < 6 and self._fill():
+                        continue
+
+                    match = _ESCAPE.match(self._buffer, self._pos)
+                    if match is None:
+                        self._error("Invalid \\escape")
+                    self._pos = match.end()
+                    piece = match.group()
+
+                parts.append(piece)
+                size += len(piece)
+                if size > self.spill_threshold:
+                    if spilled is None:
+                        if not spill:
+                            self._error("Property name too long")
+                        spilled = Base64Spill(key, self.scratch_dir)
+                    # Escapes are decoded a spill_threshold at a time, not one by one
+                    spilled.write(self._decode_string(parts))
+                    parts = []
+                    size = 0
+
+            if spilled is None:
+                return self._decode_string(parts)
+            if parts:
+                spilled.write(self._decode_string(parts))
+
+        except JSONStreamError:
+            if spilled is not None:
+                spilled.discard()
+            raise
+
+        document = spilled.finish()
+        if document is None:
+            self._spill_errors.append(f"Invalid base64 content in {key or 'a large field'}: {spilled.error}")
+        return document
+
+
+def iter_json_values(stream: TextIO, **kwargs) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Read JSON values one at a time from a text stream
+
+    Args:
+        stream (file): Text stream
+        **kwargs: StreamingJSONReader options
+
+    Returns:
+        iterator: (line, value, error message or None) per value
+    """
+    return iter(StreamingJSONReader(stream, **kwargs))
+
+
+def read_json_file(file_path: str, **kwargs) -> Any:
+    """
+    Read the first JSON value of a file, spilling large base64 fields
+
+    Args:
+        file_path (str): Path to the JSON file
+        **kwargs: StreamingJSONReader options
+
+    Returns:
+        Any: Parsed value
+
+    Raises:
+        JSONStreamError: If the file holds no valid JSON value
+    """
+    with open(file_path, 'r') as file:
+        for _, value, error in StreamingJSONReader(file, **kwargs):
+            if error:
+                raise JSONStreamError(error)
+            return value
+    raise JSONStreamError("Invalid JSON: Expecting value: line 1 (char 0)")
@@ -0,0 +1,238 @@
+import os
+import hmac
+import json
+import time
+import hashlib
+import logging
+import secrets
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+
+from config.settings import Config
+
+# Linkage outcomes that may be cached
+LINKED = 'linked'
+NOT_LINKED = 'not_linked'
+INCONCLUSIVE = 'inconclusive'
+
+
+class LinkageCache:
+    """
+    Persistent SQLite cache of Aadhar-PAN linkage results
+
+    Entries are keyed by an HMAC-SHA256 of the number pair under a
+    secret salt, so Aadhar and PAN numbers are never written to disk.
+    Each outcome has its own TTL; expired and least-recently-used
+    entries are evicted once the cache exceeds its entry budget.
+    """
+
+    def __init__(self, db_path=None, salt=None, ttls=None, max_entries=None):
+        """
+        Initialize the cache; the database is opened on first use
+
+        Args:
+            db_path (str, optional): SQLite database path
+            salt (str, optional): HMAC key; generated and kept beside the database if unset
+            ttls (dict, optional): TTL in seconds keyed by outcome
+            max_entries (int, optional): Maximum cached pairs
+        """
+        self.db_path = db_path or Config.LINKAGE_CACHE_PATH
+        self._salt = (salt or Config.LINKAGE_CACHE_SALT or '').encode() or None
+        self.ttls = ttls or {
+            LINKED: Config.LINKAGE_CACHE_TTL_LINKED,
+            NOT_LINKED: Config.LINKAGE_CACHE_TTL_NOT_LINKED,
+            INCONCLUSIVE: Config.LINKAGE_CACHE_TTL_INCONCLUSIVE
+        }
+        self.max_entries = max_entries or Config.LINKAGE_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._metrics = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _load_salt(self):
+        """
+        Load the HMAC salt, creating a random one on first use
+
+        A new salt is written to a temporary file and linked into place,
+        so the salt file never exists half-written. When several workers
+        start together, the first link wins and the others use its salt.
+
+        Returns:
+            bytes: Salt
+
+        Raises:
+            OSError: If the salt file can be neither read nor created
+        """
+        salt_path = f"{self.db_path}.salt"
+        try:
+            with open(salt_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+        salt = secrets.token_bytes(32)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(salt_path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(salt)
+            os.link(tmp_path, salt_path)
+        except FileExistsError:
+            with open(salt_path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(tmp_path)
+        return salt
+
+    def _connect(self):
+        """
+        Open the database and create the schema on first use
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            if self._salt is None:
+                self._salt = self._load_salt()
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS linkage_cache ("
+                " key TEXT PRIMARY KEY,"
+                " outcome TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS linkage_cache_last_access ON linkage_cache (last_access)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def cache_key(self, aadhar_number: str, pan_number: str) -> str:
+        """
+        Build the salted cache key for a number pair
+
+        Args:
+            aadhar_number (str): Normalised Aadhar number
+            pan_number (str): Normalised PAN
+
+        Returns:
+            str: Hex HMAC-SHA256 digest
+        """
+        return hmac.new(
+            self._salt, f"{aadhar_number}|{pan_number}".encode(), hashlib.sha256
+        ).hexdigest()
+
+    def get(self, aadhar_number: str, pan_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh cached result
+
+        Args:
+            aadhar_number (str): Normalised Aadhar number
+            pan_number (str): Normalised PAN
+
+        Returns:
+            dict or None: Cached linkage result
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                key = self.cache_key(aadhar_number, pan_number)
+                row = connection.execute(
+                    "SELECT result FROM linkage_cache WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+
+                if row is None:
+                    self._metrics['misses'] += 1
+                    return None
+
+                connection.execute(
+                    "UPDATE linkage_cache SET last_access = ? WHERE key = ?", (now, key)
+                )
+                connection.commit()
+                self._metrics['hits'] += 1
+                return json.loads(row[0])
+
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Linkage cache read failed: {str(e)}")
+            return None
+
+    def put(self, aadhar_number: str, pan_number: str, outcome: str, result: Dict[str, Any]):
+        """
+        Cache a linkage result under its outcome's TTL
+
+        Args:
+            aadhar_number (str): Normalised Aadhar number
+            pan_number (str): Normalised PAN
+            outcome (str): LINKED, NOT_LINKED or INCONCLUSIVE
+            result (dict): Linkage result to return on later hits
+        """
+        ttl = self.ttls.get(outcome)
+        if not ttl:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO linkage_cache (key, outcome, result, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self.cache_key(aadhar_number, pan_number), outcome, json.dumps(result), now + ttl, now)
+                )
+                self._metrics['stores'] += 1
+                self._evict(connection, now)
+                connection.commit()
+
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Linkage cache write failed: {str(e)}")
+
+    def _evict(self, connection, now):
+        """
+        Drop expired entries, then least-recently-used ones over budget
+
+        Args:
+            connection (sqlite3.Connection): Database connection
+            now (float): Current time
+        """
+        evicted = connection.execute(
+            "DELETE FROM linkage_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+
+        overflow = connection.execute("SELECT COUNT(*) FROM linkage_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            evicted += connection.execute(
+                "DELETE FROM linkage_cache WHERE key IN"
+                " (SELECT key FROM linkage_cache ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            ).rowcount
+
+        self._metrics['evictions'] += max(evicted, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            dict: Hit, miss, store and eviction counts plus hit rate and size
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            try:
+                metrics['entries'] = self._connect().execute(
+                    "SELECT COUNT(*) FROM linkage_cache"
+                ).fetchone()[0]
+            except (sqlite3.Error, OSError):
+                metrics['entries'] = None
+
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = round(metrics['hits'] / lookups, 4) if lookups else 0.0
+        return metrics
+
+# Global linkage cache
+linkage_cache = LinkageCache()
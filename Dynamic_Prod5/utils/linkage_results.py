@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from config.settings import Config
+
+# Deferred linkage job states
+PENDING = 'pending'
+COMPLETED = 'completed'
+
+
+class LinkageResultStore:
+    """
+    Persistent SQLite store of deferred Aadhar-PAN linkage results
+
+    Validation responses that defer the linkage check carry
+    ``aadhar_pan_linkage`` as pending; the final rule result is written
+    here under the server-generated linkage id the response carries, so
+    results cannot be looked up by a client-chosen request id.
+    Only rule verdicts are stored, never Aadhar or PAN numbers.
+    """
+
+    def __init__(self, db_path=None, ttl=None):
+        """
+        Initialize the store; the database is opened on first use
+
+        Args:
+            db_path (str, optional): SQLite database path
+            ttl (int, optional): Seconds a stored result is kept
+        """
+        self.db_path = db_path or Config.LINKAGE_RESULTS_PATH
+        self.ttl = ttl or Config.LINKAGE_RESULTS_TTL
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """
+        Open the database and create the schema on first use
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            # Stores from before linkage ids were server-generated are keyed
+            # by client request ids; those results are dropped, not served
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(linkage_results)")]
+            if 'request_id' in columns:
+                self._connection.execute("DROP TABLE linkage_results")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS linkage_results ("
+                " linkage_id TEXT PRIMARY KEY,"
+                " state TEXT NOT NULL,"
+                " result TEXT,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _write(self, linkage_id: str, state: str, result: Optional[Dict[str, Any]]):
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT INTO linkage_results (linkage_id, state, result, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(linkage_id) DO UPDATE SET"
+                    " state = excluded.state, result = excluded.result, updated_at = excluded.updated_at",
+                    (linkage_id, state, json.dumps(result) if result is not None else None, now, now)
+                )
+                connection.execute(
+                    "DELETE FROM linkage_results WHERE updated_at <= ?", (now - self.ttl,)
+                )
+                connection.commit()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Linkage result store write failed: {str(e)}")
+
+    def mark_pending(self, linkage_id: str, result: Dict[str, Any]):
+        """
+        Record that a linkage check is running
+
+        Args:
+            linkage_id (str): Deferred linkage id
+            result (dict): Provisional rule result
+        """
+        self._write(linkage_id, PENDING, result)
+
+    def complete(self, linkage_id: str, result: Dict[str, Any]):
+        """
+        Store the final linkage rule result
+
+        Args:
+            linkage_id (str): Deferred linkage id
+            result (dict): Final rule result
+        """
+        self._write(linkage_id, COMPLETED, result)
+
+    def get(self, linkage_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a linkage result
+
+        Args:
+            linkage_id (str): Deferred linkage id
+
+        Returns:
+            dict or None: 'state' (pending/completed), 'result' and 'updated_at'
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT state, result, updated_at FROM linkage_results WHERE linkage_id = ?",
+                    (linkage_id,)
+                ).fetchone()
+
+        except sqlite3.Error as e:
+            logging.warning(f"Linkage result store read failed: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+        return {
+            'state': row[0],
+            'result': json.loads(row[1]) if row[1] else None,
+            'updated_at': datetime.fromtimestamp(row[2]).isoformat()
+        }
+
+# Global linkage result store
+linkage_results = LinkageResultStore()
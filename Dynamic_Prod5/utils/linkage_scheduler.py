@@ -0,0 +1,274 @@
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, InvalidStateError, wait
+from typing import Dict, Any, Tuple
+
+from config.settings import Config
+from utils.aadhar_pan_linkage import AadharPanLinkageService
+from utils.cancellation import CancellationToken
+
+# Seconds between cancellation checks while waiting for linkage results
+CANCEL_POLL_INTERVAL = 0.2
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the portal request rate
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available and take it
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class LinkageScheduler:
+    """
+    Runs Aadhar-PAN linkage checks concurrently under a shared rate budget
+
+    All checks in the process share one HTTP session and one token
+    bucket. When the portal answers EF00077 (rate limited), every
+    pending check backs off together and the limited check is re-queued
+    after the backoff instead of failing the request.
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        rate=None,
+        burst=None,
+        max_rechecks=None
+    ):
+        """
+        Initialize the scheduler; workers and session are created on first use
+
+        Args:
+            max_workers (int, optional): Concurrent portal requests
+            rate (float, optional): Portal requests per second
+            burst (int, optional): Requests allowed back to back
+            max_rechecks (int, optional): Deferred re-checks after rate limiting
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or Config.LINKAGE_MAX_CONCURRENCY
+        self.max_rechecks = max_rechecks if max_rechecks is not None else Config.LINKAGE_MAX_RECHECKS
+        self.bucket = TokenBucket(rate or Config.LINKAGE_RATE_PER_SECOND, burst or Config.LINKAGE_BURST)
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._session = None
+        self._backoff = 0.0
+        self._backoff_until = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='linkage'
+                )
+                self._session = AadharPanLinkageService._create_retry_session()
+            return self._executor
+
+    def _wait_for_slot(self):
+        """
+        Wait out any global backoff, then take a token from the rate budget
+        """
+        while True:
+            with self._lock:
+                delay = self._backoff_until - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        self.bucket.acquire()
+
+    def _register_rate_limit(self):
+        """
+        Extend the global backoff after an EF00077 response
+
+        Returns:
+            float: Seconds until checks resume
+        """
+        with self._lock:
+            self._backoff = min(
+                max(self._backoff * 2, Config.LINKAGE_BACKOFF_INITIAL),
+                Config.LINKAGE_BACKOFF_MAX
+            )
+            self._backoff_until = max(self._backoff_until, time.monotonic() + self._backoff)
+            return self._backoff_until - time.monotonic()
+
+    def _register_success(self):
+        with self._lock:
+            self._backoff = 0.0
+
+    def _dispatch(self, aadhar_number, pan_number, future, attempt):
+        self._get_executor().submit(self._run, aadhar_number, pan_number, future, attempt)
+
+    def _run(self, aadhar_number, pan_number, future, attempt):
+        """
+        Run one linkage check, re-queueing it if the portal is rate limiting
+
+        Args:
+            aadhar_number (str): Aadhar number
+            pan_number (str): PAN
+            future (Future): Future completed with the final result
+            attempt (int): Re-check attempt number
+        """
+        # Cancelled checks give their rate budget back to live ones
+        if future.cancelled():
+            return
+
+        try:
+            result = AadharPanLinkageService.verify_linkage(
+                aadhar_number,
+                pan_number,
+                session=self._session,
+                before_request=self._wait_for_slot
+            )
+        except Exception as e:
+            self._settle(future, exception=e)
+            return
+
+        if result.get('is_rate_limited'):
+            delay = self._register_rate_limit()
+            if attempt < self.max_rechecks:
+                self.logger.warning(f"Linkage portal rate limited, re-checking in {delay:.1f}s")
+                timer = threading.Timer(
+                    delay, self._dispatch, args=(aadhar_number, pan_number, future, attempt + 1)
+                )
+                timer.daemon = True
+                timer.start()
+                return
+        elif not result.get('cached'):
+            self._register_success()
+
+        result['rechecks'] = attempt
+        self._settle(future, result=result)
+
+    @staticmethod
+    def _settle(future, result=None, exception=None):
+        # The caller may have cancelled the future while the check ran
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def submit(self, aadhar_number: str, pan_number: str) -> Future:
+        """
+        Queue a linkage check
+
+        Args:
+            aadhar_number (str): Aadhar number
+            pan_number (str): PAN
+
+        Returns:
+            Future: Completed with the linkage result
+        """
+        future = Future()
+        self._dispatch(aadhar_number, pan_number, future, 0)
+        return future
+
+    def collect(
+        self,
+        futures: Dict[str, Future],
+        timeout: float = None,
+        cancel_token: CancellationToken = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for submitted checks and gather their results
+
+        Args:
+            futures (dict): Futures from ``submit`` keyed by caller-defined key
+            timeout (float, optional): Overall wait in seconds
+            cancel_token (CancellationToken, optional): Stops waiting and
+                cancels outstanding checks once cancelled
+
+        Returns:
+            dict: Linkage result keyed like ``futures``
+        """
+        timeout = timeout if timeout is not None else Config.LINKAGE_TIMEOUT
+        if cancel_token is None:
+            wait(futures.values(), timeout=timeout)
+        else:
+            deadline = time.monotonic() + timeout
+            pending = set(futures.values())
+            while pending and not cancel_token.cancelled:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _, pending = wait(pending, timeout=min(remaining, CANCEL_POLL_INTERVAL))
+
+        results = {}
+        for key, future in futures.items():
+            if not future.done() and cancel_token is not None and cancel_token.cancelled:
+                future.cancel()
+            if future.cancelled():
+                results[key] = {
+                    'is_linked': False,
+                    'message': 'Linkage verification cancelled',
+                    'error': 'cancelled'
+                }
+            elif not future.done():
+                results[key] = {
+                    'is_linked': False,
+                    'message': 'Linkage verification timed out',
+                    'error': 'timeout'
+                }
+            elif future.exception() is not None:
+                results[key] = {
+                    'is_linked': False,
+                    'message': f'Linkage verification error: {future.exception()}',
+                    'error': 'unexpected_error'
+                }
+            else:
+                results[key] = future.result()
+        return results
+
+    def verify_many(
+        self,
+        pairs: Dict[str, Tuple[str, str]],
+        timeout: float = None,
+        cancel_token: CancellationToken = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Verify several Aadhar-PAN pairs concurrently
+
+        Args:
+            pairs (dict): (Aadhar, PAN) keyed by caller-defined key
+            timeout (float, optional): Overall wait in seconds
+            cancel_token (CancellationToken, optional): Abandons the checks once cancelled
+
+        Returns:
+            dict: Linkage result keyed like ``pairs``
+        """
+        futures = {key: self.submit(aadhar, pan) for key, (aadhar, pan) in pairs.items()}
+        return self.collect(futures, timeout, cancel_token)
+
+# Global linkage scheduler
+linkage_scheduler = LinkageScheduler()
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    The first caller for a key (the leader) runs the work; callers that
+    arrive while it is in flight wait on the leader's future instead of
+    repeating the work. Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty in-flight table
+        """
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _join(self, key):
+        """
+        Join the in-flight call for a key, creating it if absent
+
+        Args:
+            key (hashable): Call key
+
+        Returns:
+            tuple: (Future, whether the caller is the leader)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key, future, fn):
+        """
+        Run the leader's work and publish its outcome
+
+        Args:
+            key (hashable): Call key
+            future (Future): Future shared with followers
+            fn (callable): Work to run
+        """
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def do(self, key, fn):
+        """
+        Run ``fn`` once for all concurrent thread callers of ``key``
+
+        Args:
+            key (hashable): Call key
+            fn (callable): Work to run if no call is in flight
+
+        Returns:
+            Any: Result of the (possibly shared) call
+        """
+        future, is_leader = self._join(key)
+        if is_leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    def in_flight(self):
+        """
+        Get the number of calls currently in flight
+
+        Returns:
+            int: In-flight call count
+        """
+        with self._lock:
+            return len(self._calls)